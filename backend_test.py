@@ -2,14 +2,30 @@
 """
 Backend API Testing Suite for Google OAuth Implementation
 Tests Google OAuth authentication and existing authentication endpoints
+
+Run with --load to replay the signup -> login -> invalid-login sequence with
+many concurrent virtual users (requires aiohttp).
+
+Run with --oauth-load to drive full Google callback round trips against
+fake_oauth_provider.py; the backend must run with OAUTH_PROVIDER_URL set, or
+pass --spawn-backend to start one pointed at an in-process provider.
 """
 
 import requests
 import json
 import sys
+import argparse
+import asyncio
+import time
 from datetime import datetime
 import urllib.parse
 
+from harness import (
+    get_session, run_checks, check_records, percentile, ResultsStore, DEFAULT_WORKERS,
+    start_backend, stop_backend
+)
+from fake_oauth_provider import FakeOAuthProvider, DEFAULT_PORT as OAUTH_PROVIDER_PORT
+
 # Base URL for the backend API
 BASE_URL = "http://localhost:5000/api"
 
@@ -19,6 +35,7 @@ class GoogleOAuthTester:
         self.auth_token = None
         self.user_id = None
         self.test_results = []
+        self.session = get_session()
         self.test_user_email = f"test.user.{int(datetime.now().timestamp())}@example.com"
         
     def log_test(self, test_name, success, message, details=None):
@@ -40,7 +57,7 @@ class GoogleOAuthTester:
     def test_server_health(self):
         """Test if server is responding"""
         try:
-            response = requests.get(f"{self.base_url.replace('/api', '')}", timeout=5)
+            response = self.session.get(f"{self.base_url.replace('/api', '')}", timeout=5)
             # Even if we get 404, it means server is running
             self.log_test("Server Health", True, "Server is responding")
             return True
@@ -55,7 +72,7 @@ class GoogleOAuthTester:
         """Test that /api/auth/google redirects to Google OAuth"""
         try:
             # Use allow_redirects=False to capture the redirect response
-            response = requests.get(f"{self.base_url}/auth/google", allow_redirects=False)
+            response = self.session.get(f"{self.base_url}/auth/google", allow_redirects=False)
             
             if response.status_code == 302:
                 location = response.headers.get('Location', '')
@@ -76,7 +93,7 @@ class GoogleOAuthTester:
     def test_google_oauth_callback_without_code(self):
         """Test Google OAuth callback without authorization code (should handle error)"""
         try:
-            response = requests.get(f"{self.base_url}/auth/google/callback", allow_redirects=False)
+            response = self.session.get(f"{self.base_url}/auth/google/callback", allow_redirects=False)
             
             # Should redirect to error page or back to Google OAuth for authentication
             if response.status_code == 302:
@@ -108,7 +125,7 @@ class GoogleOAuthTester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/auth/signup", json=test_user)
+            response = self.session.post(f"{self.base_url}/auth/signup", json=test_user)
             
             if response.status_code == 200:
                 data = response.json()
@@ -125,7 +142,7 @@ class GoogleOAuthTester:
                     # Try with different email
                     self.test_user_email = f"test.user.{int(datetime.now().timestamp())}.alt@example.com"
                     test_user['email'] = self.test_user_email
-                    response = requests.post(f"{self.base_url}/auth/signup", json=test_user)
+                    response = self.session.post(f"{self.base_url}/auth/signup", json=test_user)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -154,7 +171,7 @@ class GoogleOAuthTester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/auth/login", json=login_data)
+            response = self.session.post(f"{self.base_url}/auth/login", json=login_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -185,7 +202,7 @@ class GoogleOAuthTester:
         }
         
         try:
-            response = requests.post(f"{self.base_url}/auth/login", json=invalid_login)
+            response = self.session.post(f"{self.base_url}/auth/login", json=invalid_login)
             
             if response.status_code == 400:
                 error_data = response.json()
@@ -223,7 +240,7 @@ class GoogleOAuthTester:
                 "password": "anypassword"
             }
             
-            response = requests.post(f"{self.base_url}/auth/login", json=login_data)
+            response = self.session.post(f"{self.base_url}/auth/login", json=login_data)
             
             if response.status_code == 400:
                 error_data = response.json()
@@ -243,7 +260,7 @@ class GoogleOAuthTester:
         """Test that Passport is properly configured"""
         try:
             # Test that the Google OAuth route exists and is configured
-            response = requests.get(f"{self.base_url}/auth/google", allow_redirects=False)
+            response = self.session.get(f"{self.base_url}/auth/google", allow_redirects=False)
             
             if response.status_code == 302:
                 # Check if the redirect contains Google OAuth parameters
@@ -270,7 +287,7 @@ class GoogleOAuthTester:
         """Test that sessions are properly configured for OAuth"""
         try:
             # Make a request to check if session middleware is working
-            response = requests.get(f"{self.base_url}/auth/google", allow_redirects=False)
+            response = self.session.get(f"{self.base_url}/auth/google", allow_redirects=False)
             
             # Check if session cookies are being set
             if response.status_code == 302:
@@ -298,7 +315,7 @@ class GoogleOAuthTester:
                 "password": "testPassword123"
             }
             
-            response = requests.post(f"{self.base_url}/auth/signup", json=test_user)
+            response = self.session.post(f"{self.base_url}/auth/signup", json=test_user)
             
             if response.status_code == 200:
                 data = response.json()
@@ -324,7 +341,7 @@ class GoogleOAuthTester:
                 'Access-Control-Request-Headers': 'Content-Type'
             }
             
-            response = requests.options(f"{self.base_url}/auth/google", headers=headers)
+            response = self.session.options(f"{self.base_url}/auth/google", headers=headers)
             
             # CORS should be configured to allow frontend requests
             if response.status_code in [200, 204] or 'Access-Control-Allow-Origin' in response.headers:
@@ -332,7 +349,7 @@ class GoogleOAuthTester:
                 return True
             else:
                 # Even if OPTIONS fails, if regular request works, CORS might be configured
-                response = requests.get(f"{self.base_url}/auth/google", allow_redirects=False)
+                response = self.session.get(f"{self.base_url}/auth/google", allow_redirects=False)
                 if response.status_code == 302:
                     self.log_test("CORS Configuration", True, "CORS appears to be working (OAuth redirect successful)")
                     return True
@@ -348,7 +365,7 @@ class GoogleOAuthTester:
         """Test that required environment variables are configured"""
         try:
             # Test Google OAuth redirect to verify environment variables are set
-            response = requests.get(f"{self.base_url}/auth/google", allow_redirects=False)
+            response = self.session.get(f"{self.base_url}/auth/google", allow_redirects=False)
             
             if response.status_code == 302:
                 location = response.headers.get('Location', '')
@@ -368,40 +385,109 @@ class GoogleOAuthTester:
             self.log_test("Environment Variables", False, f"Request failed: {str(e)}")
             return False
     
-    def run_all_tests(self):
-        """Run all Google OAuth tests in sequence"""
+    def test_criteria_catalog(self):
+        """Validate the criteria catalog and measure what clients download"""
+        try:
+            response = self.session.get(f"{self.base_url}/criteria", timeout=10)
+            if response.status_code != 200:
+                self.log_test("Criteria Catalog", False, f"Unexpected status code: {response.status_code}")
+                return False
+            manifest = response.json()
+            manifest_bytes = len(response.content)
+            manifest_headers = response.headers
+
+            seen = {}
+            problems = []
+            sector_bytes = {}
+            for sector in manifest['sectors']:
+                response = self.session.get(f"{self.base_url}/criteria/sectors/{sector['id']}", timeout=10)
+                if response.status_code != 200:
+                    problems.append(f"sector {sector['id']} returned {response.status_code}")
+                    continue
+                sector_bytes[sector['id']] = len(response.content)
+                criteria = response.json()['criteria']
+                if len(criteria) != sector['criteriaCount']:
+                    problems.append(f"sector {sector['id']} has {len(criteria)} criteria, manifest says {sector['criteriaCount']}")
+                for criterion in criteria:
+                    if criterion['id'] in seen:
+                        problems.append(f"duplicate ID {criterion['id']} in {seen[criterion['id']]} and {sector['id']}")
+                    seen[criterion['id']] = sector['id']
+                    if not criterion.get('title') or not criterion.get('sub'):
+                        problems.append(f"{criterion['id']} has no title or sub-criteria")
+
+            # The ID index must resolve every criterion listed by the sector slices
+            ids = sorted(seen)
+            resolved = {}
+            for i in range(0, len(ids), 100):
+                response = self.session.get(f"{self.base_url}/criteria/items",
+                                            params={'ids': ','.join(ids[i:i + 100])}, timeout=10)
+                resolved.update(response.json()['criteria'])
+            unresolved = [criterion_id for criterion_id in ids if resolved.get(criterion_id, {}).get('sector') != seen[criterion_id]]
+            if unresolved:
+                problems.append(f"ID index does not resolve {unresolved[:5]}")
+
+            etag = manifest_headers.get('ETag')
+            revalidated = self.session.get(f"{self.base_url}/criteria", headers={'If-None-Match': etag or ''}, timeout=10)
+            if not etag or revalidated.status_code != 304:
+                problems.append(f"revalidation returned {revalidated.status_code} instead of 304")
+            if 'max-age' not in manifest_headers.get('Cache-Control', ''):
+                problems.append("responses are not cacheable")
+
+            if problems:
+                self.log_test("Criteria Catalog", False, f"{len(problems)} problem(s) found", problems[:10])
+                return False
+
+            total_bytes = sum(sector_bytes.values())
+            largest = max(sector_bytes.values()) if sector_bytes else 0
+            self.log_test("Criteria Catalog", True,
+                          f"{len(ids)} unique criteria in {len(sector_bytes)} sectors; "
+                          f"manifest {manifest_bytes / 1024:.1f} KB, largest sector {largest / 1024:.1f} KB, "
+                          f"all sectors {total_bytes / 1024:.1f} KB")
+            return True
+
+        except Exception as e:
+            self.log_test("Criteria Catalog", False, f"Request failed: {str(e)}")
+            return False
+
+    def run_all_tests(self, max_workers=DEFAULT_WORKERS):
+        """Run all Google OAuth tests, concurrently where they are independent"""
         print("🚀 Starting Google OAuth Backend API Tests")
         print("=" * 60)
         
-        # Test sequence
+        # Each test is paired with the tests that must finish before it starts;
+        # login reuses the account created by signup
         tests = [
-            self.test_server_health,
-            self.test_environment_variables,
-            self.test_passport_configuration,
-            self.test_session_configuration,
-            self.test_cors_configuration,
-            self.test_google_oauth_redirect,
-            self.test_google_oauth_callback_without_code,
-            self.test_regular_user_signup,
-            self.test_regular_user_login,
-            self.test_invalid_credentials_login,
-            self.test_google_user_password_login_prevention,
-            self.test_user_model_fields
+            (self.test_server_health, []),
+            (self.test_environment_variables, []),
+            (self.test_passport_configuration, []),
+            (self.test_session_configuration, []),
+            (self.test_cors_configuration, []),
+            (self.test_google_oauth_redirect, []),
+            (self.test_google_oauth_callback_without_code, []),
+            (self.test_regular_user_signup, []),
+            (self.test_regular_user_login, [self.test_regular_user_signup]),
+            (self.test_invalid_credentials_login, []),
+            (self.test_google_user_password_login_prevention, []),
+            (self.test_user_model_fields, []),
+            (self.test_criteria_catalog, [])
         ]
         
         passed = 0
         failed = 0
         
-        for test in tests:
-            try:
-                if test():
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                print(f"❌ FAIL {test.__name__}: Unexpected error - {str(e)}")
+        metrics = {}
+        results = run_checks(tests, max_workers=max_workers, metrics=metrics)
+        for test, result in results.items():
+            if isinstance(result, Exception):
+                print(f"❌ FAIL {test.__name__}: Unexpected error - {str(result)}")
+                failed += 1
+            elif result:
+                passed += 1
+            else:
                 failed += 1
-            print()  # Add spacing between tests
+        print()
+        
+        ResultsStore().record_run('backend', check_records(results, metrics))
         
         # Summary
         print("=" * 60)
@@ -417,10 +503,271 @@ class GoogleOAuthTester:
             print("⚠️  Some tests failed. Please check the issues above.")
             return False
 
+class AuthLoadTester:
+    """Replays the signup -> login -> invalid-login sequence with concurrent virtual users"""
+
+    def __init__(self, users=1000, concurrency=200, base_url=BASE_URL, timeout=30):
+        self.base_url = base_url
+        self.users = users
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.run_id = int(datetime.now().timestamp())
+        # endpoint -> list of (latency_seconds, ok)
+        self.samples = {}
+
+    def record(self, endpoint, latency, ok):
+        """Record a single request sample"""
+        self.samples.setdefault(endpoint, []).append((latency, ok))
+
+    async def timed_post(self, session, label, endpoint, payload, expected_status):
+        """POST payload to endpoint and record latency and outcome under label"""
+        start = time.perf_counter()
+        ok = False
+        body = None
+        try:
+            async with session.post(f"{self.base_url}{endpoint}", json=payload) as response:
+                body = await response.read()
+                ok = response.status == expected_status
+        except Exception:
+            ok = False
+        self.record(label, time.perf_counter() - start, ok)
+        return ok, body
+
+    async def virtual_user(self, session, semaphore, index):
+        """Run one virtual user through the auth sequence"""
+        email = f"load.{self.run_id}.{index}@example.com"
+        password = "securePassword123"
+        async with semaphore:
+            ok, _ = await self.timed_post(session, "POST /auth/signup", "/auth/signup", {
+                "name": f"Load User {index}",
+                "email": email,
+                "password": password
+            }, 200)
+            if ok:
+                await self.timed_post(session, "POST /auth/login", "/auth/login", {
+                    "email": email,
+                    "password": password
+                }, 200)
+            await self.timed_post(session, "POST /auth/login (invalid)", "/auth/login", {
+                "email": f"nonexistent.{self.run_id}.{index}@example.com",
+                "password": "wrongpassword"
+            }, 400)
+
+    async def run(self):
+        """Run all virtual users and return elapsed wall-clock seconds"""
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(
+                self.virtual_user(session, semaphore, i) for i in range(self.users)
+            ))
+        return time.perf_counter() - start
+
+    def summarize(self, elapsed):
+        """Build per-endpoint throughput, latency percentiles and error rate"""
+        summary = {}
+        for endpoint, samples in self.samples.items():
+            latencies = [latency for latency, _ in samples]
+            errors = sum(1 for _, ok in samples if not ok)
+            summary[endpoint] = {
+                'requests': len(samples),
+                'throughput_rps': len(samples) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'error_rate': errors / len(samples)
+            }
+        return summary
+
+    def run_load_test(self):
+        """Run the load test and print a per-endpoint report"""
+        print("🔥 Starting Auth Load Test")
+        print(f"   Virtual users: {self.users}, concurrency: {self.concurrency}")
+        print("=" * 60)
+
+        try:
+            elapsed = asyncio.run(self.run())
+        except ImportError:
+            print("❌ FAIL Load test requires aiohttp (pip install aiohttp)")
+            return False
+
+        summary = self.summarize(elapsed)
+        # duration_ms carries p95 so `harness.py compare` flags tail-latency regressions
+        ResultsStore().record_run('backend-load', {
+            endpoint: dict(stats, duration_ms=stats['p95_ms']) for endpoint, stats in summary.items()
+        }, users=self.users, concurrency=self.concurrency, elapsed_s=elapsed)
+        print(f"⏱️  Completed in {elapsed:.2f}s")
+        for endpoint, stats in summary.items():
+            print(f"\n📍 {endpoint}")
+            print(f"   Requests: {stats['requests']}  Throughput: {stats['throughput_rps']:.1f} req/s")
+            print(f"   Latency p50/p95/p99: {stats['p50_ms']:.1f} / {stats['p95_ms']:.1f} / {stats['p99_ms']:.1f} ms")
+            print(f"   Error rate: {stats['error_rate'] * 100:.2f}%")
+
+        return all(stats['error_rate'] == 0 for stats in summary.values())
+
+class OAuthCallbackLoadTester(AuthLoadTester):
+    """Drives /auth/google -> provider /authorize -> /auth/google/callback round trips
+
+    Each virtual user logs in `logins` times with the same identity, so the
+    first callback creates the account and later ones take the returning-user
+    path, as during a morning login spike.
+    """
+
+    def __init__(self, users=1000, concurrency=200, logins=2, base_url=BASE_URL,
+                 timeout=30, mongo_uri=None):
+        super().__init__(users=users, concurrency=concurrency, base_url=base_url, timeout=timeout)
+        self.logins = logins
+        self.mongo_uri = mongo_uri
+
+    async def timed_get(self, session, label, url, params=None):
+        """GET url without following redirects; returns the Location header or None"""
+        start = time.perf_counter()
+        location = None
+        try:
+            async with session.get(url, params=params, allow_redirects=False) as response:
+                await response.read()
+                if response.status == 302:
+                    location = response.headers.get('Location')
+        except Exception:
+            location = None
+        if label:
+            self.record(label, time.perf_counter() - start, location is not None)
+        return location
+
+    async def oauth_login(self, session, email, label):
+        """Run one full login; only the server callback is timed under label"""
+        authorize_url = await self.timed_get(session, "GET /auth/google", f"{self.base_url}/auth/google")
+        if not authorize_url:
+            return False
+        callback_url = await self.timed_get(session, None, authorize_url, {'login_hint': email})
+        if not callback_url:
+            self.record(label, 0.0, False)
+            return False
+
+        start = time.perf_counter()
+        location = await self.timed_get(session, None, callback_url)
+        ok = bool(location) and '/auth/google/success?token=' in location
+        self.record(label, time.perf_counter() - start, ok)
+        return ok
+
+    async def virtual_user(self, session, semaphore, index):
+        """Log one Google identity in `logins` times"""
+        email = f"oauth.load.{self.run_id}.{index}@example.com"
+        async with semaphore:
+            for attempt in range(self.logins):
+                label = "GET /auth/google/callback (new user)" if attempt == 0 else "GET /auth/google/callback (returning)"
+                if not await self.oauth_login(session, email, label):
+                    break
+
+    def mongo_opcounters(self):
+        """Return serverStatus opcounters from mongo_uri, or None when unavailable"""
+        if not self.mongo_uri:
+            return None
+        try:
+            from pymongo import MongoClient
+            client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=3000)
+            try:
+                return dict(client.admin.command('serverStatus')['opcounters'])
+            finally:
+                client.close()
+        except Exception as e:
+            print(f"⚠️  Could not read MongoDB opcounters: {str(e)}")
+            return None
+
+    def run_load_test(self):
+        """Run the OAuth load test and print a per-step report"""
+        print("🔥 Starting Google OAuth Callback Load Test")
+        print(f"   Virtual users: {self.users}, logins each: {self.logins}, concurrency: {self.concurrency}")
+        print("=" * 60)
+
+        ops_before = self.mongo_opcounters()
+        try:
+            elapsed = asyncio.run(self.run())
+        except ImportError:
+            print("❌ FAIL Load test requires aiohttp (pip install aiohttp)")
+            return False
+        ops_after = self.mongo_opcounters()
+
+        summary = self.summarize(elapsed)
+        extra = {'users': self.users, 'logins': self.logins, 'concurrency': self.concurrency, 'elapsed_s': elapsed}
+        print(f"⏱️  Completed in {elapsed:.2f}s")
+        for endpoint, stats in summary.items():
+            print(f"\n📍 {endpoint}")
+            print(f"   Requests: {stats['requests']}  Throughput: {stats['throughput_rps']:.1f} req/s")
+            print(f"   Latency p50/p95/p99: {stats['p50_ms']:.1f} / {stats['p95_ms']:.1f} / {stats['p99_ms']:.1f} ms")
+            print(f"   Error rate: {stats['error_rate'] * 100:.2f}%")
+
+        callbacks = sum(stats['requests'] for endpoint, stats in summary.items() if 'callback' in endpoint)
+        if ops_before and ops_after and callbacks:
+            # Counters are server-wide, so other traffic on the same mongod inflates these
+            db_ops = {op: (ops_after[op] - ops_before.get(op, 0)) / callbacks for op in ('query', 'insert', 'update')}
+            extra['db_ops_per_login'] = db_ops
+            print(f"\n🗄️  DB ops per login: {db_ops['query']:.2f} queries, {db_ops['insert']:.2f} inserts, {db_ops['update']:.2f} updates")
+
+        ResultsStore().record_run('backend-oauth-load', {
+            endpoint: dict(stats, duration_ms=stats['p95_ms']) for endpoint, stats in summary.items()
+        }, **extra)
+        return bool(summary) and all(stats['error_rate'] == 0 for stats in summary.values())
+
+def run_oauth_load_with_backend(args):
+    """Start a fake provider and a backend pointed at it, then run the OAuth load test"""
+    provider = FakeOAuthProvider(args.provider_port, args.provider_latency_ms).start()
+    print(f"🔑 Fake OAuth provider on {provider.url}")
+    backend = None
+    try:
+        backend = start_backend(args.backend_port, {
+            'OAUTH_PROVIDER_URL': provider.url,
+            'GOOGLE_CLIENT_ID': 'fake-client-id',
+            'GOOGLE_CLIENT_SECRET': 'fake-client-secret',
+            'NODE_ENV': 'development'
+        })
+        tester = OAuthCallbackLoadTester(
+            users=args.users, concurrency=args.concurrency, logins=args.logins,
+            base_url=f"http://localhost:{args.backend_port}/api", mongo_uri=args.mongo_uri
+        )
+        success = tester.run_load_test()
+    except RuntimeError as e:
+        print(f"❌ FAIL {str(e)}")
+        success = False
+    finally:
+        stop_backend(backend)
+        provider.stop()
+    stats = provider.stats
+    if stats:
+        print("\n🔑 Provider requests: " + ", ".join(f"{name}={s['requests']}" for name, s in stats.items()))
+    return success
+
 def main():
     """Main function to run the tests"""
-    tester = GoogleOAuthTester()
-    success = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Backend API tests for the Tender Generator")
+    parser.add_argument('--load', action='store_true', help="Run the concurrent auth load test instead of the functional tests")
+    parser.add_argument('--users', type=int, default=1000, help="Number of virtual users in load mode")
+    parser.add_argument('--concurrency', type=int, default=200, help="Maximum concurrent virtual users in load mode")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Maximum concurrent checks in functional mode")
+    parser.add_argument('--oauth-load', action='store_true', help="Run the Google OAuth callback load test against fake_oauth_provider.py")
+    parser.add_argument('--logins', type=int, default=2, help="Logins per virtual user in OAuth load mode")
+    parser.add_argument('--spawn-backend', action='store_true', help="In OAuth load mode, start a fake provider and a backend pointed at it")
+    parser.add_argument('--backend-port', type=int, default=5055, help="Port for the backend started by --spawn-backend")
+    parser.add_argument('--provider-port', type=int, default=OAUTH_PROVIDER_PORT, help="Port for the provider started by --spawn-backend")
+    parser.add_argument('--provider-latency-ms', type=float, default=0, help="Simulated provider latency for --spawn-backend")
+    parser.add_argument('--mongo-uri', help="MongoDB to read opcounters from, to report DB operations per login")
+    args = parser.parse_args()
+
+    if args.oauth_load and args.spawn_backend:
+        success = run_oauth_load_with_backend(args)
+    elif args.oauth_load:
+        success = OAuthCallbackLoadTester(
+            users=args.users, concurrency=args.concurrency, logins=args.logins, mongo_uri=args.mongo_uri
+        ).run_load_test()
+    elif args.load:
+        success = AuthLoadTester(users=args.users, concurrency=args.concurrency).run_load_test()
+    else:
+        tester = GoogleOAuthTester()
+        success = tester.run_all_tests(max_workers=args.workers)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -0,0 +1,1736 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmark Suite for Tender Generator Backend
+Seeds tenders through the API and measures how endpoint latency scales with data volume
+
+Usage:
+    python benchmark_test.py analytics --sizes 10,100,1000 --samples 20
+    python benchmark_test.py rollup --operations 500 --seed 42
+    python benchmark_test.py history --sizes 100,1000,5000 --page-size 20
+    python benchmark_test.py history --dataset-user dataset.00000@example.com
+    python benchmark_test.py bulk --count 10000 --compare-single 200
+    python benchmark_test.py auth --requests 2000 --spawn
+    python benchmark_test.py bcrypt --costs 8,10,12 --concurrency 1,8,32
+    python benchmark_test.py render --tenders 50 --formats pdf,docx,xlsx
+    python benchmark_test.py dedup --users 200 --tenders-per-user 50 --repeat-ratio 0.6
+    python benchmark_test.py drafts --writers 8 --edits 25
+    python benchmark_test.py caching --tenders 200 --loads 30 --write-every 5
+    python benchmark_test.py sessions --sessions 50000 --rounds 10
+    python benchmark_test.py pool --pool-sizes 2,10,50 --concurrency 64 --duration 15
+    python benchmark_test.py replay --capture traffic.ndjson --speed 4
+    python benchmark_test.py abuse --attackers 64 --attacker-ips 4 --store mongo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.cookiejar import DefaultCookiePolicy
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from harness import get_session, latency_stats, start_backend, stop_backend, MetricsScraper, ResultsStore, compare_runs, DEFAULT_WORKERS, SERVER_DIR
+
+# Base URL for the backend API
+BASE_URL = "http://localhost:5000/api"
+
+# Scratch database for checks that seed MongoDB directly; it is dropped afterwards
+SCRATCH_MONGO_URI = os.environ.get('BENCH_MONGO_URI', 'mongodb://localhost:27017/tender_bench_scratch')
+
+# Criteria ID prefixes per sector, as used in server/data/criteriaData.js
+SECTOR_PREFIXES = {
+    'government': 'GOV',
+    'business': 'BUS',
+    'healthcare': 'HC',
+    'companies': 'CO',
+    'construction': 'CON',
+    'transportation': 'TRANS',
+    'it': 'IT',
+    'retail': 'RET',
+    'manufacturing': 'MAN',
+    'housing': 'HOUS',
+    'education': 'EDU',
+    'consultancy': 'CONS'
+}
+
+def sample_tender(index):
+    """Build a deterministic, realistically shaped /save payload"""
+    rng = random.Random(index)
+    sector = rng.choice(sorted(SECTOR_PREFIXES))
+    prefix = SECTOR_PREFIXES[sector]
+    category_ids = rng.sample([f"{prefix}{n}" for n in range(1, 10)], rng.randint(2, 6))
+    categories = {
+        category_id: [str(sub) for sub in sorted(rng.sample(range(5), rng.randint(1, 4)))]
+        for category_id in category_ids
+    }
+    return {
+        'title': f"Benchmark Tender {index}",
+        'sector': sector,
+        'categories': categories,
+        'categoriesOrder': category_ids,
+        'isDraft': rng.random() < 0.3
+    }
+
+class BenchmarkClient:
+    """API client authenticated as a freshly created benchmark user"""
+
+    def __init__(self, base_url=BASE_URL, label='bench'):
+        self.base_url = base_url
+        self.session = get_session()
+        self.email = f"{label}.{int(datetime.now().timestamp() * 1000)}@example.com"
+        self.password = "benchmarkPassword123"
+        self.token = None
+
+    def signup(self):
+        """Create the benchmark user and keep its JWT"""
+        response = self.session.post(f"{self.base_url}/auth/signup", json={
+            "name": "Benchmark User",
+            "email": self.email,
+            "password": self.password
+        }, timeout=30)
+        response.raise_for_status()
+        self.token = response.json()['token']
+        return self
+
+    def login(self, email, password=None):
+        """Log in as an existing user, e.g. one written by dataset_generator.py"""
+        self.email = email
+        self.password = password or self.password
+        response = self.session.post(f"{self.base_url}/auth/login", json={
+            "email": self.email,
+            "password": self.password
+        }, timeout=30)
+        response.raise_for_status()
+        self.token = response.json()['token']
+        return self
+
+    @property
+    def headers(self):
+        """Authorization headers for the benchmark user"""
+        return {'Authorization': f"Bearer {self.token}"}
+
+    def save_tender(self, payload):
+        """Save one tender and return the stored document"""
+        response = self.session.post(f"{self.base_url}/tenders/save", json=payload, headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return response.json()['tender']
+
+    def patch_tender(self, tender_id, version, ops, session=None, **fields):
+        """PATCH a tender; returns (status_code, body, latency_seconds) so callers can handle every status
+
+        body is None when an error response is not JSON.
+        """
+        start = time.perf_counter()
+        response = (session or self.session).patch(
+            f"{self.base_url}/tenders/{tender_id}", json=dict(fields, version=version, ops=ops),
+            headers=self.headers, timeout=30
+        )
+        latency = time.perf_counter() - start
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body, latency
+
+    def delete_tender(self, tender_id):
+        """Delete one tender by ID"""
+        response = self.session.delete(f"{self.base_url}/tenders/{tender_id}", headers=self.headers, timeout=30)
+        response.raise_for_status()
+
+    def get_json(self, path, **kwargs):
+        """GET path and return the decoded JSON body"""
+        response = self.session.get(f"{self.base_url}{path}", headers=self.headers, timeout=60, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def history_pages(self, limit=100, view='full'):
+        """Yield (page, latency_seconds, bytes) for each history page, newest first"""
+        cursor = None
+        while True:
+            params = {'limit': limit, 'view': view}
+            if cursor:
+                params['cursor'] = cursor
+            start = time.perf_counter()
+            response = self.session.get(f"{self.base_url}/tenders/history", params=params, headers=self.headers, timeout=60)
+            latency = time.perf_counter() - start
+            response.raise_for_status()
+            page = response.json()
+            yield page, latency, len(response.content)
+            cursor = page['nextCursor']
+            if not cursor:
+                return
+
+    def history(self):
+        """Return every tender in the user's history"""
+        return [tender for page, _, _ in self.history_pages() for tender in page['tenders']]
+
+    def bulk_import(self, tenders):
+        """Stream tenders to POST /tenders/bulk as NDJSON and return the import summary"""
+        body = (json.dumps(tender).encode() + b'\n' for tender in tenders)
+        response = self.session.post(
+            f"{self.base_url}/tenders/bulk", data=body, timeout=600,
+            headers=dict(self.headers, **{'Content-Type': 'application/x-ndjson'})
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def export_tenders(self):
+        """Yield tenders streamed from GET /tenders/export"""
+        with self.session.get(f"{self.base_url}/tenders/export", headers=self.headers, stream=True, timeout=600) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def seed_tenders(self, count, start=0, workers=DEFAULT_WORKERS):
+        """Save count sample tenders concurrently, numbered from start"""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda i: self.save_tender(sample_tender(i)), range(start, start + count)))
+
+    def render(self, tender_id, format):
+        """Download a rendered tender; returns (latency_seconds, bytes, X-Render-Cache)"""
+        start = time.perf_counter()
+        response = self.session.get(f"{self.base_url}/tenders/{tender_id}/render", params={'format': format},
+                                    headers=self.headers, timeout=120)
+        latency = time.perf_counter() - start
+        response.raise_for_status()
+        return latency, len(response.content), response.headers.get('X-Render-Cache')
+
+    def conditional_get(self, path, etag=None, encoding='gzip', **kwargs):
+        """GET path like a browser revalidating its cache; returns (status, body bytes on the wire, ETag, latency_seconds)"""
+        headers = dict(self.headers, **{'Accept-Encoding': encoding})
+        if etag:
+            headers['If-None-Match'] = etag
+        start = time.perf_counter()
+        with self.session.get(f"{self.base_url}{path}", headers=headers, stream=True, timeout=60, **kwargs) as response:
+            body = response.raw.read(decode_content=False)
+            latency = time.perf_counter() - start
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response.status_code, len(body), response.headers.get('ETag'), latency
+
+    def time_get(self, path, samples, **kwargs):
+        """GET path samples times and return the latencies in seconds"""
+        latencies = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            response = self.session.get(f"{self.base_url}{path}", headers=self.headers, timeout=60, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+        return latencies
+
+def print_scaling_report(title, rows):
+    """Print latency percentiles per data size and the growth from smallest to largest"""
+    print(f"\n📈 {title}")
+    print(f"   {'tenders':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for size, stats in rows:
+        print(f"   {size:>8} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+    if len(rows) > 1 and rows[0][1]['p50_ms']:
+        growth = rows[-1][1]['p50_ms'] / rows[0][1]['p50_ms']
+        print(f"   p50 grew {growth:.1f}x while data grew {rows[-1][0] / max(rows[0][0], 1):.0f}x")
+
+def dataset_sizes(client, dataset_user):
+    """Log client in as a generated dataset user; returns ([its tender count], count)"""
+    client.login(dataset_user)
+    total = client.get_json('/tenders/analytics')['totalTenders']
+    print(f"📚 Using {dataset_user} from the generated dataset ({total} tenders)")
+    return [total], total
+
+class AnalyticsBenchmark:
+    """Measures GET /api/tenders/analytics latency as a user's tender count grows
+
+    With dataset_user, measures that generated user's existing tenders
+    instead of seeding new ones.
+    """
+
+    def __init__(self, sizes, samples=20, base_url=BASE_URL, dataset_user=None):
+        self.sizes = sorted(sizes)
+        self.samples = samples
+        self.dataset_user = dataset_user
+        self.client = BenchmarkClient(base_url, label='bench.analytics')
+
+    def run(self):
+        """Seed up to each size in turn and time the analytics endpoint"""
+        print("🚀 Starting Analytics Scaling Benchmark")
+        print("=" * 60)
+        if self.dataset_user:
+            sizes, seeded = dataset_sizes(self.client, self.dataset_user)
+        else:
+            self.client.signup()
+            sizes, seeded = self.sizes, 0
+
+        rows = []
+        for size in sizes:
+            if size > seeded:
+                print(f"🌱 Seeding tenders {seeded} -> {size}...")
+                self.client.seed_tenders(size - seeded, start=seeded)
+                seeded = size
+
+            response = self.client.session.get(f"{self.client.base_url}/tenders/analytics", headers=self.client.headers, timeout=60)
+            response.raise_for_status()
+            if response.json()['totalTenders'] != size:
+                print(f"❌ FAIL Analytics reports {response.json()['totalTenders']} tenders, expected {size}")
+                return False
+
+            rows.append((size, latency_stats(self.client.time_get('/tenders/analytics', self.samples))))
+
+        print_scaling_report("GET /api/tenders/analytics", rows)
+        ResultsStore().record_run('bench-analytics', {
+            f"analytics@{size}": dict(stats, duration_ms=stats['p50_ms']) for size, stats in rows
+        }, dataset_user=self.dataset_user)
+        return True
+
+class HistoryBenchmark:
+    """Measures GET /api/tenders/history page latency as a user's history grows
+
+    With dataset_user, walks that generated user's existing history instead
+    of seeding new tenders.
+    """
+
+    def __init__(self, sizes, page_size=20, view='summary', base_url=BASE_URL, dataset_user=None):
+        self.sizes = sorted(sizes)
+        self.page_size = page_size
+        self.view = view
+        self.dataset_user = dataset_user
+        self.client = BenchmarkClient(base_url, label='bench.history')
+
+    def run(self):
+        """Seed up to each size and walk every page of the history"""
+        print("🚀 Starting History Pagination Benchmark")
+        print("=" * 60)
+        if self.dataset_user:
+            sizes, seeded = dataset_sizes(self.client, self.dataset_user)
+        else:
+            self.client.signup()
+            sizes, seeded = self.sizes, 0
+
+        rows = []
+        records = {}
+        for size in sizes:
+            if size > seeded:
+                print(f"🌱 Seeding tenders {seeded} -> {size}...")
+                self.client.seed_tenders(size - seeded, start=seeded)
+                seeded = size
+
+            latencies = []
+            page_bytes = []
+            seen = set()
+            for page, latency, size_bytes in self.client.history_pages(self.page_size, self.view):
+                latencies.append(latency)
+                page_bytes.append(size_bytes)
+                seen.update(tender['_id'] for tender in page['tenders'])
+            if len(seen) != size:
+                print(f"❌ FAIL Paging returned {len(seen)} distinct tenders, expected {size}")
+                return False
+
+            stats = latency_stats(latencies)
+            stats['first_page_ms'] = latencies[0] * 1000
+            stats['last_page_ms'] = latencies[-1] * 1000
+            stats['avg_page_bytes'] = sum(page_bytes) / len(page_bytes)
+            rows.append((size, stats))
+            records[f"history@{size}"] = dict(stats, duration_ms=stats['p50_ms'])
+            print(f"   {len(latencies)} pages, first {stats['first_page_ms']:.1f} ms, last {stats['last_page_ms']:.1f} ms, ~{stats['avg_page_bytes'] / 1024:.1f} KB/page")
+
+        print_scaling_report(f"GET /api/tenders/history (limit={self.page_size}, view={self.view})", rows)
+        ResultsStore().record_run('bench-history', records, dataset_user=self.dataset_user)
+        return True
+
+class BulkTransferBenchmark:
+    """Measures NDJSON bulk import/export throughput against single POST /save calls"""
+
+    def __init__(self, count=10000, compare_single=200, base_url=BASE_URL):
+        self.count = count
+        self.compare_single = compare_single
+        self.client = BenchmarkClient(base_url, label='bench.bulk')
+
+    def run(self):
+        """Import, export and compare throughput with per-tender saves"""
+        print("🚀 Starting Bulk Import/Export Benchmark")
+        print("=" * 60)
+        self.client.signup()
+        records = {}
+
+        start = time.perf_counter()
+        summary = self.client.bulk_import(sample_tender(i) for i in range(self.count))
+        import_s = time.perf_counter() - start
+        import_rate = summary['inserted'] / import_s
+        print(f"📥 Bulk import: {summary['inserted']} inserted, {summary['failed']} failed in {import_s:.2f}s ({import_rate:.0f} tenders/s)")
+        records['bulk_import'] = {'duration_ms': import_s * 1000, 'tenders_per_s': import_rate, 'success': summary['failed'] == 0}
+
+        start = time.perf_counter()
+        exported = sum(1 for _ in self.client.export_tenders())
+        export_s = time.perf_counter() - start
+        export_rate = exported / export_s
+        print(f"📤 Export: {exported} tenders streamed in {export_s:.2f}s ({export_rate:.0f} tenders/s)")
+        records['export'] = {'duration_ms': export_s * 1000, 'tenders_per_s': export_rate, 'success': exported == summary['inserted']}
+
+        if self.compare_single:
+            start = time.perf_counter()
+            self.client.seed_tenders(self.compare_single, start=self.count)
+            single_s = time.perf_counter() - start
+            single_rate = self.compare_single / single_s
+            print(f"🐢 Single POST /save: {self.compare_single} tenders in {single_s:.2f}s ({single_rate:.0f} tenders/s)")
+            print(f"   Bulk import is {import_rate / single_rate:.1f}x faster")
+            records['single_save'] = {'duration_ms': single_s * 1000, 'tenders_per_s': single_rate, 'success': True}
+
+        ResultsStore().record_run('bench-bulk', records, count=self.count)
+        success = all(record['success'] for record in records.values())
+        print("✅ PASS Bulk transfer round trip" if success else "❌ FAIL Bulk transfer lost or rejected tenders")
+        return success
+
+class AuthOverheadBenchmark:
+    """Measures per-request JWT verification overhead with and without the token cache
+
+    Overhead is the latency of GET /auth/verify with a valid token minus the
+    same request without one, which is rejected before any verification.
+    """
+
+    def __init__(self, requests_count=2000, spawn=False, port=5055, base_url=BASE_URL):
+        self.requests_count = requests_count
+        self.spawn = spawn
+        self.port = port
+        self.base_url = base_url
+
+    def time_verify(self, client, authenticated):
+        """Time requests_count GET /auth/verify calls and return the latencies"""
+        headers = client.headers if authenticated else {}
+        expected = 200 if authenticated else 401
+        latencies = []
+        for _ in range(self.requests_count):
+            start = time.perf_counter()
+            response = client.session.get(f"{client.base_url}/auth/verify", headers=headers, timeout=30)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected:
+                raise RuntimeError(f"/auth/verify returned {response.status_code}, expected {expected}")
+        return latencies
+
+    def measure_mode(self, base_url):
+        """Measure auth overhead against one running backend"""
+        client = BenchmarkClient(base_url, label='bench.auth').signup()
+        self.time_verify(client, True)  # Warm up connections and the cache
+        with_token = latency_stats(self.time_verify(client, True))
+        without_token = latency_stats(self.time_verify(client, False))
+        with_token['overhead_ms'] = with_token['p50_ms'] - without_token['p50_ms']
+        return with_token
+
+    def run(self):
+        """Measure with and without the cache (spawned servers) or the running server as-is"""
+        print("🚀 Starting Auth Overhead Benchmark")
+        print("=" * 60)
+
+        if self.spawn:
+            modes = [('cache_off', {'TOKEN_CACHE_SIZE': '0'}), ('cache_on', {})]
+        else:
+            modes = [('running_server', None)]
+
+        records = {}
+        for mode, env in modes:
+            process = start_backend(self.port, env) if env is not None else None
+            try:
+                base_url = f"http://localhost:{self.port}/api" if process else self.base_url
+                stats = self.measure_mode(base_url)
+            finally:
+                stop_backend(process)
+            records[f"auth_{mode}"] = dict(stats, duration_ms=stats['p50_ms'])
+            print(f"🔐 {mode}: p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms, auth overhead {stats['overhead_ms']:.3f} ms/request")
+
+        if 'auth_cache_on' in records:
+            saved = records['auth_cache_off']['overhead_ms'] - records['auth_cache_on']['overhead_ms']
+            print(f"   Token cache saves {saved:.3f} ms per authenticated request")
+
+        ResultsStore().record_run('bench-auth', records, requests=self.requests_count)
+        return True
+
+class PasswordHashingBenchmark:
+    """Sweeps bcrypt cost factors and login concurrency on spawned backends
+
+    For each cost, one backend hashes on the main thread (HASH_WORKERS=0) and
+    one uses the worker pool. Each login burst runs while a probe thread pages
+    GET /tenders/history, so blocking of unrelated requests shows up as added
+    history latency over the idle baseline.
+    """
+
+    def __init__(self, costs, concurrency_levels, logins=200, history_tenders=50, port=5055):
+        self.costs = costs
+        self.concurrency_levels = sorted(concurrency_levels)
+        self.logins = logins
+        self.history_tenders = history_tenders
+        self.port = port
+
+    def probe_history(self, client, stop, latencies):
+        """Request the first history page until stop is set"""
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.session.get(f"{client.base_url}/tenders/history", params={'limit': 20},
+                                          headers=client.headers, timeout=60)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    def login_burst(self, users, concurrency):
+        """Run self.logins logins spread over users; returns (latencies, errors, elapsed)"""
+        def login(index):
+            user = users[index % len(users)]
+            start = time.perf_counter()
+            response = user.session.post(f"{user.base_url}/auth/login", json={
+                "email": user.email,
+                "password": user.password
+            }, timeout=120)
+            return time.perf_counter() - start, response.status_code == 200
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(login, range(self.logins)))
+        elapsed = time.perf_counter() - start
+        return [latency for latency, _ in samples], sum(1 for _, ok in samples if not ok), elapsed
+
+    def measure_backend(self, cost, mode, env):
+        """Measure every concurrency level against one spawned backend"""
+        base_url = f"http://localhost:{self.port}/api"
+        process = start_backend(self.port, dict(env, BCRYPT_COST=str(cost)))
+        records = {}
+        try:
+            prober = BenchmarkClient(base_url, label='bench.bcrypt.probe').signup()
+            prober.seed_tenders(self.history_tenders)
+            idle = latency_stats(prober.time_get('/tenders/history', 50, params={'limit': 20}))
+
+            users = [
+                BenchmarkClient(base_url, label=f"bench.bcrypt.{cost}.{mode}.{i}")
+                for i in range(self.concurrency_levels[-1])
+            ]
+            with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as pool:
+                list(pool.map(lambda user: user.signup(), users))
+
+            for concurrency in self.concurrency_levels:
+                stop = threading.Event()
+                history_latencies = []
+                probe = threading.Thread(target=self.probe_history, args=(prober, stop, history_latencies))
+                probe.start()
+                try:
+                    latencies, errors, elapsed = self.login_burst(users[:concurrency], concurrency)
+                finally:
+                    stop.set()
+                    probe.join()
+
+                login = latency_stats(latencies)
+                history = latency_stats(history_latencies)
+                record = {
+                    'duration_ms': login['p95_ms'],
+                    'login_p50_ms': login['p50_ms'],
+                    'login_p95_ms': login['p95_ms'],
+                    'logins_per_s': len(latencies) / elapsed,
+                    'errors': errors,
+                    'history_idle_p95_ms': idle['p95_ms'],
+                    'history_p95_ms': history['p95_ms'],
+                    'history_added_p95_ms': history['p95_ms'] - idle['p95_ms'],
+                    'success': errors == 0
+                }
+                records[f"cost{cost}_{mode}@{concurrency}"] = record
+                print(f"   {cost:>4} {mode:>11} {concurrency:>5} {record['logins_per_s']:>9.1f} "
+                      f"{record['login_p95_ms']:>11.1f} {record['history_added_p95_ms']:>+13.1f} {errors:>6}")
+        finally:
+            stop_backend(process)
+        return records
+
+    def run(self):
+        """Sweep cost x hashing mode x concurrency and record every combination"""
+        print("🚀 Starting Password Hashing Benchmark")
+        print("=" * 60)
+
+        print(f"   {'cost':>4} {'hashing':>11} {'conc':>5} {'logins/s':>9} {'login p95':>11} {'history +p95':>13} {'errors':>6}")
+        records = {}
+        for cost in self.costs:
+            for mode, env in (('main_thread', {'HASH_WORKERS': '0'}), ('worker_pool', {})):
+                records.update(self.measure_backend(cost, mode, env))
+
+        ResultsStore().record_run('bench-bcrypt', records, logins=self.logins)
+        success = all(record['success'] for record in records.values())
+        print("✅ PASS All logins succeeded" if success else "❌ FAIL Some logins failed")
+        return success
+
+class RenderBenchmark:
+    """Measures server-side document rendering throughput with a cold and warm render cache
+
+    Each sampled tender is saved twice, so the second copy has a different ID
+    but identical content and must be served from the cache.
+    """
+
+    def __init__(self, tenders=50, formats=('pdf', 'docx', 'xlsx'), concurrency=DEFAULT_WORKERS, base_url=BASE_URL):
+        self.tenders = tenders
+        self.formats = formats
+        self.concurrency = concurrency
+        self.client = BenchmarkClient(base_url, label='bench.render')
+
+    def render_all(self, tender_ids, format):
+        """Render every tender concurrently; returns (latencies, bytes, cache statuses, elapsed)"""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            samples = list(pool.map(lambda tender_id: self.client.render(tender_id, format), tender_ids))
+        elapsed = time.perf_counter() - start
+        return [s[0] for s in samples], [s[1] for s in samples], [s[2] for s in samples], elapsed
+
+    def run(self):
+        """Render each format cold, warm and for identical-content copies"""
+        print("🚀 Starting Render Throughput Benchmark")
+        print("=" * 60)
+        self.client.signup()
+
+        # Random numbering keeps earlier runs from pre-warming the server's cache
+        start = random.randrange(10 ** 9)
+        print(f"🌱 Saving {self.tenders} tenders and an identical copy of each...")
+        originals = [t['_id'] for t in self.client.seed_tenders(self.tenders, start=start)]
+        copies = [t['_id'] for t in self.client.seed_tenders(self.tenders, start=start)]
+
+        print(f"   {'format':>6} {'pass':>6} {'docs/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'avg KB':>7} {'hits':>6}")
+        records = {}
+        success = True
+        for format in self.formats:
+            for phase, tender_ids in (('cold', originals), ('warm', originals), ('copies', copies)):
+                latencies, sizes, statuses, elapsed = self.render_all(tender_ids, format)
+                stats = latency_stats(latencies)
+                hit_rate = statuses.count('hit') / len(statuses)
+                # Concurrent cold renders of one document share a render, so
+                # only later passes are required to be all hits
+                ok = phase == 'cold' or hit_rate == 1.0
+                success = success and ok
+                records[f"render_{format}_{phase}"] = dict(
+                    stats, duration_ms=stats['p50_ms'], docs_per_s=len(latencies) / elapsed,
+                    avg_bytes=sum(sizes) / len(sizes), hit_rate=hit_rate, success=ok
+                )
+                print(f"   {format:>6} {phase:>6} {len(latencies) / elapsed:>8.1f} {stats['p50_ms']:>8.1f} "
+                      f"{stats['p95_ms']:>8.1f} {sum(sizes) / len(sizes) / 1024:>7.1f} {hit_rate * 100:>5.0f}%")
+
+        ResultsStore().record_run('bench-render', records, tenders=self.tenders, concurrency=self.concurrency)
+        print("✅ PASS Repeated and identical renders were served from the cache" if success
+              else "❌ FAIL Some repeated renders missed the cache")
+        return success
+
+class StorageDedupReport:
+    """Reports tender storage before and after content deduplication
+
+    Seeds a scratch database with tenders in the pre-deduplication layout,
+    where users re-save earlier selections at repeat_ratio. It then runs
+    `npm run dedup-tenders` against it and compares collection sizes.
+    """
+
+    def __init__(self, users=200, tenders_per_user=50, repeat_ratio=0.6, seed=42, mongo_uri=SCRATCH_MONGO_URI):
+        self.users = users
+        self.tenders_per_user = tenders_per_user
+        self.repeat_ratio = repeat_ratio
+        self.seed = seed
+        self.mongo_uri = mongo_uri
+
+    def seed_tenders(self, db):
+        """Insert inline-layout tenders; returns {tender_id: (categories, categoriesOrder)}"""
+        from bson import ObjectId
+        rng = random.Random(self.seed)
+        expected = {}
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for user in range(self.users):
+            user_id = ObjectId()
+            selections = []
+            docs = []
+            for i in range(self.tenders_per_user):
+                if selections and rng.random() < self.repeat_ratio:
+                    payload = rng.choice(selections)
+                else:
+                    payload = sample_tender(user * self.tenders_per_user + i)
+                    selections.append(payload)
+                tender_id = ObjectId()
+                expected[tender_id] = (payload['categories'], payload['categoriesOrder'])
+                docs.append({
+                    '_id': tender_id, 'userId': user_id, 'title': f"Tender {i}", 'sector': payload['sector'],
+                    'categories': payload['categories'], 'categoriesOrder': payload['categoriesOrder'],
+                    'isDraft': payload['isDraft'], 'createdAt': created + timedelta(hours=i),
+                    'updatedAt': created + timedelta(hours=i), '__v': 0
+                })
+            db.tenders.insert_many(docs)
+        return expected
+
+    def collection_sizes(self, db):
+        """Return {collection: {documents, data_bytes, storage_bytes, index_bytes}}"""
+        sizes = {}
+        for name in ('tenders', 'tendercontents'):
+            if name not in db.list_collection_names():
+                continue
+            stats = db.command('collStats', name)
+            sizes[name] = {
+                'documents': stats['count'],
+                'data_bytes': stats['size'],
+                'storage_bytes': stats['storageSize'],
+                'index_bytes': stats['totalIndexSize']
+            }
+        return sizes
+
+    def verify(self, db, expected):
+        """Check every tender resolves to its original selection and refCounts add up"""
+        contents = {doc['_id']: doc for doc in db.tendercontents.find()}
+        problems = []
+        for tender in db.tenders.find({}, {'contentHash': 1, 'categories': 1}):
+            content = contents.get(tender.get('contentHash'))
+            if 'categories' in tender or content is None:
+                problems.append(f"{tender['_id']} was not migrated")
+            elif (content['categories'], content['categoriesOrder']) != expected[tender['_id']]:
+                problems.append(f"{tender['_id']} resolves to a different selection")
+        references = sum(content['refCount'] for content in contents.values())
+        if references != len(expected):
+            problems.append(f"refCounts add up to {references}, expected {len(expected)}")
+        return problems
+
+    def run(self):
+        """Seed, migrate, verify and report storage before and after"""
+        print("🚀 Starting Content Deduplication Storage Report")
+        print("=" * 60)
+        try:
+            from pymongo import MongoClient
+        except ImportError:
+            print("❌ FAIL Storage report requires pymongo (pip install pymongo)")
+            return False
+
+        client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=3000)
+        db = client.get_default_database()
+        try:
+            client.drop_database(db.name)
+            print(f"🌱 Seeding {self.users} users x {self.tenders_per_user} tenders (repeat ratio {self.repeat_ratio})...")
+            expected = self.seed_tenders(db)
+            before = self.collection_sizes(db)
+
+            migration = subprocess.run(
+                ['node', 'scripts/dedupTenders.js'], cwd=SERVER_DIR,
+                env=dict(os.environ, MONGO_URI=self.mongo_uri),
+                capture_output=True, text=True, timeout=600
+            )
+            if migration.returncode != 0:
+                print(f"❌ FAIL Migration failed: {migration.stderr.strip()[-500:]}")
+                return False
+            print(f"🔁 {migration.stdout.strip()}")
+            after = self.collection_sizes(db)
+            problems = self.verify(db, expected)
+        finally:
+            client.drop_database(db.name)
+            client.close()
+
+        data_before = sum(c['data_bytes'] for c in before.values())
+        data_after = sum(c['data_bytes'] for c in after.values())
+        distinct = after.get('tendercontents', {}).get('documents', 0)
+        print(f"\n📦 {len(expected)} tenders, {distinct} distinct selections ({len(expected) / max(distinct, 1):.1f} tenders per selection)")
+        print(f"   {'collection':>15} {'docs':>8} {'data KB':>10} {'storage KB':>11} {'index KB':>9}")
+        for label, sizes in (('before', before), ('after', after)):
+            for name, stats in sizes.items():
+                print(f"   {label + ' ' + name:>15} {stats['documents']:>8} {stats['data_bytes'] / 1024:>10.1f} "
+                      f"{stats['storage_bytes'] / 1024:>11.1f} {stats['index_bytes'] / 1024:>9.1f}")
+        saved = 1 - data_after / data_before if data_before else 0.0
+        print(f"   Logical data size: {data_before / 1024:.1f} KB -> {data_after / 1024:.1f} KB ({saved * 100:.1f}% smaller)")
+        print("   WiredTiger keeps freed pages until `compact`, so storage size lags behind data size")
+
+        ResultsStore().record_run('bench-dedup', {
+            'data_bytes': {'before': data_before, 'after': data_after, 'saved_pct': saved * 100, 'success': not problems},
+        }, users=self.users, tenders_per_user=self.tenders_per_user, repeat_ratio=self.repeat_ratio,
+            distinct_selections=distinct, collections={'before': before, 'after': after})
+
+        if problems:
+            print(f"❌ FAIL {len(problems)} problem(s) after migration")
+            for problem in problems[:10]:
+                print(f"   {problem}")
+            return False
+        print("✅ PASS Every tender resolves to its original selection")
+        return True
+
+def parse_timestamp(value):
+    """Parse an ISO timestamp as returned by the API into an aware UTC datetime"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc)
+
+def week_key(moment):
+    """Rollup key of the UTC week (starting Monday) containing moment"""
+    return (moment - timedelta(days=moment.weekday())).strftime('%Y-%m-%d')
+
+def recount_analytics(tenders, now):
+    """Recompute the analytics counters from a full tender list"""
+    expected = {
+        'totalTenders': len(tenders),
+        'draftTenders': sum(1 for t in tenders if t.get('isDraft')),
+        'finalizedTenders': sum(1 for t in tenders if not t.get('isDraft')),
+        'tendersThisMonth': 0,
+        'tendersThisWeek': 0,
+        'categoryCount': {},
+        'sectorCount': {}
+    }
+    for tender in tenders:
+        created = parse_timestamp(tender['createdAt'])
+        if created.strftime('%Y-%m') == now.strftime('%Y-%m'):
+            expected['tendersThisMonth'] += 1
+        if week_key(created) == week_key(now):
+            expected['tendersThisWeek'] += 1
+        for category_id in tender.get('categories') or {}:
+            expected['categoryCount'][category_id] = expected['categoryCount'].get(category_id, 0) + 1
+        expected['sectorCount'][tender['sector']] = expected['sectorCount'].get(tender['sector'], 0) + 1
+    return expected
+
+class RollupConsistencyCheck:
+    """Verifies the analytics rollup matches a full recount after random saves and deletes"""
+
+    def __init__(self, operations=500, seed=42, batch_size=DEFAULT_WORKERS, delete_ratio=0.35, base_url=BASE_URL):
+        self.operations = operations
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.delete_ratio = delete_ratio
+        self.client = BenchmarkClient(base_url, label='bench.rollup')
+
+    def run_stream(self):
+        """Apply the randomized save/delete stream, each batch running concurrently
+
+        The dashboard is read once halfway through, like a user checking it
+        mid-session; the rollup must keep absorbing the remaining deltas.
+        """
+        live = []
+        saves = deletes = 0
+        halfway = self.operations // 2
+        with ThreadPoolExecutor(max_workers=self.batch_size) as pool:
+            for batch_start in range(0, self.operations, self.batch_size):
+                if batch_start <= halfway < batch_start + self.batch_size:
+                    self.client.get_json('/tenders/analytics')
+                batch = min(self.batch_size, self.operations - batch_start)
+                to_delete = []
+                to_save = []
+                for _ in range(batch):
+                    if live and self.rng.random() < self.delete_ratio:
+                        to_delete.append(live.pop(self.rng.randrange(len(live))))
+                    else:
+                        to_save.append(sample_tender(self.rng.randrange(10 ** 6)))
+                futures = [pool.submit(self.client.delete_tender, tender_id) for tender_id in to_delete]
+                saved = list(pool.map(self.client.save_tender, to_save))
+                for future in futures:
+                    future.result()
+                live.extend(tender['_id'] for tender in saved)
+                saves += len(to_save)
+                deletes += len(to_delete)
+        return saves, deletes, len(live)
+
+    def run(self):
+        """Run the stream and compare /analytics against a recount of /history"""
+        print("🚀 Starting Analytics Rollup Consistency Check")
+        print("=" * 60)
+        self.client.signup()
+        # Rollups are only created by a read, so build the (empty) one up front;
+        # otherwise every save below is skipped and the final read is a recount
+        self.client.get_json('/tenders/analytics')
+
+        start = time.perf_counter()
+        saves, deletes, live = self.run_stream()
+        print(f"🔀 Applied {saves} saves and {deletes} deletes in {time.perf_counter() - start:.1f}s ({live} tenders remain)")
+
+        analytics = self.client.get_json('/tenders/analytics')
+        expected = recount_analytics(self.client.history(), datetime.now(timezone.utc))
+
+        mismatches = []
+        for field in ['totalTenders', 'draftTenders', 'finalizedTenders', 'tendersThisMonth', 'tendersThisWeek', 'categoryCount']:
+            if analytics[field] != expected[field]:
+                mismatches.append((field, analytics[field], expected[field]))
+        top_sectors = sorted(expected['sectorCount'].values(), reverse=True)[:5]
+        if [item['count'] for item in analytics['mostUsedSectors']] != top_sectors or \
+                any(expected['sectorCount'].get(item['sector']) != item['count'] for item in analytics['mostUsedSectors']):
+            mismatches.append(('mostUsedSectors', analytics['mostUsedSectors'], expected['sectorCount']))
+
+        for field, actual, wanted in mismatches:
+            print(f"❌ FAIL {field}: rollup={actual} recount={wanted}")
+        if not mismatches:
+            print("✅ PASS Rollup matches a full recount of the tender history")
+
+        ResultsStore().record_run('bench-rollup', {
+            'rollup_consistency': {'success': not mismatches, 'operations': self.operations, 'mismatches': len(mismatches)}
+        })
+        return not mismatches
+
+class DraftConcurrencyCheck:
+    """Hammers one draft with JSON Patch autosaves from several clients and checks no update is lost
+
+    Every writer adds its own categories with version-checked PATCHes,
+    rebasing onto the returned tender on each 409, so the final draft must
+    hold every writer's categories and one version per accepted patch.
+    """
+
+    def __init__(self, writers=8, edits=25, base_url=BASE_URL):
+        self.writers = writers
+        self.edits = edits
+        self.client = BenchmarkClient(base_url, label='bench.drafts')
+
+    def write(self, writer, tender):
+        """Apply one writer's edits; returns (attempt records, conflicts)
+
+        Only a 409 is retried, on the tender it returns; any other error is
+        recorded as a failed attempt and that edit is skipped.
+        """
+        session = get_session()
+        records = []
+        conflicts = 0
+        for edit in range(self.edits):
+            category_id = f"W{writer}E{edit}"
+            ops = [
+                {'op': 'add', 'path': f"/categories/{category_id}", 'value': [str(edit % 5)]},
+                {'op': 'add', 'path': '/categoriesOrder/-', 'value': category_id}
+            ]
+            while True:
+                status, body, latency = self.client.patch_tender(tender['_id'], tender['version'], ops, session=session)
+                records.append({'duration_ms': latency * 1000, 'success': status == 200, 'status': status})
+                if status not in (200, 409):
+                    break
+                tender = body['tender']
+                if status == 200:
+                    break
+                conflicts += 1
+        return records, conflicts
+
+    def run(self):
+        """Run every writer against one draft and verify the merged result"""
+        print("🚀 Starting Draft Autosave Concurrency Check")
+        print("=" * 60)
+        self.client.signup()
+        draft = self.client.save_tender({
+            'title': 'Concurrent Draft', 'sector': 'it', 'isDraft': True,
+            'categories': {'IT1': ['0']}, 'categoriesOrder': ['IT1']
+        })
+        # Build the rollup now so every patch below reaches it as a delta
+        self.client.get_json('/tenders/analytics')
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.writers) as pool:
+            results = list(pool.map(lambda writer: self.write(writer, draft), range(self.writers)))
+        elapsed = time.perf_counter() - start
+        attempts = [record for records, _ in results for record in records]
+        conflicts = sum(c for _, c in results)
+        failed = [record['status'] for record in attempts if record['status'] not in (200, 409)]
+        accepted = self.writers * self.edits
+        print(f"✍️  {accepted} patches from {self.writers} writers in {elapsed:.1f}s "
+              f"({conflicts} conflicts retried, {len(attempts)} attempts)")
+
+        final = self.client.get_json(f"/tenders/{draft['_id']}")
+        expected_ids = ['IT1'] + [f"W{w}E{e}" for w in range(self.writers) for e in range(self.edits)]
+        problems = []
+        if failed:
+            problems.append(f"{len(failed)} patches failed outright, statuses {sorted(set(failed))}")
+        missing = [cid for cid in expected_ids if cid not in final['categories']]
+        if missing:
+            problems.append(f"{len(missing)} categories lost, e.g. {missing[:5]}")
+        if sorted(final['categoriesOrder']) != sorted(expected_ids):
+            problems.append(f"categoriesOrder has {len(final['categoriesOrder'])} entries, expected {len(expected_ids)}")
+        if final['version'] != accepted:
+            problems.append(f"version is {final['version']}, expected {accepted}")
+        for writer in range(self.writers):
+            own = [cid for cid in final['categoriesOrder'] if cid.startswith(f"W{writer}E")]
+            if own != [f"W{writer}E{e}" for e in range(self.edits)]:
+                problems.append(f"writer {writer}'s categories are out of order")
+
+        stale_status, _, _ = self.client.patch_tender(draft['_id'], draft['version'], [])
+        if stale_status != 409:
+            problems.append(f"a stale version was answered with {stale_status}, expected 409")
+
+        analytics = self.client.get_json('/tenders/analytics')
+        if analytics['totalTenders'] != 1 or analytics['draftTenders'] != 1 or \
+                any(analytics['categoryCount'].get(cid) != 1 for cid in expected_ids):
+            problems.append("analytics rollup drifted from the draft's final content")
+
+        for problem in problems:
+            print(f"❌ FAIL {problem}")
+        if not problems:
+            print(f"✅ PASS No lost updates across {accepted} concurrent patches")
+
+        stats = latency_stats([record['duration_ms'] / 1000 for record in attempts])
+        print(f"📊 Patch latency p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms")
+        ResultsStore().record_run('bench-drafts', {
+            'draft_patches': dict(stats, duration_ms=stats['p50_ms'], success=not problems, accepted=accepted,
+                                  attempts=len(attempts), conflicts=conflicts, problems=len(problems))
+        }, writers=self.writers, edits=self.edits)
+        return not problems
+
+# Requests made by one visit to the Dashboard and Account pages
+DASHBOARD_REQUESTS = [
+    ('analytics', '/tenders/analytics', {}),
+    ('history', '/tenders/history', {'view': 'summary', 'limit': 20})
+]
+
+class DashboardCachingBenchmark:
+    """Measures bytes on the wire and 304 rates for repeated dashboard loads
+
+    Loads run uncompressed without caching, compressed, and compressed with
+    If-None-Match revalidation. A tender is saved every few cached loads, and
+    the load after each save must not be answered from the stale copy.
+    """
+
+    def __init__(self, tenders=200, loads=30, write_every=5, base_url=BASE_URL):
+        self.tenders = tenders
+        self.loads = loads
+        self.write_every = write_every
+        self.client = BenchmarkClient(base_url, label='bench.caching')
+
+    def load_dashboard(self, encoding, etags=None):
+        """Fetch every dashboard request once; returns {name: (status, bytes, etag, latency)}"""
+        return {
+            name: self.client.conditional_get(path, (etags or {}).get(name), encoding, params=params)
+            for name, path, params in DASHBOARD_REQUESTS
+        }
+
+    def run_mode(self, mode):
+        """Run all loads in one mode; returns (bytes per load, latencies, 304 count, stale responses)"""
+        encoding = 'identity' if mode == 'plain' else 'gzip'
+        sizes, latencies = [], []
+        not_modified = stale = 0
+        etags = {}
+        for load in range(self.loads):
+            wrote = mode == 'revalidated' and load > 0 and load % self.write_every == 0
+            if wrote:
+                self.client.save_tender(sample_tender(self.tenders + load))
+            responses = self.load_dashboard(encoding, etags if mode == 'revalidated' else None)
+            sizes.append(sum(size for _, size, _, _ in responses.values()))
+            latencies.extend(latency for _, _, _, latency in responses.values())
+            for name, (status, _, etag, _) in responses.items():
+                if status == 304:
+                    not_modified += 1
+                    stale += wrote
+                else:
+                    etags[name] = etag
+        return sizes, latencies, not_modified, stale
+
+    def run(self):
+        """Compare the three modes and check revalidation never serves stale data"""
+        print("🚀 Starting Dashboard Compression and Caching Benchmark")
+        print("=" * 60)
+        self.client.signup()
+        print(f"🌱 Seeding {self.tenders} tenders...")
+        self.client.seed_tenders(self.tenders)
+
+        requests_per_load = len(DASHBOARD_REQUESTS)
+        print(f"   {'mode':>12} {'KB/load':>9} {'p50 ms':>8} {'304s':>6}")
+        records = {}
+        baseline = None
+        success = True
+        for mode in ('plain', 'gzip', 'revalidated'):
+            sizes, latencies, not_modified, stale = self.run_mode(mode)
+            stats = latency_stats(latencies)
+            per_load = sum(sizes) / len(sizes)
+            baseline = baseline or per_load
+            hit_rate = not_modified / (self.loads * requests_per_load)
+            # Unchanged data must revalidate: every load but the first and
+            # those right after a save should be all 304s
+            writes = (self.loads - 1) // self.write_every
+            ok = stale == 0 and (mode != 'revalidated' or not_modified == (self.loads - 1 - writes) * requests_per_load)
+            success = success and ok
+            records[f"dashboard_{mode}"] = dict(
+                stats, duration_ms=stats['p50_ms'], bytes_per_load=per_load,
+                saved_ratio=1 - per_load / baseline, not_modified_rate=hit_rate, stale=stale, success=ok
+            )
+            print(f"   {mode:>12} {per_load / 1024:>9.1f} {stats['p50_ms']:>8.1f} {hit_rate * 100:>5.0f}%")
+
+        saved = records['dashboard_revalidated']['saved_ratio']
+        print(f"📊 Compression plus revalidation saves {saved * 100:.0f}% of dashboard bytes")
+        ResultsStore().record_run('bench-caching', records, tenders=self.tenders, loads=self.loads,
+                                  write_every=self.write_every)
+        print("✅ PASS Unchanged dashboards revalidated and changed ones were refetched" if success
+              else "❌ FAIL Revalidation served stale data or missed unchanged responses")
+        return success
+
+def process_rss_mb(pid):
+    """Resident set size of a process in MB"""
+    output = subprocess.run(['ps', '-o', 'rss=', '-p', str(pid)], capture_output=True, text=True, check=True).stdout
+    return int(output.strip()) / 1024
+
+class SessionSoakTest:
+    """Opens and abandons many sessions on spawned backends and tracks server RSS
+
+    Backends run with SESSION_PROBE=true, and every GET /api/session-probe
+    saves a new session that is never used again. With the mongo store,
+    sessions live in MongoDB until its TTL index expires them, so RSS must
+    stay flat after warm-up; the memory store keeps every session in the
+    process and runs for comparison, so it must grow faster than mongo.
+    """
+
+    def __init__(self, sessions=50000, rounds=10, max_growth_mb=25, stores=('mongo', 'memory'), port=5055):
+        self.sessions = sessions
+        self.rounds = rounds
+        self.max_growth_mb = max_growth_mb
+        self.stores = stores
+        self.port = port
+
+    def session_client(self):
+        """A pooled session that never stores cookies, so every request opens a new server session"""
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=DEFAULT_WORKERS, pool_maxsize=DEFAULT_WORKERS)
+        session.mount('http://', adapter)
+        return session
+
+    def open_sessions(self, client, count):
+        """Open count sessions and abandon them; returns how many set a session cookie"""
+        url = f"http://localhost:{self.port}/api/session-probe"
+
+        def open_one(_):
+            response = client.get(url, timeout=30)
+            return response.status_code == 204 and 'connect.sid' in response.headers.get('Set-Cookie', '')
+
+        with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as pool:
+            return sum(pool.map(open_one, range(count)))
+
+    def soak(self, store):
+        """Run every round against one backend; returns the RSS sample after each round"""
+        process = start_backend(self.port, {'SESSION_STORE': store, 'SESSION_PROBE': 'true'})
+        client = self.session_client()
+        per_round = self.sessions // self.rounds
+        samples = []
+        opened = 0
+        try:
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                opened += self.open_sessions(client, per_round)
+                elapsed = time.perf_counter() - start
+                samples.append(process_rss_mb(process.pid))
+                print(f"   {store:>7} {opened:>9} {per_round / elapsed:>8.0f} {samples[-1]:>8.1f}")
+        finally:
+            stop_backend(process)
+        return samples, opened, per_round * self.rounds
+
+    def run(self):
+        """Soak each store, check the mongo store's RSS stays bounded and the memory store's grows"""
+        print("🚀 Starting Session Store Soak Test")
+        print("=" * 60)
+        print(f"   {'store':>7} {'sessions':>9} {'req/s':>8} {'RSS MB':>8}")
+        records = {}
+        success = True
+        for store in self.stores:
+            samples, opened, attempted = self.soak(store)
+            # The first round covers startup allocations and JIT warm-up
+            growth = samples[-1] - samples[0]
+            records[f"sessions_{store}"] = {
+                'duration_ms': 0.0, 'sessions': opened, 'attempted': attempted, 'rss_mb': samples,
+                'rss_growth_mb': growth, 'bounded': growth <= self.max_growth_mb
+            }
+            print(f"📊 {store}: RSS grew {growth:+.1f} MB after warm-up over {opened} abandoned sessions")
+
+        mongo = records.get('sessions_mongo')
+        for store in self.stores:
+            record = records[f"sessions_{store}"]
+            if store == 'memory':
+                # MemoryStore never evicts, so it must outgrow the shared store it is compared with
+                baseline = mongo['rss_growth_mb'] if mongo else 0.0
+                expected = record['rss_growth_mb'] > baseline
+            else:
+                expected = record['bounded']
+            record['success'] = record['sessions'] == record['attempted'] and expected
+            success = success and record['success']
+            if record['sessions'] != record['attempted']:
+                print(f"❌ FAIL {store}: only {record['sessions']} of {record['attempted']} requests opened a session")
+            elif not expected:
+                print(f"❌ FAIL {store}: RSS grew {record['rss_growth_mb']:+.1f} MB, "
+                      + ("no more than the mongo store" if store == 'memory' else f"over the {self.max_growth_mb} MB budget"))
+
+        ResultsStore().record_run('bench-sessions', records, sessions=self.sessions, rounds=self.rounds,
+                                  max_growth_mb=self.max_growth_mb)
+        print(f"✅ PASS Mongo store RSS stayed within {self.max_growth_mb} MB of warm-up and MemoryStore grew" if success
+              else "❌ FAIL Sessions were not opened or server RSS did not behave as expected")
+        return success
+
+class PoolSaturationBenchmark:
+    """Charts MongoDB pool saturation against request latency on spawned backends
+
+    Each pool size gets its own backend. Concurrent clients page full tender
+    history while /metrics/db is scraped, so requests waiting for a
+    connection show up as a wait queue next to the latency they cause.
+    """
+
+    def __init__(self, pool_sizes=(2, 10, 50), concurrency=64, duration=15, tenders=500, port=5055):
+        self.pool_sizes = pool_sizes
+        self.concurrency = concurrency
+        self.duration = duration
+        self.tenders = tenders
+        self.port = port
+
+    def load(self, client, origin, deadline, samples):
+        """Request history pages until deadline, appending (finished at, latency, ok)"""
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = client.session.get(f"{client.base_url}/tenders/history", params={'limit': 100, 'view': 'full'},
+                                              headers=client.headers, timeout=120)
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            end = time.perf_counter()
+            samples.append((end - origin, end - start, ok))
+
+    def timeline(self, requests_done, scrapes):
+        """Per-second rows of pool gauges and request latency"""
+        rows = []
+        for second in range(int(self.duration)):
+            in_second = lambda t: second <= t < second + 1
+            pools = [body['pool'] for t, body in scrapes if in_second(t)]
+            latencies = [latency for t, latency, _ in requests_done if in_second(t)]
+            rows.append({
+                'second': second + 1,
+                'checked_out': max((p['checkedOut'] for p in pools), default=0),
+                'wait_queue': max((p['waitQueue'] for p in pools), default=0),
+                'requests': len(latencies),
+                'p95_ms': latency_stats(latencies)['p95_ms'] if latencies else 0.0
+            })
+        return rows
+
+    def print_chart(self, pool_size, rows):
+        """Print the timeline with bars for wait queue depth and p95 latency"""
+        max_wait = max((row['wait_queue'] for row in rows), default=0) or 1
+        max_p95 = max((row['p95_ms'] for row in rows), default=0) or 1
+        print(f"\n📈 maxPoolSize={pool_size}")
+        print(f"   {'s':>3} {'out':>4} {'wait':>5} {'wait queue':<20} {'p95 ms':>8} {'p95 latency':<20}")
+        for row in rows:
+            wait_bar = '█' * round(row['wait_queue'] / max_wait * 20)
+            p95_bar = '█' * round(row['p95_ms'] / max_p95 * 20)
+            print(f"   {row['second']:>3} {row['checked_out']:>4} {row['wait_queue']:>5} {wait_bar:<20} "
+                  f"{row['p95_ms']:>8.1f} {p95_bar:<20}")
+
+    def measure(self, pool_size):
+        """Load one backend with the given pool size and return its record"""
+        base_url = f"http://localhost:{self.port}/api"
+        process = start_backend(self.port, {'MONGO_MAX_POOL_SIZE': str(pool_size)})
+        try:
+            client = BenchmarkClient(base_url, label=f"bench.pool.{pool_size}").signup()
+            client.seed_tenders(self.tenders)
+
+            scraper = MetricsScraper(f"http://localhost:{self.port}/metrics/db").start()
+            deadline = scraper.origin + self.duration
+            samples = []
+            threads = [threading.Thread(target=self.load, args=(client, scraper.origin, deadline, samples))
+                       for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            scrapes = scraper.stop()
+        finally:
+            stop_backend(process)
+
+        rows = self.timeline(samples, scrapes)
+        self.print_chart(pool_size, rows)
+        stats = latency_stats([latency for _, latency, _ in samples])
+        errors = sum(1 for _, _, ok in samples if not ok)
+        last_pool = scrapes[-1][1]['pool'] if scrapes else {}
+        return dict(
+            stats, duration_ms=stats['p95_ms'], requests_per_s=len(samples) / self.duration, errors=errors,
+            max_checked_out=max((row['checked_out'] for row in rows), default=0),
+            max_wait_queue=max((row['wait_queue'] for row in rows), default=0),
+            checkout_wait_p95_ms=last_pool.get('checkoutWaitMs', {}).get('p95', 0.0),
+            scrapes=len(scrapes), timeline=rows, success=errors == 0 and bool(scrapes)
+        )
+
+    def run(self):
+        """Measure every pool size and summarize saturation against latency"""
+        print("🚀 Starting MongoDB Pool Saturation Benchmark")
+        print("=" * 60)
+        records = {f"pool{size}": self.measure(size) for size in self.pool_sizes}
+
+        print(f"\n   {'pool':>5} {'req/s':>8} {'p95 ms':>8} {'max wait':>9} {'checkout p95':>13} {'errors':>7}")
+        for size in self.pool_sizes:
+            record = records[f"pool{size}"]
+            print(f"   {size:>5} {record['requests_per_s']:>8.1f} {record['p95_ms']:>8.1f} {record['max_wait_queue']:>9} "
+                  f"{record['checkout_wait_p95_ms']:>12.1f}ms {record['errors']:>7}")
+
+        ResultsStore().record_run('bench-pool', records, concurrency=self.concurrency, duration_s=self.duration)
+        success = all(record['success'] for record in records.values())
+        print("✅ PASS Every pool size served the load and was scraped" if success
+              else "❌ FAIL Requests failed or /metrics/db could not be scraped")
+        return success
+
+class AbuseSimulationBenchmark:
+    """Floods POST /auth/login with credential stuffing while legitimate users keep working
+
+    Spawned backends trust X-Forwarded-For, so every simulated client gets
+    its own IP. Legitimate users page their history and log in now and then.
+    Attackers try wrong passwords against real accounts from a few IPs, which
+    costs a user lookup and a bcrypt compare per attempt unless the rate
+    limiter turns them away first. Legitimate p99 under attack with limits on
+    is compared against the same load without the attack.
+    """
+
+    LIMITS_ON = {'AUTH_IP_BURST': '30', 'AUTH_IP_PER_MINUTE': '20',
+                 'AUTH_ACCOUNT_BURST': '10', 'AUTH_ACCOUNT_PER_MINUTE': '5'}
+    LIMITS_OFF = {'AUTH_IP_BURST': '0', 'AUTH_ACCOUNT_BURST': '0'}
+
+    def __init__(self, legit_users=20, attackers=64, attacker_ips=4, targets=50, duration=20, login_every=20,
+                 store='memory', max_p99_growth=2.0, port=5055):
+        self.legit_users = legit_users
+        self.attackers = attackers
+        self.attacker_ips = attacker_ips
+        self.targets = targets
+        self.duration = duration
+        self.login_every = login_every
+        self.store = store
+        self.max_p99_growth = max_p99_growth
+        self.port = port
+        self.base_url = f"http://localhost:{port}/api"
+        self.session = None
+
+    @staticmethod
+    def client_ip(network, index):
+        """Distinct private address for simulated client index in network"""
+        return f"10.{network}.{index // 250}.{index % 250 + 1}"
+
+    def signup(self, label, index, network):
+        """Create an account from its own IP; returns (email, password, ip, token)"""
+        email = f"{label}.{index}.{int(datetime.now().timestamp() * 1000)}@example.com"
+        ip = self.client_ip(network, index)
+        response = self.session.post(f"{self.base_url}/auth/signup", json={
+            "name": "Abuse Benchmark User", "email": email, "password": "benchmarkPassword123"
+        }, headers={'X-Forwarded-For': ip}, timeout=60)
+        response.raise_for_status()
+        return email, "benchmarkPassword123", ip, response.json()['token']
+
+    def legit_user(self, account, deadline, samples):
+        """Page history with a short think time and log in every login_every requests"""
+        email, password, ip, token = account
+        iteration = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if iteration % self.login_every == 0:
+                    kind = 'login'
+                    response = self.session.post(f"{self.base_url}/auth/login", json={
+                        "email": email, "password": password
+                    }, headers={'X-Forwarded-For': ip}, timeout=60)
+                else:
+                    kind = 'history'
+                    response = self.session.get(f"{self.base_url}/tenders/history", params={'limit': 20},
+                                                headers={'X-Forwarded-For': ip, 'Authorization': f"Bearer {token}"},
+                                                timeout=60)
+                status = response.status_code
+            except requests.RequestException:
+                status = 0
+            samples.append((kind, time.perf_counter() - start, status))
+            iteration += 1
+            time.sleep(0.2)
+
+    def attacker(self, index, targets, deadline, outcomes):
+        """Try wrong passwords against target accounts as fast as the server answers"""
+        ip = self.client_ip(66, index % self.attacker_ips)
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            email = rng.choice(targets)
+            try:
+                response = self.session.post(f"{self.base_url}/auth/login", json={
+                    "email": email, "password": f"guess{rng.randrange(10 ** 6)}"
+                }, headers={'X-Forwarded-For': ip}, timeout=60)
+                outcomes.append(response.status_code)
+            except requests.RequestException:
+                outcomes.append(0)
+
+    def measure(self, limits, attack):
+        """Run one phase on its own backend and return its record"""
+        process = start_backend(self.port, dict(limits, TRUST_PROXY='1', RATE_LIMIT_STORE=self.store))
+        try:
+            with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as executor:
+                accounts = list(executor.map(lambda i: self.signup('bench.abuse.user', i, 1), range(self.legit_users)))
+                targets = [email for email, _, _, _ in
+                           executor.map(lambda i: self.signup('bench.abuse.target', i, 2), range(self.targets))]
+
+            deadline = time.perf_counter() + self.duration
+            samples, outcomes = [], []
+            threads = [threading.Thread(target=self.legit_user, args=(account, deadline, samples)) for account in accounts]
+            if attack:
+                threads += [threading.Thread(target=self.attacker, args=(i, targets, deadline, outcomes))
+                            for i in range(self.attackers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop_backend(process)
+
+        stats = latency_stats([latency for _, latency, _ in samples])
+        logins = latency_stats([latency for kind, latency, _ in samples if kind == 'login'] or [0.0])
+        legit_errors = sum(1 for _, _, status in samples if status != 200)
+        legit_throttled = sum(1 for _, _, status in samples if status == 429)
+        rejected = outcomes.count(429)
+        return dict(
+            stats, duration_ms=stats['p99_ms'], login_p99_ms=logins['p99_ms'], legit_requests=len(samples),
+            legit_errors=legit_errors, legit_throttled=legit_throttled,
+            attack_requests=len(outcomes), attack_per_s=len(outcomes) / self.duration,
+            attack_rejected_pct=rejected / len(outcomes) * 100 if outcomes else 0.0,
+            attack_failed=outcomes.count(0), success=legit_errors == 0
+        )
+
+    def run(self):
+        """Compare legitimate latency without attack, under attack, and under attack with limits"""
+        print("🚀 Starting Login Abuse Simulation")
+        print("=" * 60)
+        print(f"👥 {self.legit_users} users vs {self.attackers} attackers from {self.attacker_ips} IPs "
+              f"on {self.targets} accounts, {self.duration}s per phase, {self.store} buckets")
+        self.session = get_session()
+
+        phases = [('quiet', self.LIMITS_ON, False), ('unlimited', self.LIMITS_OFF, True), ('limited', self.LIMITS_ON, True)]
+        records = {}
+        print(f"\n   {'phase':>9} {'p50 ms':>8} {'p99 ms':>8} {'login p99':>10} {'errors':>7} {'attack/s':>9} {'rejected':>9}")
+        for phase, limits, attack in phases:
+            record = self.measure(limits, attack)
+            records[f"abuse_{phase}"] = record
+            print(f"   {phase:>9} {record['p50_ms']:>8.1f} {record['p99_ms']:>8.1f} {record['login_p99_ms']:>10.1f} "
+                  f"{record['legit_errors']:>7} {record['attack_per_s']:>9.1f} {record['attack_rejected_pct']:>8.1f}%")
+
+        quiet, unlimited, limited = (records[f"abuse_{phase}"] for phase, _, _ in phases)
+        growth = limited['p99_ms'] / quiet['p99_ms'] if quiet['p99_ms'] else float('inf')
+        print(f"\n   Under attack, legitimate p99 is {unlimited['p99_ms'] / max(quiet['p99_ms'], 1e-9):.1f}x quiet without limits "
+              f"and {growth:.1f}x with limits")
+        ResultsStore().record_run('bench-abuse', records, legit_users=self.legit_users, attackers=self.attackers,
+                                  attacker_ips=self.attacker_ips, store=self.store, duration_s=self.duration)
+
+        success = growth <= self.max_p99_growth and limited['legit_errors'] == 0 and quiet['legit_errors'] == 0
+        if success:
+            print(f"✅ PASS Legitimate p99 stayed within {self.max_p99_growth:g}x of quiet while attackers were throttled")
+        else:
+            print(f"❌ FAIL Legitimate p99 grew {growth:.1f}x or legitimate requests failed "
+                  f"({limited['legit_throttled']} throttled)")
+        return success
+
+def load_capture(path):
+    """Read a traffic capture (TRAFFIC_CAPTURE_FILE NDJSON) in arrival order"""
+    records = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return sorted(records, key=lambda record: record['at'])
+
+class TrafficReplay:
+    """Replays captured production traffic and compares latency between builds
+
+    Requests are sent at their captured inter-arrival times divided by speed.
+    Each captured user is replayed by a fresh user with its own JWT, and IDs
+    are remapped to the tenders the replay itself creates. Per-route
+    latencies are stored as a bench-replay run and compared against the last
+    replay of the same capture, e.g. one made against the previous build.
+    """
+
+    def __init__(self, capture, speed=1.0, concurrency=64, baseline=None, threshold=20.0, base_url=BASE_URL):
+        self.capture = capture
+        self.speed = speed
+        self.concurrency = concurrency
+        self.baseline = baseline
+        self.threshold = threshold
+        self.base_url = base_url
+        self.origin = base_url.rsplit('/api', 1)[0]
+        self.clients = {}
+        self.anonymous = None
+        self.ids = {}
+        self.created = {}
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def prepare_users(self, records):
+        """Sign up one replay user per captured user, plus one for anonymous requests"""
+        users = sorted({record['user'] for record in records if record.get('user')})
+        with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as executor:
+            clients = list(executor.map(
+                lambda i: BenchmarkClient(self.base_url, label=f"replay.{i}").signup(), range(len(users) + 1)
+            ))
+        self.clients = dict(zip(users, clients))
+        self.anonymous = clients[-1]
+        print(f"👥 {len(users)} captured users replayed by fresh accounts")
+
+    def resolve_id(self, alias, client):
+        """Real ID for a captured ID pseudonym, else one of the client's replayed tenders"""
+        with self.lock:
+            if alias in self.ids:
+                return self.ids[alias]
+            created = self.created.get(client.email)
+            return random.choice(created) if created else None
+
+    def build_request(self, record):
+        """Return (client, method, url, kwargs) for a captured record, or None to skip it"""
+        client = self.clients.get(record.get('user'), self.anonymous)
+        path = record['route']
+        for name, alias in (record.get('params') or {}).items():
+            value = self.resolve_id(alias, client)
+            if value is None:
+                return None
+            path = path.replace(f":{name}", value)
+
+        body = dict(record['body']) if record.get('body') else None
+        if record['route'] == '/api/auth/signup':
+            body = {'name': "Replay User", 'email': f"replay.{time.time_ns()}@example.com", 'password': client.password}
+        elif record['route'] == '/api/auth/login':
+            body = {'email': client.email, 'password': client.password}
+        elif body is not None and 'version' in body and path != record['route']:
+            # Patch against the version the replay last saw, not the captured one
+            body['version'] = self.versions.get(path.rsplit('/', 1)[-1], body['version'])
+
+        kwargs = {'params': record.get('query'), 'timeout': 120}
+        if record.get('user'):
+            kwargs['headers'] = client.headers
+        if body is not None and record['method'] != 'GET':
+            kwargs['json'] = body
+        return client, record['method'], f"{self.origin}{path}", kwargs
+
+    def send(self, record, scheduled):
+        """Send one captured request; returns (route, latency, status, lag)"""
+        route = f"{record['method']} {record['route']}"
+        request = self.build_request(record)
+        if request is None:
+            return route, None, None, 0.0
+        client, method, url, kwargs = request
+        lag = time.perf_counter() - scheduled
+        start = time.perf_counter()
+        try:
+            response = client.session.request(method, url, **kwargs)
+            status = response.status_code
+        except requests.RequestException:
+            return route, time.perf_counter() - start, 0, lag
+        latency = time.perf_counter() - start
+
+        tender = None
+        if status < 300 and 'json' in response.headers.get('Content-Type', ''):
+            try:
+                tender = response.json().get('tender')
+            except (ValueError, AttributeError):
+                tender = None
+        if isinstance(tender, dict) and tender.get('_id'):
+            with self.lock:
+                if record.get('created'):
+                    self.ids[record['created']] = tender['_id']
+                    self.created.setdefault(client.email, []).append(tender['_id'])
+                self.versions[tender['_id']] = tender.get('version', 0)
+        return route, latency, status, lag
+
+    def replay(self, records):
+        """Send every record at its scaled offset; returns the send() results"""
+        first = records[0]['at']
+        origin = time.perf_counter()
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for record in records:
+                scheduled = origin + (record['at'] - first) / 1000 / self.speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append((record, executor.submit(self.send, record, scheduled)))
+        return [(record, future.result()) for record, future in futures]
+
+    def route_records(self, results):
+        """Per-route latency records, with the captured latency for reference"""
+        by_route = {}
+        for record, (route, latency, status, lag) in results:
+            entry = by_route.setdefault(route, {'latencies': [], 'captured': [], 'skipped': 0,
+                                                'errors': 0, 'status_mismatches': 0, 'lags': []})
+            if latency is None:
+                entry['skipped'] += 1
+                continue
+            entry['latencies'].append(latency)
+            entry['lags'].append(lag)
+            if record.get('ms') is not None:
+                entry['captured'].append(record['ms'] / 1000)
+            if status == 0:
+                entry['errors'] += 1
+            elif status // 100 != record['status'] // 100:
+                entry['status_mismatches'] += 1
+
+        records = {}
+        for route, entry in by_route.items():
+            if not entry['latencies']:
+                continue
+            stats = latency_stats(entry['latencies'])
+            captured = latency_stats(entry['captured']) if entry['captured'] else {}
+            records[route] = dict(
+                stats, duration_ms=stats['p95_ms'], requests=len(entry['latencies']), skipped=entry['skipped'],
+                errors=entry['errors'], status_mismatches=entry['status_mismatches'],
+                captured_p95_ms=captured.get('p95_ms'), max_lag_ms=max(entry['lags']) * 1000,
+                success=entry['errors'] == 0
+            )
+        return records
+
+    def find_baseline(self, store, digest):
+        """The requested baseline run, else the latest replay of the same capture"""
+        runs = [run for run in store.runs('bench-replay') if run.get('capture_digest') == digest]
+        if self.baseline:
+            return next((run for run in runs if run['run_id'] == self.baseline), None)
+        return runs[-1] if runs else None
+
+    def print_comparison(self, records, baseline):
+        """Print per-route p95 against the capture and the baseline build"""
+        print(f"\n   {'route':<40} {'reqs':>6} {'captured':>9} {'baseline':>9} {'p95 ms':>8} {'change':>8}")
+        for route, record in sorted(records.items(), key=lambda item: -item[1]['p95_ms']):
+            before = (baseline or {}).get('checks', {}).get(route, {}).get('p95_ms')
+            captured = record['captured_p95_ms']
+            change = f"{(record['p95_ms'] - before) / before * 100:+.0f}%" if before else '-'
+            print(f"   {route:<40} {record['requests']:>6} "
+                  f"{captured if captured is not None else float('nan'):>9.1f} "
+                  f"{before if before is not None else float('nan'):>9.1f} {record['p95_ms']:>8.1f} {change:>8}")
+
+    def run(self):
+        """Replay the capture, store the run and report changes against the baseline"""
+        print("🚀 Starting Traffic Replay")
+        print("=" * 60)
+        records = load_capture(self.capture)
+        if not records:
+            print(f"❌ FAIL No requests in {self.capture}")
+            return False
+        span = (records[-1]['at'] - records[0]['at']) / 1000
+        print(f"📼 {len(records)} requests over {span:.0f}s, replayed at {self.speed:g}x "
+              f"({span / self.speed:.0f}s)")
+
+        with open(self.capture, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        store = ResultsStore()
+        baseline = self.find_baseline(store, digest)
+
+        self.prepare_users(records)
+        route_records = self.route_records(self.replay(records))
+        self.print_comparison(route_records, baseline)
+
+        run = store.record_run('bench-replay', route_records, capture=os.path.basename(self.capture),
+                               capture_digest=digest, speed=self.speed)
+        skipped = sum(record['skipped'] for record in route_records.values())
+        mismatches = sum(record['status_mismatches'] for record in route_records.values())
+        if skipped or mismatches:
+            print(f"⚠️  {skipped} requests skipped for unknown IDs, {mismatches} answered with a different status class")
+
+        regressions = compare_runs(baseline, run, self.threshold, metric='p95_ms') if baseline else []
+        for route, before, after, change in regressions:
+            print(f"❌ REGRESSION {route}: p95 {before:.1f} -> {after:.1f} ms ({change:+.1f}%)")
+        if baseline is None:
+            print("📊 No earlier replay of this capture; this run is the baseline for the next build")
+
+        success = not regressions and all(record['success'] for record in route_records.values())
+        print("✅ PASS Replay finished without regressions" if success
+              else "❌ FAIL Replay regressed or requests failed")
+        return success
+
+def parse_sizes(value):
+    """Parse a comma-separated list of data sizes"""
+    return [int(size) for size in value.split(',') if size.strip()]
+
+def main():
+    """Main function to run the benchmarks"""
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the Tender Generator backend")
+    parser.add_argument('--base-url', default=BASE_URL, help="Backend API base URL")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    analytics = subparsers.add_parser('analytics', help="Analytics latency as tender history grows")
+    analytics.add_argument('--sizes', type=parse_sizes, default=[10, 100, 1000], help="Comma-separated tender counts")
+    analytics.add_argument('--samples', type=int, default=20, help="Timed requests per size")
+    analytics.add_argument('--dataset-user', help="Measure this dataset_generator.py user instead of seeding")
+    analytics.set_defaults(run=lambda args: AnalyticsBenchmark(args.sizes, args.samples, args.base_url, args.dataset_user).run())
+
+    rollup = subparsers.add_parser('rollup', help="Rollup consistency after a random save/delete stream")
+    rollup.add_argument('--operations', type=int, default=500, help="Number of saves and deletes to apply")
+    rollup.add_argument('--seed', type=int, default=42, help="Random seed for the operation stream")
+    rollup.set_defaults(run=lambda args: RollupConsistencyCheck(args.operations, args.seed, base_url=args.base_url).run())
+
+    history = subparsers.add_parser('history', help="History page latency as tender history grows")
+    history.add_argument('--sizes', type=parse_sizes, default=[100, 1000, 5000], help="Comma-separated tender counts")
+    history.add_argument('--page-size', type=int, default=20, help="Tenders per page")
+    history.add_argument('--view', choices=['summary', 'full'], default='summary', help="History projection")
+    history.add_argument('--dataset-user', help="Walk this dataset_generator.py user's history instead of seeding")
+    history.set_defaults(run=lambda args: HistoryBenchmark(args.sizes, args.page_size, args.view, args.base_url,
+                                                           args.dataset_user).run())
+
+    bulk = subparsers.add_parser('bulk', help="NDJSON bulk import/export throughput")
+    bulk.add_argument('--count', type=int, default=10000, help="Tenders to import")
+    bulk.add_argument('--compare-single', type=int, default=200, help="Tenders to save one at a time for comparison (0 to skip)")
+    bulk.set_defaults(run=lambda args: BulkTransferBenchmark(args.count, args.compare_single, args.base_url).run())
+
+    auth = subparsers.add_parser('auth', help="Per-request JWT verification overhead")
+    auth.add_argument('--requests', type=int, default=2000, help="Timed requests per measurement")
+    auth.add_argument('--spawn', action='store_true', help="Start backends with the token cache off and on instead of using the running one")
+    auth.add_argument('--port', type=int, default=5055, help="Port for spawned backends")
+    auth.set_defaults(run=lambda args: AuthOverheadBenchmark(args.requests, args.spawn, args.port, args.base_url).run())
+
+    bcrypt = subparsers.add_parser('bcrypt', help="Login throughput and event-loop blocking across bcrypt costs")
+    bcrypt.add_argument('--costs', type=parse_sizes, default=[8, 10, 12], help="Comma-separated bcrypt cost factors")
+    bcrypt.add_argument('--concurrency', type=parse_sizes, default=[1, 8, 32], help="Comma-separated concurrent login levels")
+    bcrypt.add_argument('--logins', type=int, default=200, help="Logins per burst")
+    bcrypt.add_argument('--port', type=int, default=5055, help="Port for spawned backends")
+    bcrypt.set_defaults(run=lambda args: PasswordHashingBenchmark(args.costs, args.concurrency, args.logins, port=args.port).run())
+
+    render = subparsers.add_parser('render', help="Server-side document rendering throughput and cache hits")
+    render.add_argument('--tenders', type=int, default=50, help="Distinct tenders to render")
+    render.add_argument('--formats', type=lambda value: [f for f in value.split(',') if f], default=['pdf', 'docx', 'xlsx'],
+                        help="Comma-separated formats")
+    render.add_argument('--concurrency', type=int, default=DEFAULT_WORKERS, help="Concurrent render requests")
+    render.set_defaults(run=lambda args: RenderBenchmark(args.tenders, args.formats, args.concurrency, args.base_url).run())
+
+    dedup = subparsers.add_parser('dedup', help="Tender storage before and after content deduplication")
+    dedup.add_argument('--users', type=int, default=200, help="Users to seed")
+    dedup.add_argument('--tenders-per-user', type=int, default=50, help="Tenders seeded per user")
+    dedup.add_argument('--repeat-ratio', type=float, default=0.6, help="Chance a tender re-saves one of the user's earlier selections")
+    dedup.add_argument('--seed', type=int, default=42, help="Random seed for the dataset")
+    dedup.add_argument('--mongo-uri', default=SCRATCH_MONGO_URI, help="Scratch database, dropped afterwards")
+    dedup.set_defaults(run=lambda args: StorageDedupReport(args.users, args.tenders_per_user, args.repeat_ratio, args.seed, args.mongo_uri).run())
+
+    drafts = subparsers.add_parser('drafts', help="Lost-update check for concurrent JSON Patch draft autosaves")
+    drafts.add_argument('--writers', type=int, default=8, help="Concurrent clients patching the draft")
+    drafts.add_argument('--edits', type=int, default=25, help="Patches each client must get accepted")
+    drafts.set_defaults(run=lambda args: DraftConcurrencyCheck(args.writers, args.edits, args.base_url).run())
+
+    caching = subparsers.add_parser('caching', help="Bytes on the wire and 304 rates for repeated dashboard loads")
+    caching.add_argument('--tenders', type=int, default=200, help="Tenders to seed")
+    caching.add_argument('--loads', type=int, default=30, help="Dashboard loads per mode")
+    caching.add_argument('--write-every', type=int, default=5, help="Save a tender before every Nth revalidated load")
+    caching.set_defaults(run=lambda args: DashboardCachingBenchmark(args.tenders, args.loads, args.write_every, args.base_url).run())
+
+    sessions = subparsers.add_parser('sessions', help="Server RSS while many sessions are opened and abandoned")
+    sessions.add_argument('--sessions', type=int, default=50000, help="Sessions to open per store")
+    sessions.add_argument('--rounds', type=int, default=10, help="RSS samples, one after each batch of sessions")
+    sessions.add_argument('--max-growth-mb', type=float, default=25, help="Allowed RSS growth after the first round")
+    sessions.add_argument('--stores', type=lambda value: [s for s in value.split(',') if s], default=['mongo', 'memory'],
+                          help="Comma-separated SESSION_STORE values to soak")
+    sessions.add_argument('--port', type=int, default=5055, help="Port for spawned backends")
+    sessions.set_defaults(run=lambda args: SessionSoakTest(args.sessions, args.rounds, args.max_growth_mb, args.stores, args.port).run())
+
+    pool = subparsers.add_parser('pool', help="MongoDB pool saturation charted against request latency")
+    pool.add_argument('--pool-sizes', type=parse_sizes, default=[2, 10, 50], help="Comma-separated maxPoolSize values")
+    pool.add_argument('--concurrency', type=int, default=64, help="Concurrent history clients")
+    pool.add_argument('--duration', type=int, default=15, help="Seconds of load per pool size")
+    pool.add_argument('--tenders', type=int, default=500, help="Tenders seeded before the load")
+    pool.add_argument('--port', type=int, default=5055, help="Port for spawned backends")
+    pool.set_defaults(run=lambda args: PoolSaturationBenchmark(args.pool_sizes, args.concurrency, args.duration,
+                                                               args.tenders, args.port).run())
+
+    replay = subparsers.add_parser('replay', help="Replay captured traffic and compare latency against the previous build")
+    replay.add_argument('--capture', required=True, help="NDJSON written by a server run with TRAFFIC_CAPTURE_FILE")
+    replay.add_argument('--speed', type=float, default=1.0, help="Replay speed as a multiple of the captured rate")
+    replay.add_argument('--concurrency', type=int, default=64, help="Maximum requests in flight")
+    replay.add_argument('--baseline', help="bench-replay run ID to compare against (default: latest replay of this capture)")
+    replay.add_argument('--threshold', type=float, default=20.0, help="p95 growth in percent flagged as a regression")
+    replay.set_defaults(run=lambda args: TrafficReplay(args.capture, args.speed, args.concurrency, args.baseline,
+                                                       args.threshold, args.base_url).run())
+
+    abuse = subparsers.add_parser('abuse', help="Legitimate latency while attackers flood the login route")
+    abuse.add_argument('--legit-users', type=int, default=20, help="Concurrent legitimate users")
+    abuse.add_argument('--attackers', type=int, default=64, help="Concurrent attacker threads")
+    abuse.add_argument('--attacker-ips', type=int, default=4, help="Distinct IPs the attackers share")
+    abuse.add_argument('--targets', type=int, default=50, help="Real accounts the attackers guess passwords for")
+    abuse.add_argument('--duration', type=int, default=20, help="Seconds per phase")
+    abuse.add_argument('--login-every', type=int, default=20, help="Legitimate users log in once per this many requests")
+    abuse.add_argument('--store', choices=['memory', 'mongo'], default='memory', help="RATE_LIMIT_STORE for the limited phases")
+    abuse.add_argument('--max-p99-growth', type=float, default=2.0, help="Allowed legitimate p99 under attack, as a multiple of quiet")
+    abuse.add_argument('--port', type=int, default=5055, help="Port for spawned backends")
+    abuse.set_defaults(run=lambda args: AbuseSimulationBenchmark(args.legit_users, args.attackers, args.attacker_ips,
+                                                                 args.targets, args.duration, args.login_every,
+                                                                 args.store, args.max_p99_growth, args.port).run())
+
+    args = parser.parse_args()
+
+    try:
+        success = args.run(args)
+    except Exception as e:
+        print(f"❌ FAIL {args.benchmark}: Unexpected error - {str(e)}")
+        success = False
+
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Synthetic Tender Dataset Generator for Tender Generator Benchmarks
+Builds realistically shaped tenders from the sectors and criteria in
+server/data/criteriaData.js and bulk-loads them into a local mongod
+
+The same seed and options always produce the same users, tender IDs,
+selections and timestamps, so benchmarks run against identical data.
+Generated users log in as dataset.<n>@example.com with --password once the
+backend runs with MONGO_URI set to the dataset database.
+
+Usage:
+    python dataset_generator.py --tenders 1000000 --users 1000 --seed 42
+    python dataset_generator.py --tenders 50000 --users 10 --sector-mix it=3,construction=2,government=1
+    python dataset_generator.py --category-counts 2=1,4=3,8=1 --draft-ratio 0.1 --start 2022-01-01 --growth 2
+    python benchmark_test.py analytics --dataset-user dataset.00000@example.com
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from harness import ResultsStore, SERVER_DIR
+
+CRITERIA_DATA = os.path.join(SERVER_DIR, 'data', 'criteriaData.js')
+DATASET_MONGO_URI = os.environ.get('DATASET_MONGO_URI', 'mongodb://localhost:27017/tender_dataset')
+DATASET_PASSWORD = "benchmarkPassword123"
+
+# Relative weights of the number of categories in one tender
+DEFAULT_CATEGORY_COUNTS = {2: 1, 3: 2, 4: 3, 5: 3, 6: 2, 8: 1}
+
+SECTOR_LINE = re.compile(r'^  (\w+): \[')
+CRITERION_ID = re.compile(r'^\s+id: "([^"]+)"')
+SUB_LABEL = re.compile(r'^\s+label: ')
+
+def parse_criteria(path=CRITERIA_DATA):
+    """Return {sector: [(criterion_id, sub_count), ...]} from criteriaData.js"""
+    sectors = {}
+    criteria = None
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith('const sectors'):
+                break
+            match = SECTOR_LINE.match(line)
+            if match:
+                criteria = sectors.setdefault(match.group(1), [])
+                continue
+            match = CRITERION_ID.match(line)
+            if match and criteria is not None:
+                criteria.append([match.group(1), 0])
+            elif SUB_LABEL.match(line) and criteria:
+                criteria[-1][1] += 1
+    return {sector: [tuple(c) for c in criteria if c[1]] for sector, criteria in sectors.items() if criteria}
+
+def parse_weights(value, key=str):
+    """Parse "a=3,b=1" into {a: 3.0, b: 1.0}"""
+    weights = {}
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        weights[key(name.strip())] = float(weight or 1)
+    return weights
+
+def parse_date(value):
+    """Parse YYYY-MM-DD as a UTC datetime"""
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+def content_hash(categories, categories_order):
+    """Content hash as computed by server/services/tenderContent.js for a canonical selection"""
+    payload = json.dumps([list(categories.items()), categories_order], separators=(',', ':'))
+    return base64.urlsafe_b64encode(hashlib.sha256(payload.encode()).digest()).rstrip(b'=').decode()
+
+def hash_password(password):
+    """bcrypt hash made by the server's own bcryptjs, or None when node cannot run it"""
+    try:
+        result = subprocess.run(
+            ['node', '-e', "process.stdout.write(require('bcryptjs').hashSync(process.argv[1], 10))", password],
+            cwd=SERVER_DIR, capture_output=True, text=True, timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 and result.stdout.startswith('$2') else None
+
+class DatasetGenerator:
+    """Streams deterministic users and tenders into MongoDB in bounded batches
+
+    Every user draws from its own random stream seeded by (seed, user), so
+    the data does not depend on batch size and memory stays at one batch
+    plus one user's earlier selections.
+    """
+
+    def __init__(self, tenders=100000, users=100, seed=42, sector_mix=None, category_counts=None,
+                 draft_ratio=0.3, repeat_ratio=0.2, start=None, end=None, growth=0.0,
+                 batch_size=5000, mongo_uri=DATASET_MONGO_URI, password=DATASET_PASSWORD, drop=True, rollups=True):
+        self.criteria = parse_criteria()
+        self.tenders = tenders
+        self.users = max(1, min(users, tenders))
+        self.seed = seed
+        self.sector_mix = sector_mix or {sector: 1.0 for sector in self.criteria}
+        unknown = set(self.sector_mix) - set(self.criteria)
+        if unknown:
+            raise ValueError(f"Unknown sectors: {', '.join(sorted(unknown))}")
+        self.category_counts = category_counts or DEFAULT_CATEGORY_COUNTS
+        self.draft_ratio = draft_ratio
+        self.repeat_ratio = repeat_ratio
+        self.start = start or parse_date('2023-01-01')
+        self.end = end or parse_date('2025-01-01')
+        self.growth = growth
+        self.batch_size = batch_size
+        self.mongo_uri = mongo_uri
+        self.password = password
+        self.drop = drop
+        self.rollups = rollups
+
+    def object_id(self, rng, moment):
+        """ObjectId whose timestamp is moment and whose other bytes come from rng"""
+        from bson import ObjectId
+        return ObjectId(int(moment.timestamp()).to_bytes(4, 'big') + rng.getrandbits(64).to_bytes(8, 'big'))
+
+    def created_at(self, rng):
+        """Creation time in [start, end); growth > 0 skews towards the end"""
+        u = rng.random()
+        if self.growth:
+            u = math.log1p(u * math.expm1(self.growth)) / self.growth
+        return datetime.fromtimestamp(
+            self.start.timestamp() + u * (self.end.timestamp() - self.start.timestamp()), tz=timezone.utc
+        ).replace(microsecond=0)
+
+    def selection(self, rng, sector):
+        """Canonical (categories, categoriesOrder) for one tender in sector"""
+        available = self.criteria[sector]
+        counts, weights = zip(*sorted(self.category_counts.items()))
+        count = min(rng.choices(counts, weights)[0], len(available))
+        chosen = rng.sample(available, count)
+        categories = {
+            criterion_id: [str(i) for i in sorted(rng.sample(range(subs), rng.randint(1, subs)))]
+            for criterion_id, subs in chosen
+        }
+        return dict(sorted(categories.items())), [criterion_id for criterion_id, _ in chosen]
+
+    def user_tenders(self, user):
+        """Yield (user_doc, tender_doc, content) for one user's tenders, the user doc first"""
+        rng = random.Random(f"{self.seed}:{user}")
+        count = self.tenders // self.users + (1 if user < self.tenders % self.users else 0)
+        user_id = self.object_id(rng, self.start)
+        yield {
+            '_id': user_id, 'name': f"Dataset User {user}", 'email': f"dataset.{user:05d}@example.com",
+            'authMethod': 'email', '__v': 0
+        }, None, None
+
+        sectors, weights = zip(*sorted(self.sector_mix.items()))
+        selections = []
+        for i in range(count):
+            if selections and rng.random() < self.repeat_ratio:
+                sector, categories, order, digest = rng.choice(selections)
+            else:
+                sector = rng.choices(sectors, weights)[0]
+                categories, order = self.selection(rng, sector)
+                digest = content_hash(categories, order)
+                selections.append((sector, categories, order, digest))
+            created = self.created_at(rng)
+            tender = {
+                '_id': self.object_id(rng, created), 'userId': user_id, 'title': f"Tender {i + 1}",
+                'sector': sector, 'contentHash': digest, 'isDraft': rng.random() < self.draft_ratio,
+                'version': 0, 'createdAt': created, 'updatedAt': created, '__v': 0
+            }
+            yield None, tender, (digest, categories, order, created)
+
+    def flush(self, db, users, tenders, contents):
+        """Write one batch: users, tenders and reference counts of their contents"""
+        from pymongo import UpdateOne
+        if users:
+            db.users.insert_many(users, ordered=False)
+        if tenders:
+            db.tenders.insert_many(tenders, ordered=False)
+        if contents:
+            db.tendercontents.bulk_write([
+                UpdateOne({'_id': digest}, {
+                    '$setOnInsert': {'categories': categories, 'categoriesOrder': order, 'createdAt': created},
+                    '$inc': {'refCount': refs}
+                }, upsert=True)
+                for digest, (categories, order, created, refs) in contents.items()
+            ], ordered=False)
+
+    def load(self, db, password_hash):
+        """Stream every user's tenders into db; returns (users, tenders, distinct selections)"""
+        users, tenders, contents = [], [], {}
+        loaded = 0
+        started = time.perf_counter()
+        for user in range(self.users):
+            for user_doc, tender, content in self.user_tenders(user):
+                if user_doc:
+                    if password_hash:
+                        user_doc['password'] = password_hash
+                    users.append(user_doc)
+                    continue
+                tenders.append(tender)
+                digest, categories, order, created = content
+                entry = contents.get(digest)
+                contents[digest] = (categories, order, created, entry[3] + 1 if entry else 1)
+                if len(tenders) >= self.batch_size:
+                    self.flush(db, users, tenders, contents)
+                    loaded += len(tenders)
+                    users, tenders, contents = [], [], {}
+                    rate = loaded / (time.perf_counter() - started)
+                    print(f"   {loaded}/{self.tenders} tenders ({rate:.0f}/s)", end='\r', flush=True)
+        self.flush(db, users, tenders, contents)
+        loaded += len(tenders)
+        print(f"   {loaded}/{self.tenders} tenders in {time.perf_counter() - started:.1f}s")
+        return self.users, loaded, db.tendercontents.estimated_document_count()
+
+    def run_script(self, script):
+        """Run a server maintenance script against the dataset database"""
+        result = subprocess.run(['node', f"scripts/{script}"], cwd=SERVER_DIR,
+                                env=dict(os.environ, MONGO_URI=self.mongo_uri),
+                                capture_output=True, text=True, timeout=3600)
+        if result.returncode != 0:
+            print(f"❌ FAIL scripts/{script}: {result.stderr.strip()[-500:]}")
+            return False
+        print(f"🔁 {result.stdout.strip()}")
+        return True
+
+    def run(self):
+        """Generate and load the dataset, then build indexes and rollups"""
+        print("🚀 Starting Synthetic Dataset Generation")
+        print("=" * 60)
+        try:
+            from pymongo import MongoClient
+        except ImportError:
+            print("❌ FAIL Dataset generation requires pymongo (pip install pymongo)")
+            return False
+
+        criteria = sum(len(c) for c in self.criteria.values())
+        print(f"📚 {len(self.criteria)} sectors, {criteria} criteria parsed from {os.path.relpath(CRITERIA_DATA)}")
+        password_hash = hash_password(self.password)
+        if not password_hash:
+            print("⚠️  Could not hash the password with the server's bcryptjs; dataset users cannot log in")
+
+        client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=3000)
+        db = client.get_default_database()
+        try:
+            if self.drop:
+                client.drop_database(db.name)
+            print(f"🌱 Loading {self.tenders} tenders for {self.users} users into {db.name} (seed {self.seed})...")
+            started = time.perf_counter()
+            users, tenders, distinct = self.load(db, password_hash)
+            load_s = time.perf_counter() - started
+        finally:
+            client.close()
+
+        # Indexes are built once after the load, which is faster than
+        # maintaining them on every insert
+        success = self.run_script('syncIndexes.js')
+        if self.rollups:
+            success = self.run_script('rebuildRollups.js') and success
+
+        print(f"\n📦 {users} users, {tenders} tenders, {distinct} distinct selections in {load_s:.1f}s "
+              f"({tenders / max(load_s, 1e-9):.0f} tenders/s)")
+        ResultsStore().record_run('dataset', {
+            'load': {'duration_ms': load_s * 1000, 'tenders_per_s': tenders / max(load_s, 1e-9), 'success': success}
+        }, seed=self.seed, users=users, tenders=tenders, distinct_selections=distinct,
+            sector_mix=self.sector_mix, category_counts={str(k): v for k, v in self.category_counts.items()},
+            draft_ratio=self.draft_ratio, repeat_ratio=self.repeat_ratio, start=self.start.isoformat(),
+            end=self.end.isoformat(), growth=self.growth, mongo_uri=self.mongo_uri)
+        print("✅ PASS Dataset loaded" if success else "❌ FAIL Dataset loaded but post-load scripts failed")
+        return success
+
+def main():
+    """Main function to generate the dataset"""
+    parser = argparse.ArgumentParser(description="Deterministic synthetic tender dataset for benchmarks")
+    parser.add_argument('--tenders', type=int, default=100000, help="Tenders to generate")
+    parser.add_argument('--users', type=int, default=100, help="Users the tenders are spread across")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed; the same seed gives the same dataset")
+    parser.add_argument('--sector-mix', type=parse_weights, help="Sector weights, e.g. it=3,construction=2 (default: uniform)")
+    parser.add_argument('--category-counts', type=lambda value: parse_weights(value, int),
+                        help="Weights of categories per tender, e.g. 2=1,4=3,8=1")
+    parser.add_argument('--draft-ratio', type=float, default=0.3, help="Share of tenders saved as drafts")
+    parser.add_argument('--repeat-ratio', type=float, default=0.2, help="Chance a tender reuses one of the user's earlier selections")
+    parser.add_argument('--start', type=parse_date, help="Earliest createdAt, YYYY-MM-DD (default 2023-01-01)")
+    parser.add_argument('--end', type=parse_date, help="Latest createdAt, YYYY-MM-DD (default 2025-01-01)")
+    parser.add_argument('--growth', type=float, default=0.0, help="Skew createdAt towards --end; 0 spreads it evenly")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Tenders written per bulk insert")
+    parser.add_argument('--mongo-uri', default=DATASET_MONGO_URI, help="Database to load into")
+    parser.add_argument('--password', default=DATASET_PASSWORD, help="Password of every generated user")
+    parser.add_argument('--keep', action='store_true', help="Add to the database instead of dropping it first (use another --seed)")
+    parser.add_argument('--skip-rollups', action='store_true', help="Leave analytics rollups to be built from a full recount on first read")
+    args = parser.parse_args()
+
+    try:
+        success = DatasetGenerator(
+            args.tenders, args.users, args.seed, args.sector_mix, args.category_counts, args.draft_ratio,
+            args.repeat_ratio, args.start, args.end, args.growth, args.batch_size, args.mongo_uri,
+            args.password, drop=not args.keep, rollups=not args.skip_rollups
+        ).run()
+    except Exception as e:
+        print(f"❌ FAIL Dataset generation: Unexpected error - {str(e)}")
+        success = False
+
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
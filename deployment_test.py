@@ -9,14 +9,26 @@ import json
 import sys
 import subprocess
 import os
+import signal
+import tempfile
+import threading
 from datetime import datetime
 import time
 
+from harness import get_session, run_checks, check_records, wait_until_ready, ResultsStore, DEFAULT_WORKERS
+
 class DeploymentTester:
     def __init__(self):
         self.backend_url = "http://localhost:5000"
         self.test_results = []
         self.backend_process = None
+        # Combined cluster output, written to a file so a full pipe never blocks the server
+        self.backend_log = None
+        self.session = get_session()
+        # Server processes started by server/cluster.js
+        self.cluster_workers = 2
+        # Phase-by-phase startup timings, stored with the run
+        self.startup_phases = {}
         
     def log_test(self, test_name, success, message, details=None):
         """Log test results"""
@@ -60,41 +72,131 @@ class DeploymentTester:
             return False
     
     def test_backend_startup(self):
-        """Test if backend starts without errors"""
+        """Test if the clustered backend starts, spreads requests and restarts without dropping any"""
         try:
             print("🚀 Testing backend startup...")
             
-            # Start backend process
-            os.chdir('/app/server')
+            # Start the cluster primary, which forks the worker processes
+            self.backend_log = tempfile.NamedTemporaryFile(mode='w', prefix='cluster-', suffix='.log', delete=False)
+            spawned = time.perf_counter()
             self.backend_process = subprocess.Popen(
-                ['node', 'index.js'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                ['node', 'cluster.js'],
+                cwd='/app/server',
+                env=dict(os.environ, CLUSTER_WORKERS=str(self.cluster_workers)),
+                stdout=self.backend_log,
+                stderr=subprocess.STDOUT,
                 text=True
             )
             
-            # Wait for startup
-            time.sleep(3)
-            
-            # Check if process is still running
-            if self.backend_process.poll() is None:
-                self.log_test("Backend Startup", True, "Backend starts successfully")
-                return True
-            else:
-                stdout, stderr = self.backend_process.communicate()
-                self.log_test("Backend Startup", False, "Backend failed to start", f"stderr: {stderr}")
+            # Wait until every worker reports MongoDB connected and routes mounted
+            try:
+                waited, ready = wait_until_ready(self.backend_url, timeout=60, process=self.backend_process,
+                                                 consecutive=self.cluster_workers)
+            except RuntimeError as e:
+                self.log_test("Backend Startup", False, "Backend never became ready",
+                              f"{e}; output in {self.backend_log.name}:\n{self.backend_output()[-500:]}")
                 return False
+            self.record_startup_phases(spawned, ready['startup'])
+            self.log_test("Backend Startup", True,
+                          f"Backend cluster with {self.cluster_workers} workers ready in {waited * 1000:.0f}ms")
+            
+            return self.check_worker_spread() and self.check_rolling_restart()
                 
         except Exception as e:
             self.log_test("Backend Startup", False, f"Backend startup test failed: {str(e)}")
             return False
     
+    def backend_output(self):
+        """Everything the cluster has written to stdout and stderr so far"""
+        with open(self.backend_log.name) as f:
+            return f.read()
+
+    def record_startup_phases(self, spawned, server_phases):
+        """Time the first API request and keep the startup breakdown for this run"""
+        start = time.perf_counter()
+        spawn_to_ready_ms = (start - spawned) * 1000
+        self.session.get(f"{self.backend_url}/api/criteria", timeout=10).raise_for_status()
+        first_request_ms = (time.perf_counter() - start) * 1000
+        # Server phases come from whichever worker answered /ready last
+        self.startup_phases = {
+            'require_ms': server_phases['routesMountedAtMs'],
+            'db_connect_ms': server_phases['dbConnectMs'],
+            'server_ready_ms': server_phases['readyAtMs'],
+            'spawn_to_ready_ms': spawn_to_ready_ms,
+            'first_request_ms': first_request_ms,
+            'total_ms': (time.perf_counter() - spawned) * 1000
+        }
+        print("⏱️  Startup phases:")
+        for phase, ms in self.startup_phases.items():
+            print(f"   {phase:>18}: {ms:>8.0f} ms")
+    
+    def worker_ids(self, count):
+        """Send count requests on fresh connections and return the X-Worker-Id of each"""
+        # Keep-alive would pin every request to the worker that accepted the connection
+        ids = []
+        for _ in range(count):
+            response = requests.get(f"{self.backend_url}/", headers={'Connection': 'close'}, timeout=5)
+            ids.append(response.headers.get('X-Worker-Id'))
+        return ids
+    
+    def check_worker_spread(self):
+        """Check that requests are served by every cluster worker"""
+        ids = self.worker_ids(self.cluster_workers * 4)
+        workers = set(ids) - {None}
+        if len(workers) == self.cluster_workers:
+            self.log_test("Cluster Spread", True, f"{len(ids)} requests spread over workers {sorted(workers)}")
+            return True
+        self.log_test("Cluster Spread", False, f"Requests reached {len(workers)} of {self.cluster_workers} workers", ids)
+        return False
+    
+    def check_rolling_restart(self, timeout=60):
+        """Check that a rolling restart under load replaces every worker and fails no request"""
+        original = set(self.worker_ids(self.cluster_workers * 4))
+        stop = threading.Event()
+        completed = []
+        errors = []
+        
+        def load():
+            while not stop.is_set():
+                try:
+                    response = requests.get(f"{self.backend_url}/", headers={'Connection': 'close'}, timeout=10)
+                    response.raise_for_status()
+                    completed.append(response.headers.get('X-Worker-Id'))
+                except Exception as e:
+                    errors.append(str(e))
+        
+        threads = [threading.Thread(target=load, daemon=True) for _ in range(DEFAULT_WORKERS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        self.backend_process.send_signal(signal.SIGHUP)
+        
+        # Round robin reaches every live worker, so once none of the sampled
+        # requests hits an original worker they have all been retired
+        deadline = time.time() + timeout
+        replaced = False
+        while not replaced and time.time() < deadline:
+            time.sleep(0.5)
+            replaced = not original & set(self.worker_ids(self.cluster_workers * 2))
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        
+        if replaced and not errors:
+            self.log_test("Rolling Restart", True,
+                          f"All workers replaced with {len(completed)} requests under load and none failed")
+            return True
+        message = "Workers were not all replaced" if not replaced else f"{len(errors)} of {len(completed) + len(errors)} requests failed"
+        self.log_test("Rolling Restart", False, message, errors[:5])
+        return False
+    
     def test_backend_health(self):
         """Test backend health endpoint"""
         try:
             print("🏥 Testing backend health endpoint...")
             
-            response = requests.get(f"{self.backend_url}/", timeout=5)
+            response = self.session.get(f"{self.backend_url}/", timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -189,7 +291,7 @@ class DeploymentTester:
             print("🔐 Testing Google OAuth configuration...")
             
             # Test OAuth redirect endpoint
-            response = requests.get(f"{self.backend_url}/api/auth/google", allow_redirects=False, timeout=5)
+            response = self.session.get(f"{self.backend_url}/api/auth/google", allow_redirects=False, timeout=5)
             
             if response.status_code == 302:
                 location = response.headers.get('Location', '')
@@ -251,7 +353,7 @@ class DeploymentTester:
                 "password": "testPassword123"
             }
             
-            response = requests.post(f"{self.backend_url}/api/auth/signup", json=test_user, timeout=5)
+            response = self.session.post(f"{self.backend_url}/api/auth/signup", json=test_user, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -274,40 +376,52 @@ class DeploymentTester:
         if self.backend_process and self.backend_process.poll() is None:
             self.backend_process.terminate()
             self.backend_process.wait()
+        if self.backend_log:
+            self.backend_log.close()
     
-    def run_all_tests(self):
-        """Run all deployment readiness tests"""
+    def run_all_tests(self, max_workers=DEFAULT_WORKERS):
+        """Run all deployment readiness tests, concurrently where they are independent"""
         print("🚀 Starting Deployment Readiness Tests")
         print("=" * 60)
         
+        # Each test is paired with the tests that must finish before it starts;
+        # the live endpoint checks need the backend started first
         tests = [
-            self.test_frontend_build,
-            self.test_environment_variables,
-            self.test_api_configuration,
-            self.test_deployment_configs,
-            self.test_backend_startup,
-            self.test_backend_health,
-            self.test_google_oauth_setup,
-            self.test_auth_endpoints
+            (self.test_frontend_build, []),
+            (self.test_environment_variables, []),
+            (self.test_api_configuration, []),
+            (self.test_deployment_configs, []),
+            (self.test_backend_startup, []),
+            (self.test_backend_health, [self.test_backend_startup]),
+            (self.test_google_oauth_setup, [self.test_backend_startup]),
+            (self.test_auth_endpoints, [self.test_backend_startup])
         ]
         
         passed = 0
         failed = 0
         
-        for test in tests:
-            try:
-                if test():
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                print(f"❌ FAIL {test.__name__}: Unexpected error - {str(e)}")
+        metrics = {}
+        results = run_checks(tests, max_workers=max_workers, metrics=metrics)
+        for test, result in results.items():
+            if isinstance(result, Exception):
+                print(f"❌ FAIL {test.__name__}: Unexpected error - {str(result)}")
                 failed += 1
-            print()
+            elif result:
+                passed += 1
+            else:
+                failed += 1
+        print()
         
         # Cleanup
         self.cleanup()
         
+        records = check_records(results, metrics)
+        if self.startup_phases:
+            # Stored as a check so `harness.py compare` flags cold-start regressions
+            records['startup'] = dict(self.startup_phases, duration_ms=self.startup_phases['spawn_to_ready_ms'],
+                                      success=True)
+        ResultsStore().record_run('deployment', records)
+        
         # Summary
         print("=" * 60)
         print(f"📊 DEPLOYMENT READINESS SUMMARY")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Stand-in OAuth2/OIDC provider for exercising the Google login flow offline
+Start the backend with OAUTH_PROVIDER_URL=http://localhost:5099 to use it
+
+Usage:
+    python fake_oauth_provider.py --port 5099 --latency-ms 50
+"""
+
+import argparse
+import json
+import secrets
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 5099
+
+class FakeOAuthState:
+    """Issued codes, access tokens and per-endpoint request statistics"""
+
+    def __init__(self, latency_ms=0):
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.codes = {}
+        self.tokens = {}
+        self.stats = {}
+
+    def identity(self, login_hint):
+        """Return the userinfo claims for login_hint, or for a new random user"""
+        email = login_hint or f"oauth.{secrets.token_hex(6)}@example.com"
+        subject = 'fake-' + urllib.parse.quote(email, safe='')
+        return {
+            'sub': subject,
+            'name': email.split('@')[0].replace('.', ' ').title(),
+            'email': email,
+            'email_verified': True,
+            'picture': f"https://example.com/avatars/{subject}.png"
+        }
+
+    def record(self, endpoint, elapsed):
+        """Record one handled request"""
+        with self.lock:
+            stats = self.stats.setdefault(endpoint, {'requests': 0, 'total_ms': 0.0})
+            stats['requests'] += 1
+            stats['total_ms'] += elapsed * 1000
+
+class FakeOAuthHandler(BaseHTTPRequestHandler):
+    """Implements /authorize, /token, /userinfo and OIDC discovery"""
+
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_redirect(self, location):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def handle_timed(self, endpoint, handler):
+        """Apply the simulated provider latency, run handler and record its timing"""
+        start = time.perf_counter()
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000)
+        handler()
+        self.state.record(endpoint, time.perf_counter() - start)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == '/authorize':
+            self.handle_timed('authorize', lambda: self.authorize(query))
+        elif url.path == '/userinfo':
+            self.handle_timed('userinfo', self.userinfo)
+        elif url.path == '/.well-known/openid-configuration':
+            self.discovery()
+        elif url.path == '/stats':
+            with self.state.lock:
+                self.send_json(200, self.state.stats)
+        else:
+            self.send_json(404, {'error': 'not_found'})
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        form = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode()))
+        if url.path == '/token':
+            self.handle_timed('token', lambda: self.token(form))
+        else:
+            self.send_json(404, {'error': 'not_found'})
+
+    def authorize(self, query):
+        """Issue a code immediately, as if the user had already consented"""
+        redirect_uri = query.get('redirect_uri')
+        if query.get('response_type') != 'code' or not redirect_uri:
+            self.send_json(400, {'error': 'invalid_request'})
+            return
+        code = secrets.token_urlsafe(16)
+        with self.state.lock:
+            self.state.codes[code] = self.state.identity(query.get('login_hint'))
+        params = {'code': code}
+        if 'state' in query:
+            params['state'] = query['state']
+        separator = '&' if '?' in redirect_uri else '?'
+        self.send_redirect(f"{redirect_uri}{separator}{urllib.parse.urlencode(params)}")
+
+    def token(self, form):
+        """Exchange a one-time code for an access token"""
+        if form.get('grant_type') != 'authorization_code':
+            self.send_json(400, {'error': 'unsupported_grant_type'})
+            return
+        with self.state.lock:
+            claims = self.state.codes.pop(form.get('code'), None)
+            if claims:
+                access_token = secrets.token_urlsafe(24)
+                self.state.tokens[access_token] = claims
+        if not claims:
+            self.send_json(400, {'error': 'invalid_grant'})
+            return
+        self.send_json(200, {
+            'access_token': access_token,
+            'token_type': 'Bearer',
+            'expires_in': 3600,
+            'scope': 'openid profile email'
+        })
+
+    def userinfo(self):
+        """Return the claims of the user an access token was issued to"""
+        access_token = self.headers.get('Authorization', '').replace('Bearer ', '')
+        with self.state.lock:
+            claims = self.state.tokens.get(access_token)
+        if not claims:
+            self.send_json(401, {'error': 'invalid_token'})
+            return
+        self.send_json(200, claims)
+
+    def discovery(self):
+        """Minimal OIDC discovery document"""
+        base = f"http://{self.headers.get('Host')}"
+        self.send_json(200, {
+            'issuer': base,
+            'authorization_endpoint': f"{base}/authorize",
+            'token_endpoint': f"{base}/token",
+            'userinfo_endpoint': f"{base}/userinfo",
+            'response_types_supported': ['code'],
+            'scopes_supported': ['openid', 'profile', 'email']
+        })
+
+class FakeOAuthProvider:
+    """Runs the fake provider on a background thread"""
+
+    def __init__(self, port=DEFAULT_PORT, latency_ms=0):
+        self.server = ThreadingHTTPServer(('localhost', port), FakeOAuthHandler)
+        self.server.daemon_threads = True
+        self.server.state = FakeOAuthState(latency_ms)
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.server.server_address[1]}"
+
+    @property
+    def stats(self):
+        with self.server.state.lock:
+            return json.loads(json.dumps(self.server.state.stats))
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def main():
+    """Run the fake provider in the foreground"""
+    parser = argparse.ArgumentParser(description="Stand-in OAuth2/OIDC provider")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Simulated provider latency per request")
+    args = parser.parse_args()
+
+    provider = FakeOAuthProvider(args.port, args.latency_ms)
+    print(f"🔑 Fake OAuth provider listening on {provider.url}")
+    print(f"   Start the backend with OAUTH_PROVIDER_URL={provider.url}")
+    try:
+        provider.server.serve_forever()
+    except KeyboardInterrupt:
+        provider.stop()
+
+if __name__ == "__main__":
+    main()
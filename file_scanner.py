@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Single-pass file scanner shared by the deployment readiness checks
+Reads each file at most once per run, runs every applicable pattern rule in one
+combined pass and caches results by mtime/size/content hash between runs
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from functools import lru_cache
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 256 * 1024
+
+CACHE_VERSION = 1
+
+class ScanRule:
+    """A named pattern applied to explicit files and/or files under root directories"""
+
+    def __init__(self, name, pattern, files=(), roots=(), extensions=()):
+        self.name = name
+        self.pattern = pattern if isinstance(pattern, bytes) else re.escape(pattern).encode()
+        self.files = {os.path.abspath(f) for f in files}
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.extensions = tuple(extensions)
+
+    def applies_to(self, path):
+        """Return True if this rule should run against path"""
+        if path in self.files:
+            return True
+        if self.extensions and not path.endswith(self.extensions):
+            return False
+        return any(path.startswith(root + os.sep) for root in self.roots)
+
+@lru_cache(maxsize=256)
+def _compile(rules):
+    """Compile (name, pattern) pairs into one alternation with a named group per rule"""
+    return re.compile(b'|'.join(
+        b'(?P<r%d>%s)' % (i, pattern) for i, (_, pattern) in enumerate(rules)
+    ))
+
+def find_rules(data, rules):
+    """Return the names of the rules whose pattern occurs in data
+
+    Matching uses one combined regex. Once a rule has matched it is dropped and
+    the search resumes at the same offset, so a rule shadowed by an earlier
+    alternative at the same position is still found.
+    """
+    remaining = tuple(sorted(rules))
+    found = set()
+    pos = 0
+    while remaining:
+        match = _compile(remaining).search(data, pos)
+        if not match:
+            break
+        name = remaining[int(match.lastgroup[1:])][0]
+        found.add(name)
+        remaining = tuple(rule for rule in remaining if rule[0] != name)
+        pos = match.start()
+    return found
+
+class FileScanner:
+    """Scans registered files once per run and answers rule queries from the results"""
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.rules = []
+        self.matches = {}
+        self.contents = {}
+        self.stats = {'scanned': 0, 'cached': 0, 'bytes_read': 0}
+        self._cache = self._load_cache()
+
+    def add_rule(self, name, pattern, files=(), roots=(), extensions=()):
+        """Register a rule; plain strings are matched literally, bytes as regexes"""
+        self.rules.append(ScanRule(name, pattern, files, roots, extensions))
+
+    def _load_cache(self):
+        """Load the on-disk cache, ignoring it if missing or from another version"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+            return cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        """Persist per-file results for the next run"""
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self._cache}, f)
+        except OSError:
+            pass
+
+    def _targets(self):
+        """Collect every file any rule applies to, walking each root only once"""
+        targets = set()
+        roots = set()
+        for rule in self.rules:
+            targets.update(f for f in rule.files if os.path.isfile(f))
+            roots.update(rule.roots)
+        for root in roots:
+            for dirpath, _, files in os.walk(root):
+                targets.update(os.path.join(dirpath, f) for f in files)
+        return sorted(targets)
+
+    def _scan_file(self, path, rules):
+        """Scan one file, reusing cached results when it is unchanged"""
+        signature = hashlib.sha1(repr(sorted(rules)).encode()).hexdigest()
+        st = os.stat(path)
+        cached = self._cache.get(path)
+        if cached and cached['rules'] == signature and \
+                cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+            self.stats['cached'] += 1
+            return set(cached['matches'])
+
+        with open(path, 'rb') as f:
+            if st.st_size >= MMAP_THRESHOLD:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+                self.contents[path] = data
+        self.stats['bytes_read'] += st.st_size
+
+        try:
+            digest = hashlib.sha1(data).hexdigest()
+            if cached and cached['rules'] == signature and cached['sha1'] == digest:
+                self.stats['cached'] += 1
+                found = set(cached['matches'])
+            else:
+                self.stats['scanned'] += 1
+                found = find_rules(data, rules)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+        self._cache[path] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha1': digest,
+            'rules': signature,
+            'matches': sorted(found)
+        }
+        return found
+
+    def scan(self):
+        """Run every registered rule over every target file in a single pass"""
+        for path in self._targets():
+            rules = frozenset((r.name, r.pattern) for r in self.rules if r.applies_to(path))
+            if not rules:
+                continue
+            try:
+                self.matches[path] = self._scan_file(path, rules)
+            except OSError:
+                continue
+        self._save_cache()
+        return self.matches
+
+    def matched(self, rule_name, path):
+        """Return True if rule_name matched in path"""
+        return rule_name in self.matches.get(os.path.abspath(path), ())
+
+    def files_matching(self, rule_name):
+        """Return the scanned paths in which rule_name matched"""
+        return [path for path, found in self.matches.items() if rule_name in found]
+
+    def read_text(self, path):
+        """Return the text of path, reusing bytes already read during the scan"""
+        path = os.path.abspath(path)
+        if path not in self.contents:
+            with open(path, 'rb') as f:
+                self.contents[path] = f.read()
+            self.stats['bytes_read'] += len(self.contents[path])
+        return self.contents[path].decode('utf-8', errors='replace')
+
+    def read_json(self, path):
+        """Return the parsed JSON content of path"""
+        return json.loads(self.read_text(path))
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Tender Generator test suites
+Provides per-thread keep-alive HTTP sessions, a dependency-aware check scheduler
+and an append-only store of per-check timings
+
+Run directly to compare the latest stored run against a baseline:
+    python harness.py compare --suite backend --threshold 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of checks run concurrently by default
+DEFAULT_WORKERS = 8
+
+# Backend sources, used when a suite starts its own server
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server')
+
+# Append-only JSONL store of every recorded run
+RESULTS_PATH = os.environ.get(
+    'TENDER_RESULTS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results.jsonl')
+)
+
+# Per-thread request accounting for the check currently running on that thread
+_current = threading.local()
+
+def _record_response(response, *args, **kwargs):
+    """Session response hook that attributes bytes received to the running check"""
+    counters = getattr(_current, 'counters', None)
+    if counters is not None:
+        counters['requests'] += 1
+        # Reading .content would buffer a streamed body, so trust its header instead
+        if kwargs.get('stream'):
+            counters['response_bytes'] += int(response.headers.get('Content-Length', 0))
+        else:
+            counters['response_bytes'] += len(response.content)
+    return response
+
+class ThreadSessions:
+    """Stands in for a requests.Session but gives every thread its own
+
+    requests.Session is not thread-safe, so each thread lazily builds a
+    keep-alive session with its own mounted HTTPAdapter. Attribute access
+    is forwarded to the calling thread's session, so one instance can be
+    stored on a client and shared by a whole thread pool.
+    """
+
+    def __init__(self, pool_size):
+        self.pool_size = pool_size
+        self._local = threading.local()
+
+    def current(self):
+        """Return the calling thread's session, building it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.hooks['response'].append(_record_response)
+            self._local.session = session
+        return session
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+# A thread sends one request at a time, plus the odd streamed body held open
+_sessions = ThreadSessions(pool_size=2)
+
+def get_session(pool_size=None):
+    """Return the keep-alive sessions shared by every suite, one per thread
+
+    pool_size sizes the connection pool of sessions built from now on.
+    """
+    if pool_size is not None:
+        _sessions.pool_size = pool_size
+    return _sessions
+
+def wait_until_ready(base_url, timeout=30, process=None, consecutive=1):
+    """Poll base_url/ready with exponential backoff until the backend reports ready
+
+    consecutive ready answers on fresh connections are required, so under
+    the cluster every worker gets a chance to answer. Returns (seconds
+    waited, the last /ready body).
+    """
+    start = time.monotonic()
+    delay = 0.05
+    streak = 0
+    while True:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Backend exited during startup: {backend_output(process)[-500:]}")
+        try:
+            response = requests.get(f"{base_url}/ready", headers={'Connection': 'close'}, timeout=2)
+            if response.status_code == 200:
+                streak += 1
+                if streak >= consecutive:
+                    return time.monotonic() - start, response.json()
+                continue
+        except requests.exceptions.RequestException:
+            pass
+        streak = 0
+        if time.monotonic() - start + delay > timeout:
+            raise RuntimeError(f"Backend at {base_url} was not ready within {timeout}s")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+def backend_output(process):
+    """What a backend started by start_backend has written to stderr so far"""
+    log_path = getattr(process, 'log_path', None)
+    if not log_path:
+        return process.stderr.read() if process.stderr else ''
+    with open(log_path) as f:
+        return f.read()
+
+def start_backend(port, env=None, server_dir=SERVER_DIR, timeout=30):
+    """Start `node index.js` on port with extra env vars and wait until it is ready
+
+    stderr goes to a temporary log file rather than a pipe nobody reads, so
+    a server logging many errors never blocks on a full pipe. The file is
+    removed by stop_backend and kept, with its path in the error, if the
+    backend never becomes ready.
+    """
+    with tempfile.NamedTemporaryFile(mode='w', prefix=f'backend-{port}-', suffix='.log', delete=False) as log:
+        process = subprocess.Popen(
+            ['node', 'index.js'],
+            cwd=server_dir,
+            env=dict(os.environ, PORT=str(port), **(env or {})),
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            text=True
+        )
+    process.log_path = log.name
+    try:
+        wait_until_ready(f"http://localhost:{port}", timeout, process)
+    except RuntimeError as e:
+        stop_backend(process, keep_log=True)
+        raise RuntimeError(f"{e} (log: {log.name})") from e
+    return process
+
+class MetricsScraper:
+    """Polls a JSON metrics endpoint on a background thread during a load run
+
+    Samples are (seconds since origin, body) pairs, origin being the
+    perf_counter() value at start(); failed polls are skipped so a saturated
+    server only thins the samples out.
+    """
+
+    def __init__(self, url, interval=0.25, headers=None):
+        self.url = url
+        self.interval = interval
+        self.headers = headers or {}
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.origin = None
+
+    def _poll(self):
+        # A dedicated session, so scrapes never wait behind load-test connections
+        session = requests.Session()
+        while not self._stop.is_set():
+            try:
+                response = session.get(self.url, headers=self.headers, timeout=self.interval * 4)
+                if response.ok:
+                    self.samples.append((time.perf_counter() - self.origin, response.json()))
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self.origin = time.perf_counter()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.samples
+
+def stop_backend(process, keep_log=False):
+    """Terminate a backend started by start_backend and remove its log"""
+    if process and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    log_path = getattr(process, 'log_path', None)
+    if log_path and not keep_log and os.path.exists(log_path):
+        os.remove(log_path)
+
+def measure(check):
+    """Call check and return (result, metrics) with wall-clock time and bytes received"""
+    counters = {'requests': 0, 'response_bytes': 0}
+    _current.counters = counters
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = e
+    finally:
+        _current.counters = None
+    counters['duration_ms'] = (time.perf_counter() - start) * 1000
+    return result, counters
+
+def run_checks(checks, max_workers=DEFAULT_WORKERS, metrics=None):
+    """Run checks concurrently while respecting their declared dependencies
+
+    checks is a list of (check, dependencies) pairs, where dependencies is a
+    list of other checks that must finish first. A check is started as soon as
+    all of its dependencies have finished, whatever their outcome. Returns a
+    dict mapping each check to its return value, or to the exception it raised.
+    If metrics is a dict it is filled with each check's measure() metrics.
+    """
+    pending = dict(checks)
+    unknown = [dep for deps in pending.values() for dep in deps if dep not in pending]
+    if unknown:
+        raise ValueError(f"Unknown check dependencies: {unknown}")
+
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for check, deps in list(pending.items()):
+                if all(dep in results for dep in deps):
+                    running[pool.submit(measure, check)] = check
+                    del pending[check]
+
+            if not running:
+                raise ValueError(f"Circular check dependencies: {list(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                check = running.pop(future)
+                results[check], check_metrics = future.result()
+                if metrics is not None:
+                    metrics[check] = check_metrics
+
+    return {check: results[check] for check, _ in checks}
+
+def percentile(values, pct):
+    """Return the pct-th percentile of values (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def latency_stats(latencies):
+    """Summarize a list of latencies in seconds as millisecond percentiles"""
+    return {
+        'samples': len(latencies),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies) * 1000 if latencies else 0.0
+    }
+
+def check_records(results, metrics):
+    """Build storable per-check records from run_checks results and metrics"""
+    records = {}
+    for check, result in results.items():
+        record = dict(metrics.get(check, {}))
+        record['success'] = bool(result) and not isinstance(result, Exception)
+        records[check.__name__] = record
+    return records
+
+def _git_commit():
+    """Return the current git commit, if the suite runs inside a checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+class ResultsStore:
+    """Append-only JSONL store of suite runs"""
+
+    def __init__(self, path=RESULTS_PATH):
+        self.path = path
+
+    def record_run(self, suite, checks, **extra):
+        """Append one run; checks maps check name -> metrics dict"""
+        run = {
+            'run_id': f"{suite}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}",
+            'suite': suite,
+            'timestamp': datetime.now().isoformat(),
+            'commit': _git_commit(),
+            'checks': checks
+        }
+        run.update(extra)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        return run
+
+    def runs(self, suite=None):
+        """Return stored runs in recording order, optionally for one suite"""
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    continue
+                if suite is None or run.get('suite') == suite:
+                    runs.append(run)
+        return runs
+
+def compare_runs(baseline, current, threshold_pct=20.0, min_delta_ms=5.0, metric='duration_ms'):
+    """Return (name, baseline_value, current_value, change_pct) for each regressed check
+
+    A check regresses when metric grew by more than threshold_pct percent and
+    by more than min_delta_ms, so sub-millisecond jitter is never flagged.
+    """
+    regressions = []
+    for name, stats in current['checks'].items():
+        base_stats = baseline['checks'].get(name)
+        if not base_stats or metric not in stats or metric not in base_stats:
+            continue
+        before, after = base_stats[metric], stats[metric]
+        if after - before <= min_delta_ms:
+            continue
+        change = (after - before) / before * 100 if before else float('inf')
+        if change > threshold_pct:
+            regressions.append((name, before, after, change))
+    return regressions
+
+def compare_command(args):
+    """Compare the latest run of a suite against a baseline run"""
+    runs = ResultsStore(args.results).runs(args.suite)
+    positions = {run['run_id']: position for position, run in enumerate(runs)}
+    for label, run_id in (('baseline', args.baseline), ('current', args.current)):
+        if run_id and run_id not in positions:
+            print(f"❌ No {label} run '{run_id}' in suite '{args.suite}'")
+            return False
+
+    current_index = positions[args.current] if args.current else len(runs) - 1
+    baseline_index = positions[args.baseline] if args.baseline else current_index - 1
+    if baseline_index < 0:
+        print(f"❌ Need a baseline and a current run of suite '{args.suite}' to compare")
+        return False
+    baseline, current = runs[baseline_index], runs[current_index]
+
+    print(f"📊 Comparing {current['run_id']} ({current.get('commit')}) against {baseline['run_id']} ({baseline.get('commit')})")
+    regressions = compare_runs(baseline, current, args.threshold, args.min_delta, args.metric)
+    for name, before, after, change in regressions:
+        print(f"❌ REGRESSION {name}: {before:.1f} -> {after:.1f} ({change:+.1f}%)")
+
+    if regressions:
+        print(f"⚠️  {len(regressions)} check(s) regressed by more than {args.threshold:.0f}%")
+        return False
+    print(f"✅ No check regressed by more than {args.threshold:.0f}%")
+    return True
+
+def main():
+    """Command line entry point for working with stored results"""
+    parser = argparse.ArgumentParser(description="Stored test-suite results")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compare = subparsers.add_parser('compare', help="Flag checks whose latency regressed against a baseline")
+    compare.add_argument('--suite', required=True, help="Suite name, e.g. backend, deployment, assessment")
+    compare.add_argument('--baseline', help="Baseline run_id (defaults to the previous run of the suite)")
+    compare.add_argument('--current', help="Run_id to check (defaults to the latest run of the suite)")
+    compare.add_argument('--threshold', type=float, default=20.0, help="Allowed latency increase in percent")
+    compare.add_argument('--min-delta', type=float, default=5.0, help="Ignore increases smaller than this many ms")
+    compare.add_argument('--metric', default='duration_ms', help="Per-check metric to compare")
+    compare.add_argument('--results', default=RESULTS_PATH, help="Path of the JSONL results store")
+    args = parser.parse_args()
+
+    success = compare_command(args)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+// Run index.js on several worker processes sharing one port.
+// Usage: npm run start:cluster (CLUSTER_WORKERS sets the worker count)
+// kill -HUP <primary pid> replaces the workers one at a time without dropping
+// requests, e.g. after a deploy; SIGTERM stops them all gracefully.
+require("dotenv").config();
+const cluster = require("cluster");
+const path = require("path");
+const config = require("./config");
+
+// Password hashing threads are per process, so by default each worker gets
+// one instead of one per core
+const WORKER_ENV = { HASH_WORKERS: process.env.HASH_WORKERS ?? "1" };
+
+cluster.setupPrimary({ exec: path.join(__dirname, "index.js") });
+
+let restarting = false;
+let stopping = false;
+
+// Start a worker and resolve once it accepts connections
+const startWorker = () =>
+  new Promise((resolve, reject) => {
+    const worker = cluster.fork(WORKER_ENV);
+    const onExit = (code, signal) =>
+      reject(new Error(`Worker ${worker.id} exited during startup (${signal || code})`));
+    worker.once("exit", onExit);
+    worker.once("listening", () => {
+      worker.removeListener("exit", onExit);
+      worker.listened = true;
+      resolve(worker);
+    });
+  });
+
+// Ask a worker to finish its in-flight requests and exit
+const retireWorker = (worker) =>
+  new Promise((resolve) => {
+    worker.retiring = true;
+    if (worker.isDead()) return resolve();
+    worker.once("exit", resolve);
+    worker.process.kill("SIGTERM");
+  });
+
+// Replace each worker in turn, starting its replacement first so capacity
+// never drops below the configured worker count
+const rollingRestart = async () => {
+  if (restarting || stopping) return;
+  restarting = true;
+  console.log("Rolling restart started");
+  try {
+    for (const worker of Object.values(cluster.workers)) {
+      await startWorker();
+      await retireWorker(worker);
+    }
+    console.log("Rolling restart finished");
+  } catch (err) {
+    console.error("Rolling restart aborted:", err.message);
+  } finally {
+    restarting = false;
+  }
+};
+
+const stop = async () => {
+  if (stopping) return;
+  stopping = true;
+  await Promise.all(Object.values(cluster.workers).map(retireWorker));
+  process.exit(0);
+};
+
+// Replace workers that crash after starting; one that dies before listening
+// would most likely die again, so it is not restarted
+cluster.on("exit", (worker, code, signal) => {
+  if (worker.retiring || stopping) return;
+  console.error(`Worker ${worker.id} died (${signal || code})`);
+  if (worker.listened) {
+    startWorker().catch((err) => console.error(err.message));
+  } else if (Object.keys(cluster.workers).length === 0) {
+    console.error("No workers left, exiting");
+    process.exit(1);
+  }
+});
+
+process.on("SIGHUP", rollingRestart);
+process.on("SIGTERM", stop);
+process.on("SIGINT", stop);
+
+const workerCount = Math.max(1, config.clusterWorkers);
+Promise.all(Array.from({ length: workerCount }, startWorker))
+  .then(() => console.log(`Cluster primary ${process.pid} running ${workerCount} workers`))
+  .catch((err) => console.error(err.message));
@@ -1,6 +1,85 @@
 require('dotenv').config();
+const os = require('os');
+
+const cpuCount = os.availableParallelism ? os.availableParallelism() : os.cpus().length;
+const isProduction = process.env.NODE_ENV === 'production';
+
+// Numeric settings fall back to their default when unset or not a number, so
+// a typo cannot turn a cache size into NaN and disable its bound
+const envInt = (name, fallback) => {
+  const value = Number(process.env[name]);
+  return process.env[name]?.trim() && Number.isInteger(value) ? value : fallback;
+};
+const envFloat = (name, fallback) => {
+  const value = Number(process.env[name]);
+  return process.env[name]?.trim() && Number.isFinite(value) ? value : fallback;
+};
 
 module.exports = {
   mongoURI: process.env.MONGO_URI,
+  // MongoDB driver pool and timeouts
+  mongoPool: {
+    maxPoolSize: envInt('MONGO_MAX_POOL_SIZE', 100),
+    minPoolSize: envInt('MONGO_MIN_POOL_SIZE', 0),
+    // Fail an operation that waited this long for a free connection; 0 waits forever
+    waitQueueTimeoutMS: envInt('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000),
+    connectTimeoutMS: envInt('MONGO_CONNECT_TIMEOUT_MS', 10000),
+    socketTimeoutMS: envInt('MONGO_SOCKET_TIMEOUT_MS', 45000),
+    serverSelectionTimeoutMS: envInt('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000),
+  },
+  // Emit driver command events for the per-operation timings on /metrics/db
+  mongoMonitorCommands: process.env.MONGO_MONITOR_COMMANDS !== 'false',
+  // Bearer token for /metrics; unset allows only requests from localhost
+  metricsToken: process.env.METRICS_TOKEN,
   jwtSecret: process.env.JWT_SECRET,
+  // Verified JWTs cached by the auth middleware; 0 disables the cache
+  tokenCacheSize: envInt('TOKEN_CACHE_SIZE', 10000),
+  // Base URL of a stand-in OAuth2 provider (see fake_oauth_provider.py); unset uses Google
+  oauthProviderURL: process.env.OAUTH_PROVIDER_URL,
+  // bcrypt work factor for new and rehashed passwords
+  bcryptCost: envInt('BCRYPT_COST', 10),
+  // Worker threads that hash passwords off the event loop; 0 hashes on the main thread.
+  // cluster.js gives each server process 1 unless this is set explicitly.
+  hashWorkers: envInt('HASH_WORKERS', Math.max(1, cpuCount - 1)),
+  // Rendered tender documents kept in memory, keyed by content hash; 0 disables the cache
+  renderCacheSize: envInt('RENDER_CACHE_SIZE', 500),
+  // Responses smaller than this many bytes are sent uncompressed; -1 disables compression
+  compressionThreshold: envInt('COMPRESSION_THRESHOLD', 1024),
+  // Server processes started by cluster.js
+  clusterWorkers: envInt('CLUSTER_WORKERS', cpuCount),
+  // express-session store: mongo (shared by every process) or memory (single process, development only)
+  sessionStore: process.env.SESSION_STORE ?? 'mongo',
+  // Session cookie lifetime; the mongo store expires sessions after it too
+  sessionTtlMs: envInt('SESSION_TTL_MS', 24 * 60 * 60 * 1000),
+  // Mount GET /api/session-probe, which saves a new session per request, for
+  // the session store soak test; no other route writes a session
+  sessionProbe: process.env.SESSION_PROBE === 'true',
+  // Users loaded by passport.deserializeUser, cached briefly per process; 0 disables the cache
+  userCacheSize: envInt('USER_CACHE_SIZE', 1000),
+  userCacheTtlMs: envInt('USER_CACHE_TTL_MS', 30000),
+  // Append anonymized API request shapes and timings to this NDJSON file for
+  // replay by benchmark_test.py replay; unset disables capture
+  trafficCaptureFile: process.env.TRAFFIC_CAPTURE_FILE,
+  // Token buckets for login/signup: memory (per process) or mongo (shared by every process)
+  rateLimitStore: process.env.RATE_LIMIT_STORE ?? 'memory',
+  // Buckets the memory store keeps before dropping the least recently used
+  rateLimitBuckets: envInt('RATE_LIMIT_BUCKETS', 100000),
+  // Login and signup attempts per client IP and per account email: a burst of
+  // capacity, then refillPerMinute. A capacity of 0 turns that limit off; both
+  // are off by default outside production, where the test suites log in hard.
+  authRateLimits: {
+    ip: {
+      capacity: envInt('AUTH_IP_BURST', isProduction ? 30 : 0),
+      refillPerMinute: envFloat('AUTH_IP_PER_MINUTE', 20),
+    },
+    account: {
+      capacity: envInt('AUTH_ACCOUNT_BURST', isProduction ? 10 : 0),
+      refillPerMinute: envFloat('AUTH_ACCOUNT_PER_MINUTE', 5),
+    },
+  },
+  // Express "trust proxy" setting, so req.ip is the client behind a proxy
+  // such as Render's; defaults to one hop in production
+  trustProxy: envInt('TRUST_PROXY', isProduction ? 1 : 0),
+  // How long a stopping server waits for in-flight requests before exiting anyway
+  shutdownTimeoutMs: envInt('SHUTDOWN_TIMEOUT_MS', 10000),
 };
@@ -1,5 +1,6 @@
-// src/data/criteriaData.js
-export const criteriaData = {
+// server/data/criteriaData.js
+// Source of the criteria catalog served by /api/criteria
+const criteriaData = {
   government: [
     {
       id: "GOV1",
@@ -1740,7 +1741,7 @@ export const criteriaData = {
 };
 
 // Create sectors array from criteriaData keys
-export const sectors = [
+const sectors = [
   { id: 'government', name: 'Government', description: 'Government sector tenders and public procurement' },
   { id: 'business', name: 'Business', description: 'Business-to-business commercial tenders' },
   { id: 'healthcare', name: 'Healthcare', description: 'Healthcare and medical industry tenders' },
@@ -1754,3 +1755,5 @@ export const sectors = [
   { id: 'education', name: 'Education', description: 'Educational institutions and services' },
   { id: 'consultancy', name: 'Consultancy', description: 'Consulting and professional services' }
 ];
+
+module.exports = { criteriaData, sectors };
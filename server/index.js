@@ -1,21 +1,76 @@
 require("dotenv").config();
+const cluster = require("cluster");
 const express = require("express");
 const mongoose = require("mongoose");
 const cors = require("cors");
+const compression = require("compression");
 const session = require("express-session");
 const passport = require("passport");
+const config = require("./config");
+const createSessionStore = require("./utils/sessionStore");
+const { instrumentConnection } = require("./services/dbMetrics");
+const requestMetrics = require("./middleware/requestMetrics");
+const trafficCapture = require("./middleware/trafficCapture");
 
 const app = express();
+let shuttingDown = false;
 
-// Session configuration for Google OAuth
+// Per-route request counts, latency and response sizes for /metrics
+app.use(requestMetrics);
+
+// Opt-in recording of anonymized traffic for benchmark_test.py replay
+if (config.trafficCaptureFile) {
+  app.use(trafficCapture(config.trafficCaptureFile));
+  console.log(`Capturing API traffic to ${config.trafficCaptureFile}`);
+}
+
+// Startup phases, in ms since the process started, reported by /ready
+const startup = {
+  dbConnectMs: null, // Time spent connecting to MongoDB
+  routesMountedAtMs: null, // Every module required and route mounted
+  dbConnectedAtMs: null,
+  readyAtMs: null,
+};
+const elapsedMs = () => Math.round(performance.now());
+const markReady = () => {
+  if (startup.readyAtMs === null && startup.routesMountedAtMs !== null && startup.dbConnectedAtMs !== null) {
+    startup.readyAtMs = elapsedMs();
+  }
+};
+
+app.use((req, res, next) => {
+  // Under cluster.js, name the worker that served the request
+  if (cluster.isWorker) res.set("X-Worker-Id", String(cluster.worker.id));
+  // Keep-alive clients reconnect elsewhere instead of reusing a closing server
+  if (shuttingDown) res.set("Connection", "close");
+  next();
+});
+
+// Compress responses above the size threshold for clients that accept gzip;
+// tiny bodies such as 304s and errors are not worth the CPU
+if (config.compressionThreshold >= 0) {
+  app.use(compression({ threshold: config.compressionThreshold }));
+}
+
+// Behind Render's proxy, trust its X-Forwarded-Proto so secure cookies are
+// set and its X-Forwarded-For so rate limits see the real client IP
+if (config.trustProxy > 0) {
+  app.set("trust proxy", config.trustProxy);
+}
+
+// Session configuration. Logins are carried by JWTs and Google OAuth runs
+// without a state parameter, so no route writes a session; passport.session()
+// only restores one if a client presents it. Sessions live in MongoDB by
+// default so every worker process sees them.
 app.use(
   session({
+    store: createSessionStore(),
     secret: process.env.JWT_SECRET,
     resave: false,
     saveUninitialized: false,
     cookie: {
       secure: process.env.NODE_ENV === "production", // Use secure cookies in production
-      maxAge: 24 * 60 * 60 * 1000, // 24 hours
+      maxAge: config.sessionTtlMs,
     },
   })
 );
@@ -24,6 +79,14 @@ app.use(
 app.use(passport.initialize());
 app.use(passport.session());
 
+// Opens and saves a fresh session for benchmark_test.py sessions
+if (config.sessionProbe) {
+  app.get("/api/session-probe", (req, res) => {
+    req.session.openedAt = Date.now();
+    res.status(204).end();
+  });
+}
+
 app.use(express.json());
 
 // CORS configuration for production
@@ -35,8 +98,8 @@ const corsOptions = {
       "https://automated-tender-generation-machine.vercel.app/", // Production frontend URL
   ],
   credentials: true,
-  methods: ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-  allowedHeaders: ["Content-Type", "Authorization"],
+  methods: ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+  allowedHeaders: ["Content-Type", "Authorization", "If-Match"],
 };
 
 app.use(cors(corsOptions));
@@ -50,18 +113,42 @@ app.get("/", (req, res) => {
   });
 });
 
+// Readiness check: 200 only once MongoDB is connected and every route is
+// mounted, 503 before that and while shutting down
+app.get("/ready", (req, res) => {
+  const ready = startup.readyAtMs !== null && mongoose.connection.readyState === 1 && !shuttingDown;
+  res.status(ready ? 200 : 503).json({ ready, pid: process.pid, startup });
+});
+
 // MongoDB connection
+const dbConnectStartedMs = performance.now();
 mongoose
-  .connect(process.env.MONGO_URI)
-  .then(() => console.log("MongoDB connected successfully"))
+  .connect(process.env.MONGO_URI, {
+    ...config.mongoPool,
+    monitorCommands: config.mongoMonitorCommands,
+  })
+  .then(() => {
+    startup.dbConnectMs = Math.round(performance.now() - dbConnectStartedMs);
+    startup.dbConnectedAtMs = elapsedMs();
+    markReady();
+    console.log("MongoDB connected successfully");
+  })
   .catch((err) => console.error("MongoDB connection error:", err));
+// Pool and command metrics for /metrics/db
+instrumentConnection(mongoose.connection);
 
 // Import routes
 const authRoutes = require("./routes/auth");
 const tenderRoutes = require("./routes/tender");
+const criteriaRoutes = require("./routes/criteria");
+const metricsRoutes = require("./routes/metrics");
 
 app.use("/api/auth", authRoutes);
 app.use("/api/tenders", tenderRoutes);
+app.use("/api/criteria", criteriaRoutes);
+app.use("/metrics", metricsRoutes);
+startup.routesMountedAtMs = elapsedMs();
+markReady();
 
 // Error handling middleware
 app.use((err, req, res, next) => {
@@ -75,4 +162,22 @@ app.use("*", (req, res) => {
 });
 
 const PORT = process.env.PORT || 5000;
-app.listen(PORT, () => console.log(`Server running on port ${PORT}`));
+const server = app.listen(PORT, () => console.log(`Server running on port ${PORT}`));
+
+// Stop accepting connections, let in-flight requests finish, then exit.
+// cluster.js sends SIGTERM to retire a worker during a rolling restart.
+const shutdown = () => {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  setTimeout(() => {
+    console.error("Shutdown timed out with requests still in flight");
+    process.exit(1);
+  }, config.shutdownTimeoutMs).unref();
+  server.close(() => {
+    mongoose.disconnect().finally(() => process.exit(0));
+  });
+  server.closeIdleConnections();
+};
+
+process.on("SIGTERM", shutdown);
+process.on("SIGINT", shutdown);
@@ -1,15 +1,34 @@
+const crypto = require('crypto');
 const jwt = require('jsonwebtoken');
 const config = require('../config');
+const LRUCache = require('../utils/lruCache');
 
-module.exports = function (req, res, next) {
-  const token = req.header('Authorization');
-  if (!token) return res.status(401).json({ msg: 'No token, authorization denied' });
+// Verified token payloads keyed by token hash, each kept until the token's exp
+const tokenCache = new LRUCache(config.tokenCacheSize);
+
+const tokenKey = (token) => crypto.createHash('sha256').update(token).digest('base64');
+
+// Accepts "Bearer <token>" or a bare token in the Authorization header
+const verifyToken = (req, res, next) => {
+  const token = req.header('Authorization')?.replace('Bearer ', '');
+  if (!token) return res.status(401).json({ msg: 'No token provided' });
+
+  const key = tokenKey(token);
+  const cached = tokenCache.get(key);
+  if (cached) {
+    req.user = cached;
+    return next();
+  }
 
   try {
-    const decoded = jwt.verify(token, config.jwtSecret);
-    req.user = decoded.user;
+    const decoded = Object.freeze(jwt.verify(token, config.jwtSecret));
+    if (decoded.exp) tokenCache.set(key, decoded, decoded.exp * 1000);
+    req.user = decoded;
     next();
   } catch (err) {
-    res.status(401).json({ msg: 'Token is not valid' });
+    res.status(401).json({ msg: 'Invalid token' });
   }
 };
+
+module.exports = verifyToken;
+module.exports.tokenCache = tokenCache;
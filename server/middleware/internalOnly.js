@@ -0,0 +1,16 @@
+const config = require('../config');
+
+const LOOPBACK = new Set(['127.0.0.1', '::1', '::ffff:127.0.0.1']);
+
+// Internal endpoints answer requests presenting METRICS_TOKEN or, when no
+// token is configured, only connections from this machine. Behind a proxy
+// every connection comes from the proxy, so production needs the token.
+const internalOnly = (req, res, next) => {
+  const allowed = config.metricsToken
+    ? req.header('Authorization') === `Bearer ${config.metricsToken}`
+    : LOOPBACK.has(req.socket.remoteAddress);
+  if (!allowed) return res.status(404).json({ message: 'Route not found' });
+  next();
+};
+
+module.exports = internalOnly;
@@ -0,0 +1,39 @@
+const crypto = require('crypto');
+const { createBucketStore } = require('../utils/tokenBucket');
+
+let defaultStore;
+
+// Reject requests over a token-bucket limit with 429 before the route does
+// any work. key(req) names the bucket a request draws from; requests without
+// a key are not limited. A limit with capacity 0 is off. If the store fails,
+// requests are let through rather than locking everyone out.
+const rateLimit = ({ name, key, limit, store }) => async (req, res, next) => {
+  if (!(limit.capacity > 0)) return next();
+  const id = key(req);
+  if (!id) return next();
+
+  try {
+    defaultStore = defaultStore || createBucketStore();
+    const { allowed, retryAfterMs } = await (store || defaultStore).take(`${name}:${id}`, limit);
+    if (allowed) return next();
+    res.set('Retry-After', String(Math.ceil(retryAfterMs / 1000)));
+    res.status(429).json({ msg: 'Too many attempts, please try again later' });
+  } catch (err) {
+    console.error('Rate limit error:', err);
+    next();
+  }
+};
+
+const byIp = (req) => req.ip;
+
+// Accounts are keyed by a hash of the normalized email, so the store never
+// holds addresses
+const byAccount = (req) => {
+  const email = req.body?.email;
+  if (typeof email !== 'string' || !email.trim()) return null;
+  return crypto.createHash('sha256').update(email.trim().toLowerCase()).digest('base64url');
+};
+
+module.exports = rateLimit;
+module.exports.byIp = byIp;
+module.exports.byAccount = byAccount;
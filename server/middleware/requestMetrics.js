@@ -0,0 +1,44 @@
+const { recordRequest } = require('../services/requestMetrics');
+
+// Route label for a finished request: the matched route's template, e.g.
+// /api/tenders/:id, so IDs never become labels. Requests no route handled
+// share one label.
+const routeLabel = (req) => {
+  if (!req.route) return 'unmatched';
+  const path = req.route.path === '/' && req.baseUrl ? '' : String(req.route.path);
+  return `${req.baseUrl}${path}` || '/';
+};
+
+// Time every request and count the body bytes it sends. Registered before
+// compression, so the counted bytes are the ones that go on the wire.
+const requestMetrics = (req, res, next) => {
+  const start = process.hrtime.bigint();
+  let bytes = 0;
+  const count = (chunk, encoding) => {
+    if (chunk && typeof chunk !== 'function') {
+      bytes += Buffer.isBuffer(chunk) ? chunk.length : Buffer.byteLength(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+    }
+  };
+
+  const write = res.write;
+  const end = res.end;
+  res.write = function (chunk, encoding, ...rest) {
+    count(chunk, encoding);
+    return write.call(this, chunk, encoding, ...rest);
+  };
+  res.end = function (chunk, encoding, ...rest) {
+    count(chunk, encoding);
+    return end.call(this, chunk, encoding, ...rest);
+  };
+
+  res.once('finish', () => {
+    const durationMs = Number(process.hrtime.bigint() - start) / 1e6;
+    // Later finish listeners, such as traffic capture, reuse these figures
+    res.locals.timing = { durationMs, bytes };
+    recordRequest(req.method, routeLabel(req), res.statusCode, durationMs, bytes);
+  });
+  next();
+};
+
+module.exports = requestMetrics;
+module.exports.routeLabel = routeLabel;
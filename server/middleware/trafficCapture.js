@@ -0,0 +1,94 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const config = require('../config');
+const { routeLabel } = require('./requestMetrics');
+
+// Body fields copied verbatim: tender selections reference the public
+// criteria catalog and carry the payload sizes a replay needs. Credentials
+// are left out entirely, since even their length is personal and a replay
+// signs up its own users. Every other string is replaced by one of the same
+// length.
+const KEPT_BODY_FIELDS = new Set(['sector', 'categories', 'categoriesOrder', 'isDraft', 'version', 'ops']);
+const DROPPED_BODY_FIELDS = new Set(['password', 'email', 'name']);
+const KEPT_QUERY_FIELDS = new Set(['limit', 'view', 'format', 'sector']);
+
+// Pseudonyms for users and document IDs. Keyed by the JWT secret so every
+// worker of a cluster maps an ID to the same pseudonym, while the capture
+// file alone cannot be mapped back to real IDs.
+const pseudonymKey = crypto
+  .createHmac('sha256', config.jwtSecret || crypto.randomBytes(32))
+  .update('traffic-capture')
+  .digest();
+const pseudonym = (id) =>
+  crypto.createHmac('sha256', pseudonymKey).update(String(id)).digest('base64url').slice(0, 16);
+
+const mask = (value) => {
+  if (typeof value === 'string') return 'x'.repeat(value.length);
+  if (Array.isArray(value)) return value.map(mask);
+  if (value && typeof value === 'object') {
+    return Object.fromEntries(Object.entries(value).map(([key, v]) => [key, mask(v)]));
+  }
+  return value;
+};
+
+const anonymizeBody = (body) => {
+  if (!body || typeof body !== 'object') return undefined;
+  const entries = Object.entries(body).filter(([key]) => !DROPPED_BODY_FIELDS.has(key));
+  if (entries.length === 0) return undefined;
+  return Object.fromEntries(
+    entries.map(([key, value]) => [key, KEPT_BODY_FIELDS.has(key) ? value : mask(value)])
+  );
+};
+
+const anonymizeQuery = (query) => {
+  const kept = Object.entries(query).filter(([key]) => KEPT_QUERY_FIELDS.has(key));
+  return kept.length ? Object.fromEntries(kept) : undefined;
+};
+
+const anonymizeParams = (params = {}) => {
+  const entries = Object.entries(params);
+  return entries.length ? Object.fromEntries(entries.map(([name, value]) => [name, pseudonym(value)])) : undefined;
+};
+
+// Append one NDJSON line per finished API request to file. Must be mounted
+// after requestMetrics, whose timing it records.
+const trafficCapture = (file) => {
+  const out = fs.createWriteStream(file, { flags: 'a' });
+  out.on('error', (err) => console.error('Traffic capture error:', err.message));
+
+  return (req, res, next) => {
+    const at = Date.now();
+
+    // Note the tender a save creates, so a replay can map later requests for
+    // its ID onto the tender the replay created
+    let created;
+    const json = res.json;
+    res.json = function (body) {
+      if (req.method === 'POST' && body?.tender?._id && res.statusCode < 300) created = pseudonym(body.tender._id);
+      return json.call(this, body);
+    };
+
+    res.once('finish', () => {
+      if (!req.route || !req.baseUrl.startsWith('/api')) return;
+      const { durationMs, bytes } = res.locals.timing || {};
+      const record = {
+        at,
+        method: req.method,
+        route: routeLabel(req),
+        params: anonymizeParams(req.params),
+        query: anonymizeQuery(req.query),
+        user: req.user?.id ? pseudonym(req.user.id) : undefined,
+        status: res.statusCode,
+        ms: durationMs,
+        reqBytes: parseInt(req.headers['content-length'] || '0', 10),
+        resBytes: bytes,
+        body: anonymizeBody(req.body),
+        created,
+      };
+      out.write(`${JSON.stringify(record)}\n`);
+    });
+    next();
+  };
+};
+
+module.exports = trafficCapture;
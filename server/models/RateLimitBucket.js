@@ -0,0 +1,14 @@
+const mongoose = require("mongoose");
+
+// Token bucket shared by every server process (see utils/tokenBucket.js)
+const RateLimitBucketSchema = new mongoose.Schema({
+  _id: { type: String }, // Limit name and key, e.g. "login-ip:203.0.113.7"
+  tokens: { type: Number, required: true },
+  updatedAt: { type: Date, required: true }, // Last refill, by the database clock
+  expiresAt: { type: Date, required: true } // The bucket is full again by then
+});
+
+// A bucket left alone until it refilled is the same as no bucket
+RateLimitBucketSchema.index({ expiresAt: 1 }, { expireAfterSeconds: 0 });
+
+module.exports = mongoose.model("RateLimitBucket", RateLimitBucketSchema);
@@ -0,0 +1,13 @@
+const mongoose = require("mongoose");
+
+// express-session data, shared by every server process (see utils/mongoSessionStore.js)
+const SessionSchema = new mongoose.Schema({
+  _id: { type: String }, // Session ID
+  session: { type: String, required: true }, // JSON-serialized session data
+  expires: { type: Date, required: true }
+});
+
+// MongoDB removes sessions once they expire
+SessionSchema.index({ expires: 1 }, { expireAfterSeconds: 0 });
+
+module.exports = mongoose.model("Session", SessionSchema);
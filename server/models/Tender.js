@@ -4,15 +4,18 @@ const TenderSchema = new mongoose.Schema({
   userId: { type: mongoose.Schema.Types.ObjectId, ref: 'User', required: true },
   title: { type: String, required: true },
   sector: { type: String, required: true }, // Added sector field
-  categories: {
-    type: Map,
-    of: [String], // Array of subcriteria IDs selected for each category
-    required: true
-  },
-  categoriesOrder: { type: [String], required: true }, // Order of categories as arranged by user
+  contentHash: { type: String }, // TenderContent holding this tender's category selection
+  // Inline selection of tenders saved before content deduplication;
+  // `npm run dedup-tenders` moves these into TenderContent
+  categories: { type: Map, of: [String], default: undefined },
+  categoriesOrder: { type: [String], default: undefined },
   isDraft: { type: Boolean, default: false }, // Track if tender is draft or finalized
+  version: { type: Number, default: 0 }, // Bumped by every PATCH, for optimistic concurrency
   createdAt: { type: Date, default: Date.now },
   updatedAt: { type: Date, default: Date.now }
 });
 
+// Every route filters on userId first
+TenderSchema.index({ userId: 1, createdAt: -1, _id: -1 }); // History pages, analytics rebuilds
+
 module.exports = mongoose.model("Tender", TenderSchema);
\ No newline at end of file
@@ -0,0 +1,17 @@
+const mongoose = require("mongoose");
+
+// One canonical category selection, shared by every tender that saved it.
+// _id is the selection's content hash (see services/tenderContent.js).
+const TenderContentSchema = new mongoose.Schema({
+  _id: { type: String },
+  categories: {
+    type: Map,
+    of: [String], // Array of subcriteria IDs selected for each category
+    required: true
+  },
+  categoriesOrder: { type: [String], required: true }, // Order of categories as arranged by user
+  refCount: { type: Number, default: 0 }, // Tenders referencing this selection
+  createdAt: { type: Date, default: Date.now }
+});
+
+module.exports = mongoose.model("TenderContent", TenderContentSchema);
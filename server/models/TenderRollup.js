@@ -0,0 +1,18 @@
+const mongoose = require("mongoose");
+
+// Per-user analytics counters, updated alongside every tender save/delete
+const TenderRollupSchema = new mongoose.Schema({
+  userId: { type: mongoose.Schema.Types.ObjectId, ref: 'User', required: true, unique: true },
+  totalTenders: { type: Number, default: 0 },
+  draftTenders: { type: Number, default: 0 },
+  finalizedTenders: { type: Number, default: 0 },
+  categories: { type: Map, of: Number, default: {} }, // Tenders using each category
+  sectors: { type: Map, of: Number, default: {} }, // Tenders per sector
+  weekly: { type: Map, of: Number, default: {} }, // Keyed by UTC Monday, YYYY-MM-DD
+  monthly: { type: Map, of: Number, default: {} }, // Keyed by UTC month, YYYY-MM
+  dataVersion: { type: Number, default: 0 }, // Bumped by every change to the user's tenders; keys ETags
+  rebuiltAt: { type: Date },
+  updatedAt: { type: Date, default: Date.now }
+});
+
+module.exports = mongoose.model("TenderRollup", TenderRollupSchema);
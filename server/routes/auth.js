@@ -1,11 +1,41 @@
 const express = require("express");
-const bcrypt = require("bcryptjs");
 const jwt = require("jsonwebtoken");
 const passport = require("passport");
 const GoogleStrategy = require("passport-google-oauth20").Strategy;
 const User = require("../models/User");
+const verifyToken = require("../middleware/auth");
+const rateLimit = require("../middleware/rateLimit");
+const { byIp, byAccount } = require("../middleware/rateLimit");
+const LRUCache = require("../utils/lruCache");
+const {
+  hashPassword,
+  comparePassword,
+  needsRehash,
+} = require("../utils/passwordHasher");
+const config = require("../config");
 const router = express.Router();
 
+// Users deserialized from sessions, so session-bearing requests in a burst
+// share one lookup; entries expire quickly since profile changes are not
+// pushed here
+const userCache = new LRUCache(config.userCacheSize);
+
+// Every login or signup attempt costs a user lookup and a bcrypt hash, so
+// floods are turned away by client IP and by target account before either
+const limitAttempts = (route) => [
+  rateLimit({ name: `${route}-ip`, key: byIp, limit: config.authRateLimits.ip }),
+  rateLimit({ name: `${route}-account`, key: byAccount, limit: config.authRateLimits.account }),
+];
+
+// Point the strategy at a stand-in provider when one is configured
+const providerEndpoints = config.oauthProviderURL
+  ? {
+      authorizationURL: `${config.oauthProviderURL}/authorize`,
+      tokenURL: `${config.oauthProviderURL}/token`,
+      userProfileURL: `${config.oauthProviderURL}/userinfo`,
+    }
+  : {};
+
 // Configure Google OAuth Strategy
 passport.use(
   new GoogleStrategy(
@@ -19,18 +49,23 @@ passport.use(
               "https://automated-tender-generation-machine.onrender.com"
             }/api/auth/google/callback`
           : "/api/auth/google/callback",
+      ...providerEndpoints,
     },
     async (accessToken, refreshToken, profile, done) => {
       try {
-        // Check if user already exists with this Google ID
-        let user = await User.findOne({ googleId: profile.id });
+        // Look up by Google ID and by email in one query, preferring the Google ID match
+        const email = profile.emails[0].value;
+        const matches = await User.find({
+          $or: [{ googleId: profile.id }, { email }],
+        }).limit(2);
+        let user = matches.find((u) => u.googleId === profile.id);
 
         if (user) {
           return done(null, user);
         }
 
         // Check if user exists with the same email
-        user = await User.findOne({ email: profile.emails[0].value });
+        user = matches.find((u) => u.email === email);
 
         if (user) {
           // Update existing user to link Google account
@@ -44,7 +79,7 @@ passport.use(
         // Create new user
         user = new User({
           name: profile.displayName,
-          email: profile.emails[0].value,
+          email,
           googleId: profile.id,
           profilePicture: profile.photos[0].value,
           authMethod: "google",
@@ -67,7 +102,12 @@ passport.serializeUser((user, done) => {
 // Deserialize user from session
 passport.deserializeUser(async (id, done) => {
   try {
-    const user = await User.findById(id);
+    const key = String(id);
+    let user = userCache.get(key);
+    if (!user) {
+      user = await User.findById(id).select("-password").lean();
+      if (user) userCache.set(key, user, Date.now() + config.userCacheTtlMs);
+    }
     done(null, user);
   } catch (error) {
     done(error, null);
@@ -75,13 +115,13 @@ passport.deserializeUser(async (id, done) => {
 });
 
 // Regular signup
-router.post("/signup", async (req, res) => {
+router.post("/signup", limitAttempts("signup"), async (req, res) => {
   const { name, email, password } = req.body;
   try {
     let user = await User.findOne({ email });
     if (user) return res.status(400).json({ msg: "User already exists" });
 
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await hashPassword(password);
     user = new User({
       name,
       email,
@@ -101,7 +141,7 @@ router.post("/signup", async (req, res) => {
 });
 
 // Regular login
-router.post("/login", async (req, res) => {
+router.post("/login", limitAttempts("login"), async (req, res) => {
   const { email, password } = req.body;
   try {
     const user = await User.findOne({ email });
@@ -114,9 +154,21 @@ router.post("/login", async (req, res) => {
         .json({ msg: "Please use Google login for this account" });
     }
 
-    const isMatch = await bcrypt.compare(password, user.password);
+    const isMatch = await comparePassword(password, user.password);
     if (!isMatch) return res.status(400).json({ msg: "Invalid credentials" });
 
+    // Upgrade hashes made with an older cost factor without delaying the response
+    if (needsRehash(user.password)) {
+      hashPassword(password)
+        .then((rehashed) =>
+          User.updateOne(
+            { _id: user._id, password: user.password },
+            { $set: { password: rehashed } }
+          )
+        )
+        .catch((err) => console.error("Password rehash error:", err));
+    }
+
     const token = jwt.sign({ id: user._id }, process.env.JWT_SECRET, {
       expiresIn: "1h",
     });
@@ -126,6 +178,11 @@ router.post("/login", async (req, res) => {
   }
 });
 
+// Check whether the caller's token is still valid
+router.get("/verify", verifyToken, (req, res) => {
+  res.json({ valid: true, id: req.user.id });
+});
+
 // Google OAuth routes
 router.get(
   "/google",
@@ -177,3 +234,4 @@ router.get(
 );
 
 module.exports = router;
+module.exports.userCache = userCache;
@@ -0,0 +1,54 @@
+const express = require("express");
+const catalog = require("../services/criteriaCatalog");
+const router = express.Router();
+
+const MAX_LOOKUP_IDS = 200;
+
+// Catalog responses are immutable per catalog version, so one ETag covers all
+// of them; browsers revalidate after an hour and get a 304 until a deploy
+// changes the catalog. Only successful lookups are cached: a 400 or 404
+// goes out without these headers.
+const sendCached = (req, res, body) => {
+  res.set({
+    ETag: catalog.etag,
+    "Cache-Control": "public, max-age=3600, stale-while-revalidate=86400",
+  });
+  if (req.fresh) return res.status(304).end();
+  // Prebuilt bodies are already serialized JSON
+  if (typeof body === "string") return res.type("application/json").send(body);
+  res.json(body);
+};
+
+// Sector list with criteria counts, without any criterion text
+router.get("/", (req, res) => {
+  sendCached(req, res, catalog.manifestBody);
+});
+
+// Every criterion of one sector
+router.get("/sectors/:sector", (req, res) => {
+  const body = catalog.sectorBodies.get(req.params.sector);
+  if (!body) return res.status(404).json({ msg: "Sector not found" });
+  sendCached(req, res, body);
+});
+
+// Resolve ?ids=GOV1,IT3 from the ID index, e.g. for a saved tender
+router.get("/items", (req, res) => {
+  const ids = String(req.query.ids || "")
+    .split(",")
+    .map((id) => id.trim())
+    .filter(Boolean);
+  if (ids.length === 0) return res.status(400).json({ msg: "ids is required" });
+  if (ids.length > MAX_LOOKUP_IDS) {
+    return res.status(400).json({ msg: `At most ${MAX_LOOKUP_IDS} ids per request` });
+  }
+  sendCached(req, res, catalog.getCriteria(ids));
+});
+
+// One criterion by ID
+router.get("/items/:id", (req, res) => {
+  const criterion = catalog.getCriterion(req.params.id);
+  if (!criterion) return res.status(404).json({ msg: "Criterion not found" });
+  sendCached(req, res, criterion);
+});
+
+module.exports = router;
@@ -0,0 +1,28 @@
+const cluster = require("cluster");
+const express = require("express");
+const config = require("../config");
+const internalOnly = require("../middleware/internalOnly");
+const dbMetrics = require("../services/dbMetrics");
+const { renderPrometheus } = require("../services/requestMetrics");
+const router = express.Router();
+
+router.use(internalOnly);
+
+// Prometheus scrape endpoint for this server process
+router.get("/", (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.type("text/plain; version=0.0.4").send(renderPrometheus());
+});
+
+// MongoDB connection pool and command timings for this server process
+router.get("/db", (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.json({
+    pid: process.pid,
+    worker: cluster.isWorker ? cluster.worker.id : null,
+    timestamp: Date.now(),
+    ...dbMetrics.snapshot(config.mongoPool.maxPoolSize),
+  });
+});
+
+module.exports = router;
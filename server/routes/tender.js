@@ -1,38 +1,114 @@
+const crypto = require("crypto");
 const express = require("express");
-const jwt = require("jsonwebtoken");
+const mongoose = require("mongoose");
+const verifyToken = require("../middleware/auth");
 const Tender = require("../models/Tender");
+const withTransaction = require("../utils/withTransaction");
+const {
+  applyTender,
+  touchRollup,
+  getDataVersion,
+  getRollup,
+  rollupToAnalytics,
+  weekKey,
+  monthKey,
+} = require("../services/analyticsRollup");
+const { importTenders, exportTenders } = require("../services/tenderTransfer");
+const { FORMATS, renderTender } = require("../services/tenderRender");
+const { applyPatch, PatchError } = require("../utils/jsonPatch");
+const {
+  prepareContent,
+  acquireContent,
+  releaseContents,
+  hydrateTender,
+  hydrateTenders,
+} = require("../services/tenderContent");
 const router = express.Router();
 
-// Middleware to verify JWT token
-const verifyToken = (req, res, next) => {
-  const token = req.header("Authorization")?.replace("Bearer ", "");
-  if (!token) return res.status(401).json({ msg: "No token provided" });
+const DEFAULT_HISTORY_LIMIT = 20;
+const MAX_HISTORY_LIMIT = 100;
+const MAX_PATCH_OPS = 500;
+// Patches may only touch the selection; title and isDraft are plain fields
+const PATCHABLE_FIELDS = new Set(["categories", "categoriesOrder"]);
+const isPointer = (path) => typeof path === "string" && path.startsWith("/");
 
+// History cursors are opaque base64url-encoded (createdAt, _id) positions
+const encodeCursor = (tender) =>
+  Buffer.from(
+    JSON.stringify([tender.createdAt.toISOString(), String(tender._id)])
+  ).toString("base64url");
+
+const decodeCursor = (cursor) => {
   try {
-    const decoded = jwt.verify(token, process.env.JWT_SECRET);
-    req.user = decoded;
-    next();
+    const [createdAt, id] = JSON.parse(Buffer.from(cursor, "base64url").toString());
+    const position = { createdAt: new Date(createdAt), _id: new mongoose.Types.ObjectId(id) };
+    return isNaN(position.createdAt) ? null : position;
   } catch (err) {
-    res.status(401).json({ msg: "Invalid token" });
+    return null;
   }
 };
 
+// Strong ETag for a response computed from the user's tenders. It changes
+// with the rollup's dataVersion; the rollup _id covers a rollup deleted and
+// rebuilt from scratch, whose dataVersion starts over.
+const dataETag = (rollup, ...scope) =>
+  `"${crypto
+    .createHash("sha256")
+    .update(JSON.stringify([String(rollup._id), rollup.dataVersion || 0, ...scope]))
+    .digest("base64url")}"`;
+
+// Set the ETag and report whether the client's cached copy is still current.
+// no-cache lets browsers keep the response but revalidate it on every use.
+const isFresh = (req, res, etag) => {
+  res.set({ ETag: etag, "Cache-Control": "private, no-cache" });
+  return req.fresh;
+};
+
+// Tender versions travel as "<version>" ETags; If-Match also accepts W/ tags
+const parseVersion = (value) => {
+  if (value === undefined || value === null || value === "") return null;
+  const version = Number(String(value).replace(/^W\//, "").replace(/"/g, ""));
+  return Number.isInteger(version) && version >= 0 ? version : null;
+};
+
+// Tenders saved before versioning have no version field
+const versionFilter = (version) => (version === 0 ? { $in: [0, null] } : version);
+
+const loadTender = async (id, userId, session) => {
+  const tender = await hydrateTender(
+    await Tender.findOne({ _id: id, userId }).select("-__v").session(session || null).lean(),
+    { session }
+  );
+  if (tender) tender.version = tender.version || 0;
+  return tender;
+};
+
 // Save a tender to history
 router.post("/save", verifyToken, async (req, res) => {
   try {
     const { title, sector, categories, categoriesOrder, isDraft } = req.body;
     
+    // The selection is stored once per distinct content and referenced by hash
+    const content = prepareContent(categories, categoriesOrder);
     const tender = new Tender({
       userId: req.user.id,
       title: title || `Tender ${new Date().toLocaleDateString()}`,
       sector: sector || 'general',
-      categories,
-      categoriesOrder,
+      contentHash: content.hash,
       isDraft: isDraft || false
     });
+    const saved = {
+      ...tender.toObject(),
+      categories: content.categories,
+      categoriesOrder: content.categoriesOrder,
+    };
 
-    await tender.save();
-    res.json({ msg: "Tender saved successfully", tender });
+    await withTransaction(async (session) => {
+      await tender.save({ session });
+      await acquireContent(content, session);
+      await applyTender(saved, 1, session);
+    });
+    res.json({ msg: "Tender saved successfully", tender: saved });
   } catch (err) {
     console.error("Save tender error:", err);
     res.status(500).json({ msg: "Server error" });
@@ -42,109 +118,107 @@ router.post("/save", verifyToken, async (req, res) => {
 // Get analytics for user
 router.get("/analytics", verifyToken, async (req, res) => {
   try {
-    const userId = req.user.id;
+    // Counts come from the user's incrementally maintained rollup
+    const rollup = await getRollup(req.user.id);
+    // This week's and month's counts roll over with the calendar
     const now = new Date();
-    const startOfMonth = new Date(now.getFullYear(), now.getMonth(), 1);
-    const startOfWeek = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-    
-    // Total tenders
-    const totalTenders = await Tender.countDocuments({ userId });
-    
-    // Tenders this month
-    const tendersThisMonth = await Tender.countDocuments({
-      userId,
-      createdAt: { $gte: startOfMonth }
-    });
-    
-    // Tenders this week
-    const tendersThisWeek = await Tender.countDocuments({
-      userId,
-      createdAt: { $gte: startOfWeek }
-    });
-    
-    // Draft vs Finalized
-    const draftTenders = await Tender.countDocuments({ userId, isDraft: true });
-    const finalizedTenders = await Tender.countDocuments({ userId, isDraft: false });
-    
-    // Category-wise count
-    const tenders = await Tender.find({ userId }).select('categories');
-    const categoryCount = {};
-    
-    tenders.forEach(tender => {
-      if (tender.categories) {
-        for (const [categoryId, subcriteria] of tender.categories) {
-          if (!categoryCount[categoryId]) {
-            categoryCount[categoryId] = 0;
-          }
-          categoryCount[categoryId]++;
-        }
-      }
-    });
-    
-    // Sector-wise count
-    const sectorCount = await Tender.aggregate([
-      { $match: { userId: req.user.id } },
-      { $group: { _id: "$sector", count: { $sum: 1 } } }
-    ]);
-    
-    // Most frequently used categories
-    const mostUsedCategories = Object.entries(categoryCount)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 5)
-      .map(([categoryId, count]) => ({ categoryId, count }));
-    
-    // Most frequently used sectors
-    const mostUsedSectors = sectorCount
-      .sort((a, b) => b.count - a.count)
-      .slice(0, 5)
-      .map(item => ({ sector: item._id, count: item.count }));
-    
+    if (isFresh(req, res, dataETag(rollup, "analytics", weekKey(now), monthKey(now)))) {
+      return res.status(304).end();
+    }
+
     // Calculate average preparation time (mock for now - would need to track actual time)
     const averagePreparationTime = "2.5 hours"; // This would be calculated based on actual data
-    
-    res.json({
-      totalTenders,
-      tendersThisMonth,
-      tendersThisWeek,
-      draftTenders,
-      finalizedTenders,
-      categoryCount,
-      mostUsedCategories,
-      mostUsedSectors,
-      averagePreparationTime
-    });
+
+    res.json({ ...rollupToAnalytics(rollup), averagePreparationTime });
   } catch (err) {
     console.error("Analytics error:", err);
     res.status(500).json({ msg: "Server error" });
   }
 });
 
-// Get tender history for user
+// Get tender history for user, newest first, one page at a time.
+// Query: limit (1-100, default 20), cursor (from the previous page's
+// nextCursor) and view ("summary" omits the categories map).
 router.get("/history", verifyToken, async (req, res) => {
   try {
-    const tenders = await Tender.find({ userId: req.user.id })
-      .sort({ createdAt: -1 })
-      .select('-__v');
-    
-    res.json(tenders);
+    const limit = Math.min(
+      Math.max(parseInt(req.query.limit, 10) || DEFAULT_HISTORY_LIMIT, 1),
+      MAX_HISTORY_LIMIT
+    );
+
+    // The version is read before the page, so a write racing this request
+    // can only make the ETag older than the data, never newer
+    const version = await getDataVersion(req.user.id);
+    if (version && isFresh(req, res, dataETag(version, req.originalUrl))) {
+      return res.status(304).end();
+    }
+
+    const filter = { userId: req.user.id };
+    if (req.query.cursor) {
+      const position = decodeCursor(req.query.cursor);
+      if (!position) return res.status(400).json({ msg: "Invalid cursor" });
+      filter.$or = [
+        { createdAt: { $lt: position.createdAt } },
+        { createdAt: position.createdAt, _id: { $lt: position._id } },
+      ];
+    }
+
+    const summary = req.query.view === "summary";
+    const tenders = await Tender.find(filter)
+      .sort({ createdAt: -1, _id: -1 })
+      .limit(limit + 1)
+      .select(summary ? "-__v -categories" : "-__v")
+      .lean();
+
+    const hasMore = tenders.length > limit;
+    if (hasMore) tenders.pop();
+    await hydrateTenders(tenders, {
+      fields: summary ? "categoriesOrder" : "categories categoriesOrder",
+    });
+
+    res.json({
+      tenders,
+      nextCursor: hasMore ? encodeCursor(tenders[tenders.length - 1]) : null,
+    });
   } catch (err) {
     console.error("Get tender history error:", err);
     res.status(500).json({ msg: "Server error" });
   }
 });
 
+// Bulk import tenders from an NDJSON request body (one tender per line)
+router.post("/bulk", verifyToken, async (req, res) => {
+  try {
+    const summary = await importTenders(req.user.id, req);
+    res.json({ msg: "Bulk import finished", ...summary });
+  } catch (err) {
+    console.error("Bulk import error:", err);
+    res.status(500).json({ msg: "Server error" });
+  }
+});
+
+// Export all of the user's tenders as NDJSON, streamed from the database
+router.get("/export", verifyToken, async (req, res) => {
+  try {
+    await exportTenders(req.user.id, res);
+  } catch (err) {
+    console.error("Export error:", err);
+    if (res.headersSent) return res.destroy(err);
+    res.status(500).json({ msg: "Server error" });
+  }
+});
+
 // Get specific tender by ID
 router.get("/:id", verifyToken, async (req, res) => {
   try {
-    const tender = await Tender.findOne({ 
-      _id: req.params.id, 
-      userId: req.user.id 
-    });
+    const tender = await loadTender(req.params.id, req.user.id);
     
     if (!tender) {
       return res.status(404).json({ msg: "Tender not found" });
     }
     
+    // Express answers 304 itself when If-None-Match matches this ETag
+    res.set({ ETag: `"${tender.version}"`, "Cache-Control": "private, no-cache" });
     res.json(tender);
   } catch (err) {
     console.error("Get tender error:", err);
@@ -152,12 +226,165 @@ router.get("/:id", verifyToken, async (req, res) => {
   }
 });
 
+// Apply a JSON Patch to a tender's selection, e.g. a draft autosave.
+// Body: { version, ops, title?, isDraft? } where ops target /categories and
+// /categoriesOrder. version (or an If-Match header) is the version the client
+// last saw; if the tender has changed since, nothing is written and the 409
+// response carries the current tender to rebase onto.
+router.patch("/:id", verifyToken, async (req, res) => {
+  const { ops = [], title, isDraft } = req.body;
+  const expected = parseVersion(req.get("If-Match") ?? req.body.version);
+  if (expected === null) {
+    return res.status(428).json({ msg: "version or If-Match is required" });
+  }
+  if (!Array.isArray(ops) || ops.length > MAX_PATCH_OPS) {
+    return res.status(400).json({ msg: `ops must be an array of at most ${MAX_PATCH_OPS} operations` });
+  }
+  const malformed = ops.find(
+    (op) => !isPointer(op?.path) || (["move", "copy"].includes(op.op) && !isPointer(op.from))
+  );
+  if (malformed) {
+    return res.status(400).json({ msg: "Every operation needs a path (and from) starting with /" });
+  }
+  const outside = ops.find((op) => {
+    const fields = [op.path, op.from].filter((path) => typeof path === "string").map((path) => path.split("/")[1]);
+    return !fields.every((f) => PATCHABLE_FIELDS.has(f));
+  });
+  if (outside) {
+    return res.status(400).json({ msg: `Cannot patch ${outside.path}` });
+  }
+  if (title !== undefined && (typeof title !== "string" || !title.trim())) {
+    return res.status(400).json({ msg: "title must be a non-empty string" });
+  }
+  if (isDraft !== undefined && typeof isDraft !== "boolean") {
+    return res.status(400).json({ msg: "isDraft must be a boolean" });
+  }
+
+  try {
+    const current = await loadTender(req.params.id, req.user.id);
+    if (!current) {
+      return res.status(404).json({ msg: "Tender not found" });
+    }
+    if (current.version !== expected) {
+      return res.status(409).json({ msg: "Version conflict", tender: current });
+    }
+
+    let content;
+    try {
+      const patched = applyPatch(
+        structuredClone({
+          categories: current.categories || {},
+          categoriesOrder: current.categoriesOrder || [],
+        }),
+        ops
+      );
+      content = prepareContent(patched.categories, patched.categoriesOrder);
+    } catch (err) {
+      if (err instanceof PatchError || err.name === "ValidationError") {
+        return res.status(400).json({ msg: err.message });
+      }
+      throw err;
+    }
+
+    const update = { contentHash: content.hash, updatedAt: new Date() };
+    if (title !== undefined) update.title = title.trim();
+    if (isDraft !== undefined) update.isDraft = isDraft;
+
+    const tender = await withTransaction(async (session) => {
+      // Matching on version makes read-modify-write atomic: of two clients
+      // patching the same version, only the first one's write lands
+      const updated = await Tender.findOneAndUpdate(
+        { _id: current._id, userId: req.user.id, version: versionFilter(expected) },
+        {
+          $set: update,
+          $unset: { categories: "", categoriesOrder: "" },
+          $inc: { version: 1 },
+        },
+        { new: true, session, lean: true, projection: { __v: 0 } }
+      );
+      if (!updated) return null;
+
+      const next = {
+        ...updated,
+        categories: content.categories,
+        categoriesOrder: content.categoriesOrder,
+      };
+      if (content.hash !== current.contentHash) {
+        await acquireContent(content, session);
+        await releaseContents([current.contentHash], session);
+      }
+      if (content.hash !== current.contentHash || next.isDraft !== current.isDraft) {
+        await applyTender(current, -1, session);
+        await applyTender(next, 1, session);
+      } else {
+        await touchRollup(req.user.id, session);
+      }
+      return next;
+    });
+
+    if (!tender) {
+      return res.status(409).json({
+        msg: "Version conflict",
+        tender: await loadTender(req.params.id, req.user.id),
+      });
+    }
+    res.set("ETag", `"${tender.version}"`);
+    res.json({ msg: "Tender updated successfully", tender });
+  } catch (err) {
+    console.error("Patch tender error:", err);
+    res.status(500).json({ msg: "Server error" });
+  }
+});
+
+// Render a saved tender as a downloadable document
+router.get("/:id/render", verifyToken, async (req, res) => {
+  const format = req.query.format || "pdf";
+  if (!Object.hasOwn(FORMATS, format)) {
+    return res.status(400).json({ msg: `format must be one of ${Object.keys(FORMATS).join(", ")}` });
+  }
+
+  try {
+    const tender = await hydrateTender(
+      await Tender.findOne({ _id: req.params.id, userId: req.user.id })
+        .select("title sector contentHash categories categoriesOrder createdAt")
+        .lean()
+    );
+
+    if (!tender) {
+      return res.status(404).json({ msg: "Tender not found" });
+    }
+
+    const { body, key, contentType, cached } = await renderTender(tender, format);
+    const filename = `${(tender.title || "tender").replace(/[^\w.-]+/g, "_")}.${format}`;
+    res.set({
+      "Content-Type": contentType,
+      "Content-Disposition": `attachment; filename="${filename}"`,
+      "Cache-Control": "private, no-cache",
+      ETag: `"${key}"`,
+      "X-Render-Cache": cached ? "hit" : "miss",
+    });
+    res.send(body);
+  } catch (err) {
+    console.error("Render tender error:", err);
+    res.status(500).json({ msg: "Server error" });
+  }
+});
+
 // Delete tender
 router.delete("/:id", verifyToken, async (req, res) => {
   try {
-    const tender = await Tender.findOneAndDelete({
-      _id: req.params.id,
-      userId: req.user.id
+    const tender = await withTransaction(async (session) => {
+      const deleted = await Tender.findOneAndDelete(
+        { _id: req.params.id, userId: req.user.id },
+        { session, lean: true }
+      );
+      if (deleted) {
+        // The rollup needs the selection before its reference is released
+        await hydrateTender(deleted, { session });
+        await applyTender(deleted, -1, session);
+        await releaseContents([deleted.contentHash], session);
+      }
+      return deleted;
     });
     
     if (!tender) {
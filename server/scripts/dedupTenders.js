@@ -0,0 +1,20 @@
+// Move inline category selections into the shared TenderContent collection
+// and recount content references.
+// Usage: npm run dedup-tenders
+require("dotenv").config();
+const mongoose = require("mongoose");
+const { migrateInlineTenders } = require("../services/tenderContent");
+
+mongoose
+  .connect(process.env.MONGO_URI)
+  .then(() => migrateInlineTenders())
+  .then(({ migrated, contents, removed }) => {
+    console.log(
+      `Deduplicated ${migrated} tenders; ${contents} distinct selections stored, ${removed} unreferenced removed`
+    );
+    return mongoose.disconnect();
+  })
+  .catch((err) => {
+    console.error("Tender dedup error:", err);
+    process.exit(1);
+  });
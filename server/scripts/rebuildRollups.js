@@ -0,0 +1,17 @@
+// Recompute every user's analytics rollup from their tenders.
+// Usage: npm run rebuild-rollups
+require("dotenv").config();
+const mongoose = require("mongoose");
+const { rebuildAllRollups } = require("../services/analyticsRollup");
+
+mongoose
+  .connect(process.env.MONGO_URI)
+  .then(rebuildAllRollups)
+  .then((count) => {
+    console.log(`Rebuilt analytics rollups for ${count} users`);
+    return mongoose.disconnect();
+  })
+  .catch((err) => {
+    console.error("Rollup rebuild error:", err);
+    process.exit(1);
+  });
@@ -0,0 +1,22 @@
+// Create the indexes declared on the models and drop undeclared ones.
+// Usage: npm run sync-indexes
+require("dotenv").config();
+const mongoose = require("mongoose");
+require("../models/User");
+require("../models/Tender");
+require("../models/TenderRollup");
+require("../models/TenderContent");
+require("../models/Session");
+require("../models/RateLimitBucket");
+
+mongoose
+  .connect(process.env.MONGO_URI)
+  .then(() => mongoose.connection.syncIndexes())
+  .then((dropped) => {
+    console.log("Indexes synced", JSON.stringify(dropped));
+    return mongoose.disconnect();
+  })
+  .catch((err) => {
+    console.error("Index sync error:", err);
+    process.exit(1);
+  });
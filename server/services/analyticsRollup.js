@@ -0,0 +1,247 @@
+const mongoose = require("mongoose");
+const Tender = require("../models/Tender");
+const TenderRollup = require("../models/TenderRollup");
+const TenderContent = require("../models/TenderContent");
+
+// Map keys cannot contain "." or start with "$"
+const rollupKey = (key) => String(key).replace(/\./g, "_").replace(/^\$/, "_");
+
+const monthKey = (date) => new Date(date).toISOString().slice(0, 7);
+
+const weekKey = (date) => {
+  const d = new Date(date);
+  const monday = new Date(
+    Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), d.getUTCDate() - ((d.getUTCDay() + 6) % 7))
+  );
+  return monday.toISOString().slice(0, 10);
+};
+
+const categoryIds = (tender) => {
+  if (!tender.categories) return [];
+  return tender.categories instanceof Map
+    ? [...tender.categories.keys()]
+    : Object.keys(tender.categories);
+};
+
+// Add (sign = 1) or remove (sign = -1) tenders' contributions to one user's
+// rollup in a single update. A user without a rollup is left without one:
+// a delta alone would undercount their earlier tenders, so getRollup builds
+// it from a full recount on first read instead. Deltas reaching a rollup
+// mid-rebuild bump its dataVersion, which makes the rebuild recount.
+const applyTenders = (userId, tenders, sign, session) => {
+  const inc = {};
+  const add = (path) => {
+    inc[path] = (inc[path] || 0) + sign;
+  };
+  tenders.forEach((tender) => {
+    add("totalTenders");
+    add(tender.isDraft ? "draftTenders" : "finalizedTenders");
+    add(`sectors.${rollupKey(tender.sector)}`);
+    add(`weekly.${weekKey(tender.createdAt)}`);
+    add(`monthly.${monthKey(tender.createdAt)}`);
+    categoryIds(tender).forEach((categoryId) => add(`categories.${rollupKey(categoryId)}`));
+  });
+
+  return TenderRollup.updateOne(
+    { userId },
+    { $inc: { ...inc, dataVersion: 1 }, $set: { updatedAt: new Date() } },
+    { session }
+  );
+};
+
+const applyTender = (tender, sign, session) =>
+  applyTenders(tender.userId, [tender], sign, session);
+
+// Mark a user's tenders as changed without touching any counter, e.g. a
+// rename. Without a rollup no ETag has been handed out, so none is created.
+const touchRollup = (userId, session) =>
+  TenderRollup.updateOne(
+    { userId },
+    { $inc: { dataVersion: 1 }, $set: { updatedAt: new Date() } },
+    { session }
+  );
+
+// The rollup's _id and dataVersion, which change whenever any of the user's
+// tenders do; null until the rollup is first read
+const getDataVersion = (userId) =>
+  TenderRollup.findOne({ userId }).select("dataVersion").lean();
+
+const toCounts = (rows) => {
+  const counts = {};
+  rows.forEach(({ _id, count }) => {
+    if (_id !== null) counts[rollupKey(_id)] = count;
+  });
+  return counts;
+};
+
+// Recounts that lose the race with a write are retried this many times
+const MAX_REBUILD_ATTEMPTS = 5;
+
+// Count a user's tenders from scratch, in the shape the rollup stores
+const recountTenders = async (userId) => {
+  const countIf = (condition) => ({ $sum: { $cond: [condition, 1, 0] } });
+
+  const [result] = await Tender.aggregate([
+    { $match: { userId } },
+    {
+      $facet: {
+        totals: [
+          {
+            $group: {
+              _id: null,
+              totalTenders: { $sum: 1 },
+              draftTenders: countIf({ $eq: ["$isDraft", true] }),
+              finalizedTenders: countIf({ $ne: ["$isDraft", true] }),
+            },
+          },
+        ],
+        categories: [
+          // Selections live in TenderContent, except on not yet migrated tenders
+          {
+            $lookup: {
+              from: TenderContent.collection.name,
+              localField: "contentHash",
+              foreignField: "_id",
+              as: "content",
+            },
+          },
+          {
+            $project: {
+              categoryId: {
+                $map: {
+                  input: {
+                    $objectToArray: {
+                      $ifNull: ["$categories", { $ifNull: [{ $first: "$content.categories" }, {}] }],
+                    },
+                  },
+                  in: "$$this.k",
+                },
+              },
+            },
+          },
+          { $unwind: "$categoryId" },
+          { $group: { _id: "$categoryId", count: { $sum: 1 } } },
+        ],
+        sectors: [{ $group: { _id: "$sector", count: { $sum: 1 } } }],
+        weekly: [
+          {
+            $group: {
+              _id: {
+                $dateToString: {
+                  format: "%Y-%m-%d",
+                  date: { $dateTrunc: { date: "$createdAt", unit: "week", startOfWeek: "monday" } },
+                },
+              },
+              count: { $sum: 1 },
+            },
+          },
+        ],
+        monthly: [
+          {
+            $group: {
+              _id: { $dateToString: { format: "%Y-%m", date: "$createdAt" } },
+              count: { $sum: 1 },
+            },
+          },
+        ],
+      },
+    },
+  ]);
+
+  const totals = result.totals[0] || {};
+  return {
+    totalTenders: totals.totalTenders || 0,
+    draftTenders: totals.draftTenders || 0,
+    finalizedTenders: totals.finalizedTenders || 0,
+    categories: toCounts(result.categories),
+    sectors: toCounts(result.sectors),
+    weekly: toCounts(result.weekly),
+    monthly: toCounts(result.monthly),
+  };
+};
+
+// Recompute a user's rollup from their tenders and replace the stored one.
+// The rollup exists before the recount starts, so a write committing during
+// the recount bumps its dataVersion; the counts are then only stored if the
+// version is unchanged, and recounted otherwise.
+const rebuildRollup = async (userId) => {
+  userId = new mongoose.Types.ObjectId(userId);
+
+  for (let attempt = 1; attempt <= MAX_REBUILD_ATTEMPTS; attempt++) {
+    const { dataVersion } = await TenderRollup.findOneAndUpdate(
+      { userId },
+      { $setOnInsert: { dataVersion: 0 } },
+      { upsert: true, new: true }
+    )
+      .select("dataVersion")
+      .lean();
+
+    const counts = await recountTenders(userId);
+    const now = new Date();
+    const rollup = await TenderRollup.findOneAndUpdate(
+      { userId, dataVersion },
+      { $set: { ...counts, rebuiltAt: now, updatedAt: now }, $inc: { dataVersion: 1 } },
+      { new: true }
+    );
+    if (rollup) return rollup;
+  }
+  throw new Error(`Rollup rebuild for ${userId} kept racing tender writes`);
+};
+
+// Rebuild every user's rollup, e.g. after a deploy or to repair drift
+const rebuildAllRollups = async () => {
+  const userIds = await Tender.distinct("userId");
+  for (const userId of userIds) {
+    await rebuildRollup(userId);
+  }
+  // Users whose tenders were all deleted keep a stale rollup otherwise
+  await TenderRollup.deleteMany({ userId: { $nin: userIds } });
+  return userIds.length;
+};
+
+const topEntries = (counts, key) =>
+  Object.entries(counts)
+    .filter(([, count]) => count > 0)
+    .sort((a, b) => b[1] - a[1])
+    .slice(0, 5)
+    .map(([id, count]) => ({ [key]: id, count }));
+
+// Read a user's rollup, building it on first access. A rollup never rebuilt
+// is an unfinished one whose counts hold only the deltas since it was created.
+const getRollup = async (userId) => {
+  const rollup = await TenderRollup.findOne({ userId }).lean();
+  if (rollup?.rebuiltAt) return rollup;
+  return (await rebuildRollup(userId)).toObject({ flattenMaps: true });
+};
+
+// Shape a rollup as the /analytics response
+const rollupToAnalytics = (rollup, now = new Date()) => {
+  const categoryCount = Object.fromEntries(
+    Object.entries(rollup.categories || {}).filter(([, count]) => count > 0)
+  );
+  const sectorCount = Object.fromEntries(Object.entries(rollup.sectors || {}));
+
+  return {
+    totalTenders: rollup.totalTenders || 0,
+    tendersThisMonth: (rollup.monthly || {})[monthKey(now)] || 0,
+    tendersThisWeek: (rollup.weekly || {})[weekKey(now)] || 0,
+    draftTenders: rollup.draftTenders || 0,
+    finalizedTenders: rollup.finalizedTenders || 0,
+    categoryCount,
+    mostUsedCategories: topEntries(categoryCount, "categoryId"),
+    mostUsedSectors: topEntries(sectorCount, "sector"),
+  };
+};
+
+module.exports = {
+  applyTender,
+  applyTenders,
+  touchRollup,
+  getDataVersion,
+  rebuildRollup,
+  rebuildAllRollups,
+  getRollup,
+  rollupToAnalytics,
+  weekKey,
+  monthKey,
+};
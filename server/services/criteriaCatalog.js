@@ -0,0 +1,74 @@
+const crypto = require("crypto");
+const { criteriaData, sectors } = require("../data/criteriaData");
+
+// Build the ID index once at startup; a duplicate ID would make lookups
+// ambiguous, so refuse to start with one
+const buildIndex = () => {
+  const index = new Map();
+  Object.entries(criteriaData).forEach(([sector, criteria]) => {
+    criteria.forEach((criterion) => {
+      if (index.has(criterion.id)) {
+        throw new Error(`Duplicate criterion ID ${criterion.id} in ${sector} and ${index.get(criterion.id).sector}`);
+      }
+      index.set(criterion.id, { ...criterion, sector });
+    });
+  });
+  return index;
+};
+
+const criteriaById = buildIndex();
+
+// The catalog only changes on deploy, so one content hash versions every response
+const version = crypto
+  .createHash("sha1")
+  .update(JSON.stringify({ criteriaData, sectors }))
+  .digest("hex")
+  .slice(0, 16);
+
+const etag = `"${version}"`;
+
+// Serialize the fixed responses once rather than per request
+const manifestBody = Buffer.from(
+  JSON.stringify({
+    version,
+    sectors: sectors.map((sector) => ({
+      ...sector,
+      criteriaCount: (criteriaData[sector.id] || []).length,
+    })),
+  })
+);
+
+const sectorBodies = new Map(
+  Object.entries(criteriaData).map(([sector, criteria]) => [
+    sector,
+    Buffer.from(JSON.stringify({ version, sector, criteria })),
+  ])
+);
+
+const sectorsById = new Map(sectors.map((sector) => [sector.id, sector]));
+
+const getCriterion = (id) => criteriaById.get(id) || null;
+
+const getSector = (id) => sectorsById.get(id) || null;
+
+// Resolve a list of IDs to { criteria: {id: criterion}, missing: [ids] }
+const getCriteria = (ids) => {
+  const criteria = {};
+  const missing = [];
+  ids.forEach((id) => {
+    const criterion = criteriaById.get(id);
+    if (criterion) criteria[id] = criterion;
+    else missing.push(id);
+  });
+  return { version, criteria, missing };
+};
+
+module.exports = {
+  version,
+  etag,
+  manifestBody,
+  sectorBodies,
+  getCriterion,
+  getCriteria,
+  getSector,
+};
@@ -0,0 +1,94 @@
+const Histogram = require("../utils/histogram");
+
+// Connection pool gauges and counters, kept from the driver's connection
+// pool (CMAP) events. Totals cover every server the client talks to.
+const pool = {
+  open: 0,
+  checkedOut: 0,
+  waitQueue: 0,
+  created: 0,
+  closed: 0,
+  checkOutFailed: 0,
+  cleared: 0,
+};
+// Time from asking for a connection to getting one
+const checkoutWaitMs = new Histogram();
+// Command monitoring: latency and failures per command name (find, aggregate, ...)
+const commands = new Map();
+
+// Checkout start times; a pool hands out connections in request order, so
+// each checkout completes the oldest pending request
+const waitStarts = [];
+
+const commandStats = (name) => {
+  if (!commands.has(name)) commands.set(name, { failed: 0, latencyMs: new Histogram() });
+  return commands.get(name);
+};
+
+const endWait = () => {
+  pool.waitQueue = Math.max(0, pool.waitQueue - 1);
+  const started = waitStarts.shift();
+  return started === undefined ? null : performance.now() - started;
+};
+
+// Subscribe to a MongoClient's pool and command events
+const instrumentClient = (client) => {
+  client.on("connectionCreated", () => {
+    pool.open++;
+    pool.created++;
+  });
+  client.on("connectionClosed", () => {
+    pool.open = Math.max(0, pool.open - 1);
+    pool.closed++;
+  });
+  client.on("connectionCheckOutStarted", () => {
+    pool.waitQueue++;
+    waitStarts.push(performance.now());
+  });
+  client.on("connectionCheckedOut", () => {
+    pool.checkedOut++;
+    const waited = endWait();
+    if (waited !== null) checkoutWaitMs.observe(waited);
+  });
+  client.on("connectionCheckOutFailed", () => {
+    pool.checkOutFailed++;
+    endWait();
+  });
+  client.on("connectionCheckedIn", () => {
+    pool.checkedOut = Math.max(0, pool.checkedOut - 1);
+  });
+  client.on("connectionPoolCleared", () => {
+    pool.cleared++;
+  });
+  // Only emitted when the client was created with monitorCommands
+  client.on("commandSucceeded", (event) => {
+    commandStats(event.commandName).latencyMs.observe(event.duration);
+  });
+  client.on("commandFailed", (event) => {
+    const stats = commandStats(event.commandName);
+    stats.failed++;
+    stats.latencyMs.observe(event.duration);
+  });
+};
+
+// Instrument a mongoose connection's client. Called right after connect(),
+// the client usually exists already and every pooled connection is seen;
+// otherwise subscribe once the connection is up.
+const instrumentConnection = (connection) => {
+  const client = connection.getClient();
+  if (client) return instrumentClient(client);
+  connection.once("connected", () => instrumentClient(connection.getClient()));
+};
+
+// Point-in-time view for the metrics endpoint
+const snapshot = (maxPoolSize) => ({
+  pool: {
+    ...pool,
+    maxPoolSize,
+    available: Math.max(0, pool.open - pool.checkedOut),
+    checkoutWaitMs,
+  },
+  commands: Object.fromEntries(commands),
+});
+
+module.exports = { instrumentConnection, snapshot, pool, checkoutWaitMs, commands };
@@ -0,0 +1,94 @@
+const Histogram = require("../utils/histogram");
+const { LATENCY_BUCKETS_MS } = require("../utils/histogram");
+const { pool, commands } = require("./dbMetrics");
+
+// Response body sizes in bytes, as sent (after compression)
+const SIZE_BUCKETS = [100, 1000, 10000, 100000, 1000000, 10000000];
+
+// Per method and templated route: requests per status class, latency and size
+const routes = new Map();
+
+const recordRequest = (method, route, status, durationMs, bytes) => {
+  const key = `${method} ${route}`;
+  let stats = routes.get(key);
+  if (!stats) {
+    stats = {
+      method,
+      route,
+      statuses: {},
+      latencyMs: new Histogram(LATENCY_BUCKETS_MS),
+      sizeBytes: new Histogram(SIZE_BUCKETS),
+    };
+    routes.set(key, stats);
+  }
+  const statusClass = `${Math.floor(status / 100)}xx`;
+  stats.statuses[statusClass] = (stats.statuses[statusClass] || 0) + 1;
+  stats.latencyMs.observe(durationMs);
+  stats.sizeBytes.observe(bytes);
+};
+
+const escapeLabel = (value) =>
+  String(value).replace(/\\/g, "\\\\").replace(/"/g, '\\"').replace(/\n/g, "\\n");
+
+const labelString = (labels) =>
+  `{${Object.entries(labels)
+    .map(([name, value]) => `${name}="${escapeLabel(value)}"`)
+    .join(",")}}`;
+
+// Prometheus histogram lines; scale converts stored units (e.g. ms to s)
+const histogramLines = (name, labels, histogram, scale = 1) => {
+  const lines = histogram
+    .cumulative()
+    .map(([bound, count]) => `${name}_bucket${labelString({ ...labels, le: bound * scale })} ${count}`);
+  lines.push(`${name}_bucket${labelString({ ...labels, le: "+Inf" })} ${histogram.count}`);
+  lines.push(`${name}_sum${labelString(labels)} ${histogram.sum * scale}`);
+  lines.push(`${name}_count${labelString(labels)} ${histogram.count}`);
+  return lines;
+};
+
+const header = (name, type, help) => [`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`];
+
+// Prometheus text exposition of this process's metrics. Everything is built
+// at scrape time, so requests only pay for a few counter updates.
+const renderPrometheus = () => {
+  const lines = [];
+  const all = [...routes.values()];
+
+  lines.push(...header("http_requests_total", "counter", "HTTP requests by templated route and status class"));
+  all.forEach(({ method, route, statuses }) => {
+    Object.entries(statuses).forEach(([status, count]) => {
+      lines.push(`http_requests_total${labelString({ method, route, status })} ${count}`);
+    });
+  });
+
+  lines.push(...header("http_request_duration_seconds", "histogram", "HTTP request latency by templated route"));
+  all.forEach(({ method, route, latencyMs }) => {
+    lines.push(...histogramLines("http_request_duration_seconds", { method, route }, latencyMs, 0.001));
+  });
+
+  lines.push(...header("http_response_size_bytes", "histogram", "HTTP response body size by templated route"));
+  all.forEach(({ method, route, sizeBytes }) => {
+    lines.push(...histogramLines("http_response_size_bytes", { method, route }, sizeBytes));
+  });
+
+  [
+    ["mongodb_pool_open_connections", pool.open, "Open pooled MongoDB connections"],
+    ["mongodb_pool_checked_out_connections", pool.checkedOut, "Pooled connections in use"],
+    ["mongodb_pool_wait_queue", pool.waitQueue, "Operations waiting for a pooled connection"],
+  ].forEach(([name, value, help]) => lines.push(...header(name, "gauge", help), `${name} ${value}`));
+
+  lines.push(...header("mongodb_command_duration_seconds", "histogram", "MongoDB command latency by command name"));
+  commands.forEach(({ latencyMs }, command) => {
+    lines.push(...histogramLines("mongodb_command_duration_seconds", { command }, latencyMs, 0.001));
+  });
+
+  lines.push(
+    ...header("process_resident_memory_bytes", "gauge", "Resident memory size in bytes"),
+    `process_resident_memory_bytes ${process.memoryUsage.rss()}`,
+    ...header("process_uptime_seconds", "gauge", "Seconds since the process started"),
+    `process_uptime_seconds ${process.uptime()}`
+  );
+  return `${lines.join("\n")}\n`;
+};
+
+module.exports = { recordRequest, renderPrometheus, routes };
@@ -0,0 +1,187 @@
+const crypto = require("crypto");
+const Tender = require("../models/Tender");
+const TenderContent = require("../models/TenderContent");
+
+const DUPLICATE_KEY = 11000;
+
+const toObject = (categories) =>
+  categories instanceof Map ? Object.fromEntries(categories) : categories || {};
+
+// Category keys are sorted because map order carries no meaning; the order of
+// categoriesOrder and of each sub-criteria list is what the user arranged
+const canonicalContent = (categories, categoriesOrder) => {
+  const entries = Object.entries(toObject(categories))
+    .map(([id, subs]) => [id, (subs || []).map(String)])
+    .sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0));
+  return {
+    categories: Object.fromEntries(entries),
+    categoriesOrder: (categoriesOrder || []).map(String),
+  };
+};
+
+const contentHash = ({ categories, categoriesOrder }) =>
+  crypto
+    .createHash("sha256")
+    .update(JSON.stringify([Object.entries(categories), categoriesOrder]))
+    .digest("base64url");
+
+// Canonicalize and validate a selection; throws a ValidationError like a
+// Tender save would. Returns { hash, categories, categoriesOrder }.
+const prepareContent = (categories, categoriesOrder) => {
+  const error = new TenderContent({ categories, categoriesOrder }).validateSync();
+  if (error) throw error;
+  const content = canonicalContent(categories, categoriesOrder);
+  return { hash: contentHash(content), ...content };
+};
+
+// Add one reference per entry in contents ({ hash, categories,
+// categoriesOrder }), creating the contents not stored yet
+const acquireContents = async (contents, session) => {
+  const byHash = new Map();
+  contents.forEach((content) => {
+    const entry = byHash.get(content.hash) || { ...content, count: 0 };
+    entry.count++;
+    byHash.set(content.hash, entry);
+  });
+  if (byHash.size === 0) return;
+  const ops = [...byHash.values()].map(({ hash, categories, categoriesOrder, count }) => ({
+    updateOne: {
+      filter: { _id: hash },
+      update: {
+        $setOnInsert: { categories, categoriesOrder, createdAt: new Date() },
+        $inc: { refCount: count },
+      },
+      upsert: true,
+    },
+  }));
+  try {
+    await TenderContent.bulkWrite(ops, { ordered: false, session });
+  } catch (err) {
+    // Two first-time saves of one selection can race on the upsert; the
+    // loser's retry finds the winner's document and just increments it
+    const raced = err.writeErrors?.filter((e) => e.code === DUPLICATE_KEY) || [];
+    if (raced.length === 0 || raced.length !== err.writeErrors.length) throw err;
+    await TenderContent.bulkWrite(
+      raced.map((e) => ops[e.index]),
+      { ordered: false, session }
+    );
+  }
+};
+
+const acquireContent = (content, session) => acquireContents([content], session);
+
+// Drop one reference per hash occurrence and delete contents nothing uses
+const releaseContents = async (hashes, session) => {
+  const counts = {};
+  hashes.filter(Boolean).forEach((hash) => {
+    counts[hash] = (counts[hash] || 0) + 1;
+  });
+  const ids = Object.keys(counts);
+  if (ids.length === 0) return;
+  await TenderContent.bulkWrite(
+    ids.map((id) => ({
+      updateOne: { filter: { _id: id }, update: { $inc: { refCount: -counts[id] } } },
+    })),
+    { session }
+  );
+  await TenderContent.deleteMany({ _id: { $in: ids }, refCount: { $lte: 0 } }, { session });
+};
+
+// Attach categories/categoriesOrder to lean tenders that reference a content.
+// fields limits what is attached, e.g. "categoriesOrder" for summaries.
+const hydrateTenders = async (tenders, { fields = "categories categoriesOrder", session } = {}) => {
+  const hashes = [...new Set(tenders.map((t) => t.contentHash).filter(Boolean))];
+  if (hashes.length === 0) return tenders;
+  const contents = await TenderContent.find({ _id: { $in: hashes } })
+    .select(fields)
+    .session(session || null)
+    .lean();
+  const byHash = new Map(contents.map((c) => [c._id, c]));
+  tenders.forEach((tender) => {
+    const content = byHash.get(tender.contentHash);
+    if (!content) return;
+    fields.split(" ").forEach((field) => {
+      if (content[field] !== undefined) tender[field] = content[field];
+    });
+  });
+  return tenders;
+};
+
+const hydrateTender = async (tender, options) =>
+  tender ? (await hydrateTenders([tender], options))[0] : tender;
+
+// Reset every refCount from the tenders that actually reference it and drop
+// unreferenced contents, e.g. after an interrupted migration
+const recountReferences = async () => {
+  const counts = await Tender.aggregate([
+    { $match: { contentHash: { $type: "string" } } },
+    { $group: { _id: "$contentHash", count: { $sum: 1 } } },
+  ]);
+  if (counts.length > 0) {
+    await TenderContent.bulkWrite(
+      counts.map(({ _id, count }) => ({
+        updateOne: { filter: { _id }, update: { $set: { refCount: count } } },
+      })),
+      { ordered: false }
+    );
+  }
+  const removed = await TenderContent.deleteMany({ _id: { $nin: counts.map((c) => c._id) } });
+  return { contents: counts.length, removed: removed.deletedCount };
+};
+
+// Move the inline selections of tenders saved before deduplication into
+// TenderContent, then recount every reference
+const migrateInlineTenders = async (batchSize = 1000) => {
+  const cursor = Tender.find({ contentHash: { $exists: false }, categories: { $exists: true } })
+    .select("categories categoriesOrder")
+    .lean()
+    .cursor({ batchSize });
+
+  let migrated = 0;
+  let batch = [];
+  const flush = async () => {
+    if (batch.length === 0) return;
+    const contents = batch.map((tender) => {
+      const content = canonicalContent(tender.categories, tender.categoriesOrder);
+      return { hash: contentHash(content), ...content };
+    });
+    await acquireContents(contents);
+    await Tender.bulkWrite(
+      batch.map((tender, i) => ({
+        updateOne: {
+          filter: { _id: tender._id },
+          update: {
+            $set: { contentHash: contents[i].hash },
+            $unset: { categories: "", categoriesOrder: "" },
+          },
+        },
+      })),
+      { ordered: false }
+    );
+    migrated += batch.length;
+    batch = [];
+  };
+
+  for await (const tender of cursor) {
+    batch.push(tender);
+    if (batch.length >= batchSize) await flush();
+  }
+  await flush();
+
+  // A run interrupted between the two writes above leaves refCounts too high
+  const { contents, removed } = await recountReferences();
+  return { migrated, contents, removed };
+};
+
+module.exports = {
+  prepareContent,
+  contentHash,
+  canonicalContent,
+  acquireContent,
+  acquireContents,
+  releaseContents,
+  hydrateTender,
+  hydrateTenders,
+  recountReferences,
+  migrateInlineTenders,
+};
@@ -0,0 +1,170 @@
+const crypto = require("crypto");
+const { jsPDF } = require("jspdf");
+const { Document, Packer, Paragraph, HeadingLevel } = require("docx");
+const XLSX = require("xlsx");
+const config = require("../config");
+const catalog = require("./criteriaCatalog");
+const LRUCache = require("../utils/lruCache");
+const { canonicalContent, contentHash } = require("./tenderContent");
+
+// Bump when a template below changes so cached documents are re-rendered
+const TEMPLATE_VERSION = 2;
+
+const renderCache = new LRUCache(config.renderCacheSize);
+// Renders in progress, so concurrent requests for the same document share one
+const inFlight = new Map();
+
+// The "Generated on" date printed in every format, fixed at the tender's
+// creation so repeated renders of one tender stay identical
+const generatedOn = (tender) =>
+  new Date(tender.createdAt || Date.now()).toLocaleDateString("en-US", { timeZone: "UTC" });
+
+// Reduce a tender to exactly what the templates print: its title, date,
+// sector and the selected sub-criteria of each category in order
+const renderContent = (tender) => {
+  const { categories, categoriesOrder } = canonicalContent(tender.categories, tender.categoriesOrder);
+  const order = categoriesOrder.length ? categoriesOrder : Object.keys(categories);
+  return {
+    title: tender.title || "Tender Document",
+    generatedOn: generatedOn(tender),
+    sector: tender.sector || "general",
+    sections: order.map((id) => [id, (categories[id] || []).map(Number)]),
+  };
+};
+
+// Identical selections share a content hash, so it keys the cache together
+// with the printed title and date; tenders saved before deduplication hash
+// their inline selection
+const renderKey = (tender, format) =>
+  crypto
+    .createHash("sha256")
+    .update(
+      JSON.stringify([
+        TEMPLATE_VERSION,
+        catalog.version,
+        format,
+        tender.title || "Tender Document",
+        generatedOn(tender),
+        tender.sector || "general",
+        tender.contentHash || contentHash(canonicalContent(tender.categories, tender.categoriesOrder)),
+      ])
+    )
+    .digest("base64url");
+
+// Resolve section IDs and sub-criterion indexes to catalog entries
+const resolveSections = (content) =>
+  content.sections
+    .map(([id, subIndexes]) => {
+      const cat = catalog.getCriterion(id);
+      if (!cat) return null;
+      return { title: cat.title, subs: subIndexes.map((i) => cat.sub[i]).filter(Boolean) };
+    })
+    .filter(Boolean);
+
+const sectorName = (content) => catalog.getSector(content.sector)?.name || "General";
+
+const renderPDF = (content) => {
+  const doc = new jsPDF();
+  const pageBottom = doc.internal.pageSize.getHeight() - 15;
+  let y = 20;
+  const line = (text, x, size, step) => {
+    doc.setFontSize(size);
+    doc.splitTextToSize(text, 190 - x).forEach((part) => {
+      if (y > pageBottom) {
+        doc.addPage();
+        y = 20;
+      }
+      doc.text(part, x, y);
+      y += step;
+    });
+  };
+
+  line(content.title, 20, 16, 10);
+  line(`Sector: ${sectorName(content)}`, 20, 12, 10);
+  line(`Generated on: ${content.generatedOn}`, 20, 12, 15);
+  resolveSections(content).forEach((section) => {
+    line(section.title, 20, 14, 10);
+    section.subs.forEach((sub) => {
+      line(sub.label, 25, 12, 7);
+      line(`Info: ${sub.description}`, 25, 12, 7);
+      y += 3;
+    });
+    y += 5;
+  });
+  return Buffer.from(doc.output("arraybuffer"));
+};
+
+const renderDOCX = (content) => {
+  const doc = new Document({
+    sections: [
+      {
+        children: [
+          new Paragraph({ text: content.title, heading: HeadingLevel.TITLE }),
+          new Paragraph({ text: `Generated on: ${content.generatedOn}` }),
+          new Paragraph({ text: `Sector: ${sectorName(content)}` }),
+          ...resolveSections(content).flatMap((section) => [
+            new Paragraph({ text: section.title, heading: HeadingLevel.HEADING_1 }),
+            ...section.subs.flatMap((sub) => [
+              new Paragraph({ text: sub.label, bullet: { level: 0 } }),
+              new Paragraph({ text: sub.description }),
+            ]),
+          ]),
+        ],
+      },
+    ],
+  });
+  return Packer.toBuffer(doc);
+};
+
+const renderXLSX = (content) => {
+  const rows = [
+    [content.title],
+    [`Generated on: ${content.generatedOn}`],
+    [`Sector: ${sectorName(content)}`],
+    [],
+    ["Category", "Subcriteria", "Description"],
+  ];
+  resolveSections(content).forEach((section) => {
+    section.subs.forEach((sub) => rows.push([section.title, sub.label, sub.description]));
+  });
+  const workbook = XLSX.utils.book_new();
+  XLSX.utils.book_append_sheet(workbook, XLSX.utils.aoa_to_sheet(rows), "Tender");
+  return XLSX.write(workbook, { bookType: "xlsx", type: "buffer" });
+};
+
+const FORMATS = {
+  pdf: { contentType: "application/pdf", render: renderPDF },
+  docx: {
+    contentType: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    render: renderDOCX,
+  },
+  xlsx: {
+    contentType: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    render: renderXLSX,
+  },
+};
+
+// Render a tender, reusing any earlier render of identical content.
+// Resolves to { body, key, contentType, cached }.
+const renderTender = async (tender, format) => {
+  const { contentType, render } = FORMATS[format];
+  const key = renderKey(tender, format);
+
+  const cached = renderCache.get(key);
+  if (cached) return { body: cached, key, contentType, cached: true };
+
+  if (!inFlight.has(key)) {
+    const rendering = Promise.resolve()
+      .then(() => render(renderContent(tender)))
+      .then((body) => {
+        renderCache.set(key, body);
+        return body;
+      })
+      .finally(() => inFlight.delete(key));
+    inFlight.set(key, rendering);
+  }
+  const body = await inFlight.get(key);
+  return { body, key, contentType, cached: false };
+};
+
+module.exports = { FORMATS, renderTender, renderCache };
@@ -0,0 +1,152 @@
+const readline = require("readline");
+const Tender = require("../models/Tender");
+const { applyTenders } = require("./analyticsRollup");
+const { prepareContent, acquireContents, hydrateTenders } = require("./tenderContent");
+
+const BULK_BATCH_SIZE = 1000;
+const EXPORT_BATCH_SIZE = 500;
+const MAX_REPORTED_ERRORS = 50;
+
+// Build a Tender and its content from one imported record, applying the same
+// defaults as /save. Imported createdAt/updatedAt are kept so migrated
+// libraries retain their history. Throws a ValidationError for bad records.
+const toTender = (userId, record) => {
+  const content = prepareContent(record.categories, record.categoriesOrder);
+  const doc = {
+    userId,
+    title: record.title || `Tender ${new Date().toLocaleDateString()}`,
+    sector: record.sector || "general",
+    contentHash: content.hash,
+    isDraft: record.isDraft || false,
+  };
+  if (record.createdAt && !isNaN(new Date(record.createdAt))) {
+    doc.createdAt = new Date(record.createdAt);
+    doc.updatedAt = new Date(record.updatedAt || record.createdAt);
+  }
+  const tender = new Tender(doc);
+  const error = tender.validateSync();
+  if (error) throw error;
+  return { tender: tender.toObject(), content };
+};
+
+// Insert one batch unordered; returns the entries that were actually written
+const insertBatch = async (batch) => {
+  try {
+    // Documents were validated while parsing, so skip Mongoose's second pass
+    await Tender.insertMany(
+      batch.map(({ tender }) => tender),
+      { ordered: false, lean: true }
+    );
+    return { inserted: batch, writeErrors: [] };
+  } catch (err) {
+    if (!err.writeErrors) throw err;
+    const failed = new Set(err.writeErrors.map((e) => e.index));
+    return {
+      inserted: batch.filter((_, index) => !failed.has(index)),
+      writeErrors: err.writeErrors,
+    };
+  }
+};
+
+// Read NDJSON tenders from a stream and insert them in batches
+const importTenders = async (userId, input) => {
+  const summary = { inserted: 0, failed: 0, errors: [] };
+  const reportError = (line, msg) => {
+    summary.failed++;
+    if (summary.errors.length < MAX_REPORTED_ERRORS) summary.errors.push({ line, msg });
+  };
+
+  let batch = [];
+  let batchLines = [];
+  const flush = async () => {
+    if (batch.length === 0) return;
+    const { inserted, writeErrors } = await insertBatch(batch);
+    writeErrors.forEach((e) => reportError(batchLines[e.index], e.errmsg || "Write error"));
+    if (inserted.length > 0) {
+      await acquireContents(inserted.map(({ content }) => content));
+      await applyTenders(
+        userId,
+        inserted.map(({ tender, content }) => ({ ...tender, categories: content.categories })),
+        1
+      );
+      summary.inserted += inserted.length;
+    }
+    batch = [];
+    batchLines = [];
+  };
+
+  const lines = readline.createInterface({ input, crlfDelay: Infinity });
+  let lineNumber = 0;
+  for await (const line of lines) {
+    lineNumber++;
+    if (!line.trim()) continue;
+
+    let record;
+    try {
+      record = JSON.parse(line);
+    } catch (err) {
+      reportError(lineNumber, "Invalid JSON");
+      continue;
+    }
+    let entry;
+    try {
+      entry = toTender(userId, record);
+    } catch (err) {
+      reportError(lineNumber, err.message);
+      continue;
+    }
+
+    batch.push(entry);
+    batchLines.push(lineNumber);
+    if (batch.length >= BULK_BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  return summary;
+};
+
+// Resolve once res can take more data or the client has gone away
+const waitForDrain = (res) =>
+  new Promise((resolve) => {
+    const done = () => {
+      res.off("drain", done);
+      res.off("close", done);
+      resolve();
+    };
+    res.on("drain", done);
+    res.on("close", done);
+  });
+
+// Stream a user's tenders to res as NDJSON straight from a Mongo cursor,
+// resolving content references one batch at a time
+const exportTenders = async (userId, res) => {
+  const cursor = Tender.find({ userId })
+    .sort({ createdAt: -1, _id: -1 })
+    .select("-__v")
+    .lean()
+    .cursor();
+  res.on("close", () => cursor.close().catch(() => {}));
+
+  res.setHeader("Content-Type", "application/x-ndjson");
+  const writeBatch = async (batch) => {
+    await hydrateTenders(batch);
+    for (const tender of batch) {
+      if (res.destroyed) return;
+      if (!res.write(JSON.stringify(tender) + "\n")) await waitForDrain(res);
+    }
+  };
+
+  let batch = [];
+  for await (const tender of cursor) {
+    if (res.destroyed) break;
+    batch.push(tender);
+    if (batch.length >= EXPORT_BATCH_SIZE) {
+      await writeBatch(batch);
+      batch = [];
+    }
+  }
+  await writeBatch(batch);
+  res.end();
+};
+
+module.exports = { importTenders, exportTenders };
@@ -0,0 +1,59 @@
+// Default bucket upper bounds for latencies in milliseconds
+const LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+// Fixed-bucket histogram, cheap enough to update on every request or query.
+// Bucket i counts values <= bounds[i]; the last bucket counts the rest.
+class Histogram {
+  constructor(bounds = LATENCY_BUCKETS_MS) {
+    this.bounds = bounds;
+    this.counts = new Array(bounds.length + 1).fill(0);
+    this.count = 0;
+    this.sum = 0;
+    this.max = 0;
+  }
+
+  observe(value) {
+    let i = 0;
+    while (i < this.bounds.length && value > this.bounds[i]) i++;
+    this.counts[i]++;
+    this.count++;
+    this.sum += value;
+    if (value > this.max) this.max = value;
+  }
+
+  // Upper bound of the bucket holding quantile q, capped at the largest value seen
+  quantile(q) {
+    if (this.count === 0) return 0;
+    const rank = q * this.count;
+    let seen = 0;
+    for (let i = 0; i < this.bounds.length; i++) {
+      seen += this.counts[i];
+      if (seen >= rank) return Math.min(this.bounds[i], this.max);
+    }
+    return this.max;
+  }
+
+  // Cumulative count per upper bound, as in a Prometheus histogram
+  cumulative() {
+    let seen = 0;
+    return this.bounds.map((bound, i) => {
+      seen += this.counts[i];
+      return [bound, seen];
+    });
+  }
+
+  toJSON() {
+    return {
+      count: this.count,
+      sum: this.sum,
+      max: this.max,
+      p50: this.quantile(0.5),
+      p95: this.quantile(0.95),
+      p99: this.quantile(0.99),
+      buckets: Object.fromEntries(this.cumulative()),
+    };
+  }
+}
+
+module.exports = Histogram;
+module.exports.LATENCY_BUCKETS_MS = LATENCY_BUCKETS_MS;
@@ -0,0 +1,104 @@
+// Minimal RFC 6902 JSON Patch (add, remove, replace, move, test) for plain
+// objects and arrays. Operations apply in place to doc, in order; any
+// invalid operation throws a PatchError and the caller discards doc.
+class PatchError extends Error {}
+
+const FORBIDDEN_TOKENS = new Set(["__proto__", "constructor", "prototype"]);
+const ARRAY_INDEX = /^(0|[1-9]\d*)$/;
+
+const parsePointer = (path) => {
+  if (typeof path !== "string" || !path.startsWith("/")) {
+    throw new PatchError(`Invalid path: ${path}`);
+  }
+  const tokens = path
+    .slice(1)
+    .split("/")
+    .map((token) => token.replace(/~1/g, "/").replace(/~0/g, "~"));
+  if (tokens.some((token) => FORBIDDEN_TOKENS.has(token))) {
+    throw new PatchError(`Invalid path: ${path}`);
+  }
+  return tokens;
+};
+
+const isContainer = (node) => node !== null && typeof node === "object";
+
+const has = (node, token) =>
+  Array.isArray(node)
+    ? ARRAY_INDEX.test(token) && Number(token) < node.length
+    : Object.hasOwn(node, token);
+
+// Return [parent, lastToken] for a pointer whose parent must exist
+const locate = (doc, path) => {
+  const tokens = parsePointer(path);
+  let node = doc;
+  for (const token of tokens.slice(0, -1)) {
+    if (!isContainer(node) || !has(node, token)) throw new PatchError(`Path not found: ${path}`);
+    node = node[token];
+  }
+  if (!isContainer(node)) throw new PatchError(`Path not found: ${path}`);
+  return [node, tokens[tokens.length - 1]];
+};
+
+const getValue = (doc, path) => {
+  const [parent, token] = locate(doc, path);
+  if (!has(parent, token)) throw new PatchError(`Path not found: ${path}`);
+  return parent[token];
+};
+
+const addValue = (doc, path, value) => {
+  const [parent, token] = locate(doc, path);
+  if (!Array.isArray(parent)) {
+    parent[token] = value;
+  } else if (token === "-") {
+    parent.push(value);
+  } else if (ARRAY_INDEX.test(token) && Number(token) <= parent.length) {
+    parent.splice(Number(token), 0, value);
+  } else {
+    throw new PatchError(`Invalid array index: ${path}`);
+  }
+};
+
+const removeValue = (doc, path) => {
+  const [parent, token] = locate(doc, path);
+  if (!has(parent, token)) throw new PatchError(`Path not found: ${path}`);
+  const value = parent[token];
+  if (Array.isArray(parent)) parent.splice(Number(token), 1);
+  else delete parent[token];
+  return value;
+};
+
+const applyOperation = (doc, operation) => {
+  const { op, path, value, from } = operation || {};
+  switch (op) {
+    case "add":
+      return addValue(doc, path, value);
+    case "remove":
+      return removeValue(doc, path);
+    case "replace":
+      removeValue(doc, path);
+      return addValue(doc, path, value);
+    case "move":
+      // Validate both pointers before comparing them
+      parsePointer(from);
+      parsePointer(path);
+      if (path.startsWith(`${from}/`)) {
+        throw new PatchError(`Cannot move ${from} into itself`);
+      }
+      return addValue(doc, path, removeValue(doc, from));
+    case "test":
+      if (JSON.stringify(getValue(doc, path)) !== JSON.stringify(value)) {
+        throw new PatchError(`Test failed: ${path}`);
+      }
+      return undefined;
+    default:
+      throw new PatchError(`Unsupported operation: ${op}`);
+  }
+};
+
+const applyPatch = (doc, operations) => {
+  if (!Array.isArray(operations)) throw new PatchError("ops must be an array");
+  operations.forEach((operation) => applyOperation(doc, operation));
+  return doc;
+};
+
+module.exports = { applyPatch, PatchError };
@@ -0,0 +1,39 @@
+// Bounded least-recently-used cache with an optional expiry time per entry
+class LRUCache {
+  constructor(maxSize) {
+    this.maxSize = maxSize;
+    this.entries = new Map(); // Insertion order doubles as recency order
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    this.entries.delete(key);
+    if (entry.expiresAt <= Date.now()) return undefined;
+    this.entries.set(key, entry); // Mark as most recently used
+    return entry.value;
+  }
+
+  set(key, value, expiresAt = Infinity) {
+    if (this.maxSize <= 0) return;
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt });
+    if (this.entries.size > this.maxSize) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  delete(key) {
+    this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+}
+
+module.exports = LRUCache;
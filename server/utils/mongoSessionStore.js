@@ -0,0 +1,51 @@
+const session = require("express-session");
+const Session = require("../models/Session");
+
+// Sessions without a cookie expiry are kept this long after their last write
+const DEFAULT_TTL_MS = 24 * 60 * 60 * 1000;
+
+// express-session store backed by the Session collection, so every worker
+// of a cluster (and every instance) sees the same sessions. A TTL index
+// deletes expired sessions; get() also ignores ones the TTL monitor has not
+// reached yet.
+class MongoSessionStore extends session.Store {
+  constructor({ ttlMs = DEFAULT_TTL_MS } = {}) {
+    super();
+    this.ttlMs = ttlMs;
+  }
+
+  expiresAt(sess) {
+    return sess.cookie?.expires ? new Date(sess.cookie.expires) : new Date(Date.now() + this.ttlMs);
+  }
+
+  get(sid, callback) {
+    Session.findOne({ _id: sid, expires: { $gt: new Date() } })
+      .lean()
+      .then((doc) => callback(null, doc ? JSON.parse(doc.session) : null))
+      .catch(callback);
+  }
+
+  set(sid, sess, callback = () => {}) {
+    Session.updateOne(
+      { _id: sid },
+      { $set: { session: JSON.stringify(sess), expires: this.expiresAt(sess) } },
+      { upsert: true }
+    )
+      .then(() => callback(null))
+      .catch(callback);
+  }
+
+  touch(sid, sess, callback = () => {}) {
+    Session.updateOne({ _id: sid }, { $set: { expires: this.expiresAt(sess) } })
+      .then(() => callback(null))
+      .catch(callback);
+  }
+
+  destroy(sid, callback = () => {}) {
+    Session.deleteOne({ _id: sid })
+      .then(() => callback(null))
+      .catch(callback);
+  }
+}
+
+module.exports = MongoSessionStore;
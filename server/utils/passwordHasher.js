@@ -0,0 +1,89 @@
+const path = require("path");
+const { Worker } = require("worker_threads");
+const bcrypt = require("bcryptjs");
+const config = require("../config");
+
+const WORKER_FILE = path.join(__dirname, "passwordWorker.js");
+
+// Fixed-size pool of bcrypt workers. Each worker runs one task at a time and
+// queued tasks are handed to whichever worker frees up first.
+class HashPool {
+  constructor(size) {
+    this.size = size;
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.nextId = 0;
+  }
+
+  run(message) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ message: { ...message, id: this.nextId++ }, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  dispatch() {
+    while (this.queue.length > 0) {
+      const worker = this.idle.pop() || this.spawn();
+      if (!worker) return;
+      const task = this.queue.shift();
+      worker.task = task;
+      worker.ref();
+      worker.postMessage(task.message);
+    }
+  }
+
+  spawn() {
+    if (this.workers.length >= this.size) return null;
+    const worker = new Worker(WORKER_FILE);
+    worker.on("message", ({ result, error }) => {
+      const { task } = worker;
+      worker.task = null;
+      worker.started = true;
+      worker.unref(); // Idle workers never keep the process alive
+      this.idle.push(worker);
+      if (error) task.reject(new Error(error));
+      else task.resolve(result);
+      this.dispatch();
+    });
+    // A crashed worker fails its task and is replaced on the next dispatch
+    worker.on("error", (err) => this.remove(worker, err));
+    worker.on("exit", (code) => this.remove(worker, new Error(`Hash worker exited with code ${code}`)));
+    this.workers.push(worker);
+    return worker;
+  }
+
+  remove(worker, err) {
+    if (!this.workers.includes(worker)) return;
+    this.workers = this.workers.filter((w) => w !== worker);
+    this.idle = this.idle.filter((w) => w !== worker);
+    if (worker.task) worker.task.reject(err);
+    worker.task = null;
+    // A worker that dies before finishing any task cannot start at all, so
+    // fail the queue instead of respawning in a loop
+    if (!worker.started) {
+      this.queue.splice(0).forEach((task) => task.reject(err));
+    }
+    this.dispatch();
+  }
+}
+
+const pool = config.hashWorkers > 0 ? new HashPool(config.hashWorkers) : null;
+
+const hashPassword = (password, cost = config.bcryptCost) =>
+  pool ? pool.run({ op: "hash", password, cost }) : bcrypt.hash(password, cost);
+
+const comparePassword = (password, hash) =>
+  pool ? pool.run({ op: "compare", password, hash }) : bcrypt.compare(password, hash);
+
+// True when hash was made with a different cost than the configured one
+const needsRehash = (hash, cost = config.bcryptCost) => {
+  try {
+    return bcrypt.getRounds(hash) !== cost;
+  } catch (err) {
+    return false;
+  }
+};
+
+module.exports = { hashPassword, comparePassword, needsRehash };
@@ -0,0 +1,13 @@
+// Worker thread for passwordHasher: runs one bcrypt operation per message
+const { parentPort } = require("worker_threads");
+const bcrypt = require("bcryptjs");
+
+parentPort.on("message", ({ id, op, password, hash, cost }) => {
+  try {
+    const result =
+      op === "hash" ? bcrypt.hashSync(password, cost) : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ id, result });
+  } catch (err) {
+    parentPort.postMessage({ id, error: err.message });
+  }
+});
@@ -0,0 +1,20 @@
+const session = require("express-session");
+const config = require("../config");
+const MongoSessionStore = require("./mongoSessionStore");
+
+// express-session stores by SESSION_STORE name. MemoryStore never frees
+// abandoned sessions and is private to one process, so it is only for local
+// single-process development.
+const STORES = {
+  mongo: () => new MongoSessionStore({ ttlMs: config.sessionTtlMs }),
+  memory: () => new session.MemoryStore(),
+};
+
+const createSessionStore = (name = config.sessionStore) => {
+  if (!Object.hasOwn(STORES, name)) {
+    throw new Error(`Unknown SESSION_STORE "${name}"; expected one of ${Object.keys(STORES).join(", ")}`);
+  }
+  return STORES[name]();
+};
+
+module.exports = createSessionStore;
@@ -0,0 +1,79 @@
+const config = require("../config");
+const LRUCache = require("./lruCache");
+const RateLimitBucket = require("../models/RateLimitBucket");
+
+// Token buckets hold up to capacity tokens and refill continuously at
+// refillPerMinute. take() spends cost tokens if the bucket has them and
+// resolves to { allowed, tokens, retryAfterMs }.
+const refillPerMs = ({ refillPerMinute }) => refillPerMinute / 60000;
+const fullRefillMs = (limit) => Math.ceil(limit.capacity / refillPerMs(limit));
+const retryAfter = (tokens, cost, limit) => Math.ceil((cost - tokens) / refillPerMs(limit));
+
+// Buckets in this process only. Least recently used buckets are dropped
+// first, and a bucket expires once it would have refilled, so keys sprayed
+// by an attacker cannot grow memory past maxBuckets.
+class MemoryBucketStore {
+  constructor({ maxBuckets = config.rateLimitBuckets } = {}) {
+    this.buckets = new LRUCache(maxBuckets);
+  }
+
+  async take(key, limit, cost = 1) {
+    const now = Date.now();
+    const bucket = this.buckets.get(key) || { tokens: limit.capacity, updatedAt: now };
+    const tokens = Math.min(limit.capacity, bucket.tokens + (now - bucket.updatedAt) * refillPerMs(limit));
+    const allowed = tokens >= cost;
+    const left = allowed ? tokens - cost : tokens;
+    this.buckets.set(key, { tokens: left, updatedAt: now }, now + fullRefillMs(limit));
+    return { allowed, tokens: left, retryAfterMs: allowed ? 0 : retryAfter(left, cost, limit) };
+  }
+}
+
+// Buckets in MongoDB, shared by every worker and instance. Each take() is
+// one atomic single-document update timed by the database clock, still far
+// cheaper than the user lookup and bcrypt work it guards.
+class MongoBucketStore {
+  async take(key, limit, cost = 1) {
+    const elapsedMs = { $subtract: ["$$NOW", { $ifNull: ["$updatedAt", "$$NOW"] }] };
+    const bucket = await RateLimitBucket.findOneAndUpdate(
+      { _id: key },
+      [
+        {
+          $set: {
+            tokens: {
+              $min: [
+                limit.capacity,
+                { $add: [{ $ifNull: ["$tokens", limit.capacity] }, { $multiply: [elapsedMs, refillPerMs(limit)] }] },
+              ],
+            },
+            updatedAt: "$$NOW",
+            expiresAt: { $add: ["$$NOW", fullRefillMs(limit)] },
+          },
+        },
+        { $set: { allowed: { $gte: ["$tokens", cost] } } },
+        { $set: { tokens: { $cond: ["$allowed", { $subtract: ["$tokens", cost] }, "$tokens"] } } },
+      ],
+      { upsert: true, new: true, lean: true }
+    );
+    return {
+      allowed: bucket.allowed,
+      tokens: bucket.tokens,
+      retryAfterMs: bucket.allowed ? 0 : retryAfter(bucket.tokens, cost, limit),
+    };
+  }
+}
+
+// Bucket stores by RATE_LIMIT_STORE name. Memory buckets are per process,
+// so under cluster.js every worker allows the full rate.
+const STORES = {
+  memory: () => new MemoryBucketStore(),
+  mongo: () => new MongoBucketStore(),
+};
+
+const createBucketStore = (name = config.rateLimitStore) => {
+  if (!Object.hasOwn(STORES, name)) {
+    throw new Error(`Unknown RATE_LIMIT_STORE "${name}"; expected one of ${Object.keys(STORES).join(", ")}`);
+  }
+  return STORES[name]();
+};
+
+module.exports = { createBucketStore, MemoryBucketStore, MongoBucketStore };
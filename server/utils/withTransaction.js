@@ -0,0 +1,26 @@
+const mongoose = require("mongoose");
+
+// MongoDB error code returned when transactions are used on a standalone mongod
+const ILLEGAL_OPERATION = 20;
+
+// Run work(session) inside a transaction. Local standalone servers cannot run
+// transactions, so there the work runs once without a session instead.
+const withTransaction = async (work) => {
+  const session = await mongoose.startSession();
+  try {
+    let result;
+    await session.withTransaction(async () => {
+      result = await work(session);
+    });
+    return result;
+  } catch (err) {
+    if (err.code === ILLEGAL_OPERATION) {
+      return work(null);
+    }
+    throw err;
+  } finally {
+    await session.endSession();
+  }
+};
+
+module.exports = withTransaction;
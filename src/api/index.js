@@ -45,10 +45,21 @@ export const authAPI = {
 // Tender APIs
 export const tenderAPI = {
   saveTender: (tenderData) => api.post("/tenders/save", tenderData),
-  getTenderHistory: () => api.get("/tenders/history"),
+  getTenderHistory: (params) => api.get("/tenders/history", { params }),
   getTender: (id) => api.get(`/tenders/${id}`),
+  // body: { version, ops, title?, isDraft? }; 409 carries the current tender
+  patchTender: (id, body) => api.patch(`/tenders/${id}`, body),
   deleteTender: (id) => api.delete(`/tenders/${id}`),
   getAnalytics: () => api.get("/tenders/analytics"),
+  renderTender: (id, format) =>
+    api.get(`/tenders/${id}/render`, { params: { format }, responseType: "blob" }),
+};
+
+// Criteria catalog APIs
+export const criteriaAPI = {
+  getSectors: () => api.get("/criteria"),
+  getSector: (sector) => api.get(`/criteria/sectors/${sector}`),
+  getCriteria: (ids) => api.get("/criteria/items", { params: { ids: ids.join(",") } }),
 };
 
 export default api;
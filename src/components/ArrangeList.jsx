@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import Navbar from "../components/Navbar";
-import { criteriaData } from "../data/criteriaData";
+import { getCriterion } from "../data/criteriaCatalog";
 import {
   DndContext,
   closestCenter,
@@ -73,7 +73,7 @@ export default function Arrange() {
       doc.setFontSize(16);
 
       criteriaOrder.forEach((catId) => {
-        const cat = criteriaData.find((c) => c.id === catId);
+        const cat = getCriterion(catId);
         if (!cat) return;
         doc.text(cat.title, 20, y);
         y += 10;
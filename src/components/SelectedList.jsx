@@ -1,7 +1,7 @@
 import React from "react";
 import { useSortable } from "@dnd-kit/sortable";
 import { CSS } from "@dnd-kit/utilities";
-import { criteriaData } from "../data/criteriaData";
+import { getCriterion } from "../data/criteriaCatalog";
 
 function SortableItem({ id, children }) {
   const { attributes, listeners, setNodeRef, transform, transition, isDragging } = useSortable({ id });
@@ -28,7 +28,7 @@ export default function SelectedList({ selected, order, onDelete, sensors, handl
   return (
     <ul>
       {order.map((catId) => {
-        const cat = criteriaData.find((c) => c.id === catId);
+        const cat = getCriterion(catId);
         if (!cat) return null;
         return (
           <SortableItem key={catId} id={catId}>
@@ -0,0 +1,53 @@
+// src/data/criteriaCatalog.js
+// Criteria are served by /api/criteria and fetched on demand, so the bundle
+// no longer carries every sector's text. Fetched criteria are kept in an
+// in-memory ID index for synchronous lookups while rendering.
+import { criteriaAPI } from "../api";
+
+const criteriaById = new Map();
+const sectorRequests = new Map();
+let sectorsRequest = null;
+
+// Sector list with criteria counts
+export const loadSectors = () => {
+  if (!sectorsRequest) {
+    sectorsRequest = criteriaAPI
+      .getSectors()
+      .then((res) => res.data.sectors)
+      .catch((err) => {
+        sectorsRequest = null;
+        throw err;
+      });
+  }
+  return sectorsRequest;
+};
+
+// All criteria of one sector, fetched once per page load
+export const loadSector = (sector) => {
+  if (!sectorRequests.has(sector)) {
+    const request = criteriaAPI
+      .getSector(sector)
+      .then((res) => {
+        res.data.criteria.forEach((c) => criteriaById.set(c.id, { ...c, sector }));
+        return res.data.criteria;
+      })
+      .catch((err) => {
+        sectorRequests.delete(sector);
+        throw err;
+      });
+    sectorRequests.set(sector, request);
+  }
+  return sectorRequests.get(sector);
+};
+
+// Make sure the given criterion IDs are in the index
+export const loadCriteria = async (ids) => {
+  const missing = [...new Set(ids)].filter((id) => !criteriaById.has(id));
+  if (missing.length > 0) {
+    const res = await criteriaAPI.getCriteria(missing);
+    Object.values(res.data.criteria).forEach((c) => criteriaById.set(c.id, c));
+  }
+};
+
+// Look up a criterion that has already been loaded
+export const getCriterion = (id) => criteriaById.get(id) || null;
@@ -0,0 +1,52 @@
+// src/data/tenderDraft.js
+// Draft autosave sends only what changed since the last synced version, as
+// JSON Patch operations for PATCH /api/tenders/:id.
+
+// The tender the current selection is saved as, kept next to "selectedcat"
+// so revisiting Arrange keeps updating it instead of starting another one
+const DRAFT_KEY = "draftTender";
+
+export const loadDraft = () => {
+  try {
+    return JSON.parse(localStorage.getItem(DRAFT_KEY));
+  } catch {
+    return null;
+  }
+};
+
+// Remember the last synced state of the tender, which later diffs start from
+export const storeDraft = (tender) => {
+  const { _id, version, categories, categoriesOrder } = tender;
+  localStorage.setItem(DRAFT_KEY, JSON.stringify({ _id, version, categories, categoriesOrder }));
+};
+
+// Call wherever the selection is discarded, so the next one is a new tender
+export const forgetDraft = () => localStorage.removeItem(DRAFT_KEY);
+
+// JSON Pointer escaping for category IDs
+const pointer = (key) => `/categories/${String(key).replace(/~/g, "~0").replace(/\//g, "~1")}`;
+
+const sameList = (a = [], b = []) =>
+  a.length === b.length && a.every((value, i) => String(value) === String(b[i]));
+
+// Operations turning the synced selection into the current one
+export const diffSelection = (synced, current) => {
+  const before = synced.categories || {};
+  const after = current.categories || {};
+  const ops = [];
+
+  Object.keys(before).forEach((key) => {
+    if (!Object.hasOwn(after, key)) ops.push({ op: "remove", path: pointer(key) });
+  });
+  Object.entries(after).forEach(([key, subs]) => {
+    if (!Object.hasOwn(before, key)) {
+      ops.push({ op: "add", path: pointer(key), value: subs.map(String) });
+    } else if (!sameList(before[key], subs)) {
+      ops.push({ op: "replace", path: pointer(key), value: subs.map(String) });
+    }
+  });
+  if (!sameList(synced.categoriesOrder, current.categoriesOrder)) {
+    ops.push({ op: "replace", path: "/categoriesOrder", value: current.categoriesOrder.map(String) });
+  }
+  return ops;
+};
@@ -1,21 +1,8 @@
 import React, { useState, useEffect } from "react";
 import { useAuth } from "../context/AuthContext";
 import { tenderAPI } from "../api";
-import { criteriaData } from "../data/criteriaData";
-
-// Helper function to find criteria by ID across all sectors
-const findCriteriaById = (criteriaId, sector = null) => {
-  if (sector && criteriaData[sector]) {
-    return criteriaData[sector].find(c => c.id === criteriaId);
-  }
-  
-  // If no sector specified, search through all sectors
-  for (const sectorKey in criteriaData) {
-    const found = criteriaData[sectorKey].find(c => c.id === criteriaId);
-    if (found) return found;
-  }
-  return null;
-};
+import { saveAs } from "file-saver";
+import { getCriterion, loadCriteria } from "../data/criteriaCatalog";
 import {
   FileText,
   Clock,
@@ -31,6 +18,8 @@ import {
 export default function Account() {
   const { user, logout } = useAuth();
   const [tenderHistory, setTenderHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [selectedTender, setSelectedTender] = useState(null);
@@ -42,11 +31,13 @@ export default function Account() {
     }
   }, [user]);
 
+  // The list only needs summaries; full tenders are fetched on view/download
   const fetchTenderHistory = async () => {
     try {
       setLoading(true);
-      const response = await tenderAPI.getTenderHistory();
-      setTenderHistory(response.data);
+      const response = await tenderAPI.getTenderHistory({ view: "summary" });
+      setTenderHistory(response.data.tenders);
+      setNextCursor(response.data.nextCursor);
     } catch (err) {
       setError("Failed to load tender history");
       console.error("Error fetching tender history:", err);
@@ -55,6 +46,34 @@ export default function Account() {
     }
   };
 
+  const fetchMoreTenders = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await tenderAPI.getTenderHistory({
+        view: "summary",
+        cursor: nextCursor,
+      });
+      setTenderHistory((prev) => [...prev, ...response.data.tenders]);
+      setNextCursor(response.data.nextCursor);
+    } catch (err) {
+      alert("Failed to load more tenders");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const getFullTender = async (summary) => {
+    const tender = summary.categories
+      ? summary
+      : (await tenderAPI.getTender(summary._id)).data;
+    await loadCriteria(
+      tender.categoriesOrder?.length
+        ? tender.categoriesOrder
+        : Object.keys(tender.categories || {})
+    );
+    return tender;
+  };
+
   const handleDeleteTender = async (tenderId) => {
     if (window.confirm("Are you sure you want to delete this tender?")) {
       try {
@@ -66,65 +85,23 @@ export default function Account() {
     }
   };
 
-  const handleViewTender = (tender) => {
-    setSelectedTender(tender);
-    setShowTenderModal(true);
+  const handleViewTender = async (tender) => {
+    try {
+      setSelectedTender(await getFullTender(tender));
+      setShowTenderModal(true);
+    } catch (err) {
+      alert("Failed to load tender");
+    }
   };
 
-  const handleDownloadTender = (tender) => {
-    // Convert tender data to the format expected by the PDF generation
-    const selected = {};
-    const categoriesOrder = tender.categoriesOrder || [];
-
-    // Convert Map to object for PDF generation
-    if (tender.categories instanceof Map) {
-      for (const [key, value] of tender.categories) {
-        selected[key] = value;
-      }
-    } else {
-      // Handle case where categories is already an object
-      Object.assign(selected, tender.categories);
+  // The backend renders (and caches) the PDF from the saved tender
+  const handleDownloadTender = async (tender) => {
+    try {
+      const response = await tenderAPI.renderTender(tender._id, "pdf");
+      saveAs(response.data, `${tender.title.replace(/\s+/g, "_")}.pdf`);
+    } catch (err) {
+      alert("Failed to download tender");
     }
-
-    // Generate PDF using the same logic as Arrange.jsx
-    import("jspdf").then(({ jsPDF }) => {
-      const doc = new jsPDF();
-      let y = 20;
-      doc.setFontSize(16);
-      doc.text(tender.title, 20, y);
-      y += 15;
-      doc.setFontSize(12);
-      doc.text(
-        `Generated on: ${new Date(tender.createdAt).toLocaleDateString()}`,
-        20,
-        y
-      );
-      y += 15;
-
-      categoriesOrder.forEach((catId) => {
-        const cat = findCriteriaById(catId, tender.sector);
-        if (!cat) return;
-
-        doc.setFontSize(14);
-        doc.text(cat.title, 20, y);
-        y += 10;
-        doc.setFontSize(12);
-
-        (selected[catId] || []).forEach((subIdx) => {
-          const idx = Number(subIdx);
-          const sub = cat.sub[idx];
-          if (sub) {
-            doc.text(`  ${sub.label}`, 25, y);
-            y += 7;
-            doc.text(`  Info: ${sub.description}`, 25, y);
-            y += 10;
-          }
-        });
-        y += 5;
-      });
-
-      doc.save(`${tender.title.replace(/\s+/g, "_")}.pdf`);
-    });
   };
 
   const formatDate = (dateString) => {
@@ -276,6 +253,15 @@ export default function Account() {
                     </div>
                   </div>
                 ))}
+                {nextCursor && (
+                  <button
+                    onClick={fetchMoreTenders}
+                    disabled={loadingMore}
+                    className="w-full py-2 text-blue-600 border border-blue-200 rounded-lg hover:bg-blue-50 transition-colors"
+                  >
+                    {loadingMore ? "Loading..." : "Load More"}
+                  </button>
+                )}
               </div>
             )}
           </div>
@@ -305,7 +291,7 @@ export default function Account() {
 
               <div className="space-y-6">
                 {selectedTender.categoriesOrder?.map((catId) => {
-                  const cat = findCriteriaById(catId, selectedTender.sector);
+                  const cat = getCriterion(catId);
                   if (!cat) return null;
 
                   const selectedSubs = selectedTender.categories[catId] || [];
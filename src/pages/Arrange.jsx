@@ -1,25 +1,10 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 import { tenderAPI } from "../api";
-import { criteriaData } from "../data/criteriaData";
-
-// Helper function to find criteria by ID across all sectors
-const findCriteriaById = (criteriaId, sector = null) => {
-  if (sector && criteriaData[sector]) {
-    return criteriaData[sector].find(c => c.id === criteriaId);
-  }
-  
-  // If no sector specified, search through all sectors
-  for (const sectorKey in criteriaData) {
-    const found = criteriaData[sectorKey].find(c => c.id === criteriaId);
-    if (found) return found;
-  }
-  return null;
-};
+import { getCriterion, loadCriteria } from "../data/criteriaCatalog";
+import { diffSelection, loadDraft, storeDraft, forgetDraft } from "../data/tenderDraft";
 import { saveAs } from "file-saver";
-import * as XLSX from "xlsx";
-import { Document, Packer, Paragraph, TextRun, HeadingLevel } from "docx";
 import {
   DndContext,
   closestCenter,
@@ -47,6 +32,11 @@ import {
   BadgeCheck,
 } from "lucide-react";
 
+// Edits are saved to a server-side draft once they settle for this long
+const AUTOSAVE_DELAY_MS = 3000;
+// Rebase attempts when another tab saved the same draft first
+const MAX_SYNC_ATTEMPTS = 3;
+
 // Sortable drag-and-drop item wrapper
 function SortableItem({ id, children }) {
   const { attributes, listeners, setNodeRef, transform, transition, isDragging } =
@@ -75,21 +65,97 @@ export default function Arrange() {
   const [saving, setSaving] = useState(false);
   const [showPreviewModal, setShowPreviewModal] = useState(false);
   const [generated, setGenerated] = useState(false);
+  const [savedTenderId, setSavedTenderId] = useState(null);
   const [showSuccess, setShowSuccess] = useState(false);
+  // Last version of the draft known to be on the server, and the sync in progress
+  const draftRef = useRef(null);
+  const syncRef = useRef(Promise.resolve());
+  const autosaveTimerRef = useRef(null);
+  // Autosave only follows edits made here, not loading the stored selection
+  const editedRef = useRef(false);
 
   const sensors = useSensors(useSensor(PointerSensor));
 
   // Load data from local storage on mount
   useEffect(() => {
+    draftRef.current = loadDraft();
     const data = JSON.parse(localStorage.getItem("selectedcat")) || {};
     const sector = JSON.parse(localStorage.getItem("selectedSector")) || null;
-    setSelected(data);
-    setSelectedSector(sector);
-    setCriteriaOrder(Object.keys(data));
+    const apply = () => {
+      setSelected(data);
+      setSelectedSector(sector);
+      setCriteriaOrder(Object.keys(data));
+    };
+    loadCriteria(Object.keys(data))
+      .catch((err) => console.error("Error loading criteria:", err))
+      .finally(apply);
   }, []);
 
+  const rememberDraft = (tender) => {
+    draftRef.current = tender;
+    storeDraft(tender);
+    return tender;
+  };
+
+  // Bring the server draft up to date with the given selection, creating it on
+  // the first save. changes are extra fields such as { isDraft: false }.
+  const syncDraft = async (selection, changes = {}, attempt = 1) => {
+    const draft = draftRef.current;
+    if (!draft) {
+      const response = await tenderAPI.saveTender({
+        title: `Tender ${new Date().toLocaleDateString()}`,
+        sector: selectedSector?.id || "general",
+        ...selection,
+        isDraft: true,
+        ...changes,
+      });
+      return rememberDraft(response.data.tender);
+    }
+
+    const ops = diffSelection(draft, selection);
+    if (ops.length === 0 && Object.keys(changes).length === 0) return draft;
+    try {
+      const response = await tenderAPI.patchTender(draft._id, {
+        version: draft.version,
+        ops,
+        ...changes,
+      });
+      return rememberDraft(response.data.tender);
+    } catch (err) {
+      if (err.response?.status === 404 && attempt < MAX_SYNC_ATTEMPTS) {
+        // The stored tender was deleted or belongs to another account
+        draftRef.current = null;
+        forgetDraft();
+        return syncDraft(selection, changes, attempt + 1);
+      }
+      if (err.response?.status !== 409 || attempt >= MAX_SYNC_ATTEMPTS) throw err;
+      // Saved elsewhere in the meantime: diff against that version instead
+      draftRef.current = err.response.data.tender;
+      return syncDraft(selection, changes, attempt + 1);
+    }
+  };
+
+  // Syncs run one at a time so each patch is based on the previous result
+  const queueSync = (selection, changes) => {
+    const sync = syncRef.current.then(() => syncDraft(selection, changes));
+    syncRef.current = sync.catch(() => {});
+    return sync;
+  };
+
+  // Autosave the arrangement as a draft a few seconds after the last edit
+  useEffect(() => {
+    if (!user || !editedRef.current) return;
+    if (!draftRef.current && criteriaOrder.length === 0) return;
+    const selection = { categories: selected, categoriesOrder: criteriaOrder };
+    autosaveTimerRef.current = setTimeout(() => {
+      queueSync(selection).catch((err) => console.error("Error autosaving draft:", err));
+    }, AUTOSAVE_DELAY_MS);
+    return () => clearTimeout(autosaveTimerRef.current);
+  }, [user, selected, criteriaOrder]);
+
   const handleCriteriaDragEnd = ({ active, over }) => {
     if (active.id !== over?.id) {
+      editedRef.current = true;
       setCriteriaOrder((items) =>
         arrayMove(items, items.indexOf(active.id), items.indexOf(over.id))
       );
@@ -98,6 +164,7 @@ export default function Arrange() {
 
   const handleSubcriteriaDragEnd = (catId, { active, over }) => {
     if (active.id !== over?.id) {
+      editedRef.current = true;
       setSelected((prev) => {
         const oldOrder = prev[catId];
         const newSubOrder = arrayMove(
@@ -113,6 +180,7 @@ export default function Arrange() {
   };
 
   const handleDeleteCategory = (catId) => {
+    editedRef.current = true;
     setSelected((prev) => {
       const updated = { ...prev };
       delete updated[catId];
@@ -123,6 +191,7 @@ export default function Arrange() {
   };
 
   const handleRemoveSubcriteria = (catId, subIdx) => {
+    editedRef.current = true;
     setSelected((prev) => {
       const updated = { ...prev };
       updated[catId] = updated[catId].filter((idx) => idx !== subIdx);
@@ -135,7 +204,13 @@ export default function Arrange() {
     });
   };
 
+  // Discarding the selection also detaches its draft, so what is selected
+  // next becomes a new tender
   const handleDeleteAll = () => {
+    clearTimeout(autosaveTimerRef.current);
+    editedRef.current = false;
+    draftRef.current = null;
+    forgetDraft();
     setSelected({});
     setCriteriaOrder([]);
     localStorage.removeItem("selectedcat");
@@ -149,13 +224,18 @@ export default function Arrange() {
     }
     setSaving(true);
     try {
-      await tenderAPI.saveTender({
-        title: `Tender ${new Date().toLocaleDateString()}`,
-        sector: selectedSector?.id || "general",
-        categories: selected,
-        categoriesOrder: criteriaOrder,
-        isDraft: false,
-      });
+      // Finalize the stored draft, creating it if nothing was autosaved yet
+      clearTimeout(autosaveTimerRef.current);
+      const tender = await queueSync(
+        { categories: selected, categoriesOrder: criteriaOrder },
+        { isDraft: false }
+      );
+      // The generated tender is final: later edits start a new draft rather
+      // than rewriting it in History
+      editedRef.current = false;
+      draftRef.current = null;
+      forgetDraft();
+      setSavedTenderId(tender._id);
       setGenerated(true);
       setShowSuccess(true);
       setTimeout(() => setShowSuccess(false), 3000);
@@ -177,65 +257,21 @@ export default function Arrange() {
     fn();
   };
 
-  const generatePDF = () =>
-    guardDownload(() => {
-      import("jspdf").then(({ jsPDF }) => {
-        const doc = new jsPDF();
-        let y = 20;
-        doc.setFontSize(16);
-        doc.text("Tender Document", 20, y);
-        y += 10;
-        if (selectedSector) {
-          doc.setFontSize(12);
-          doc.text(`Sector: ${selectedSector.name}`, 20, y);
-          y += 10;
-        }
-        doc.text(`Generated on: ${new Date().toLocaleDateString()}`, 20, y);
-        y += 15;
-        criteriaOrder.forEach((catId) => {
-          const cat = findCriteriaById(catId, selectedSector?.id);
-          if (!cat) return;
-          doc.setFontSize(14);
-          doc.text(cat.title, 20, y);
-          y += 10;
-          doc.setFontSize(12);
-          (selected[catId] || []).forEach((subIdx) => {
-            const sub = cat.sub[subIdx];
-            doc.text(`  ${sub.label}`, 25, y);
-            y += 7;
-            doc.text(`  Info: ${sub.description}`, 25, y);
-            y += 10;
-          });
-          y += 5;
-        });
-        doc.save("tender_criteria.pdf");
-      });
-      //setShowPreviewModal(false);
+  // PDF, Word and Excel files are rendered by the backend from the saved tender
+  const downloadRendered = (format) =>
+    guardDownload(async () => {
+      try {
+        const response = await tenderAPI.renderTender(savedTenderId, format);
+        saveAs(response.data, `tender_criteria.${format}`);
+      } catch (err) {
+        console.error("Error rendering tender:", err);
+        alert("Failed to download tender.");
+      }
     });
 
-  const exportToExcel = () =>
-    guardDownload(() => {
-      const workbook = XLSX.utils.book_new();
-      const worksheetData = [["Category", "Subcriteria", "Description"]];
-      criteriaOrder.forEach((catId) => {
-        const cat = findCriteriaById(catId, selectedSector?.id);
-        if (!cat) return;
-        (selected[catId] || []).forEach((subIdx) => {
-          const sub = cat.sub[subIdx];
-          worksheetData.push([cat.title, sub.label, sub.description]);
-        });
-      });
-      const sheet = XLSX.utils.aoa_to_sheet(worksheetData);
-      XLSX.utils.book_append_sheet(workbook, sheet, "Tender");
-      const buffer = XLSX.write(workbook, { bookType: "xlsx", type: "array" });
-      saveAs(
-        new Blob([buffer], {
-          type: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        }),
-        "tender_criteria.xlsx"
-      );
-      //setShowPreviewModal(false);
-    });
+  const generatePDF = () => downloadRendered("pdf");
+
+  const exportToExcel = () => downloadRendered("xlsx");
 
   const exportToJSON = () =>
     guardDownload(() => {
@@ -244,7 +280,7 @@ export default function Arrange() {
         sector: selectedSector?.name || "General",
         generatedDate: new Date().toISOString(),
         categories: criteriaOrder.map((catId) => {
-          const cat = findCriteriaById(catId, selectedSector?.id);
+          const cat = getCriterion(catId);
           if (!cat) return null;
           return {
             id: cat.id,
@@ -266,52 +302,7 @@ export default function Arrange() {
       //setShowPreviewModal(false);
     });
 
-  const exportToWord = () =>
-    guardDownload(async () => {
-      const doc = new Document({
-        sections: [
-          {
-            children: [
-              new Paragraph({
-                text: "Tender Document",
-                heading: HeadingLevel.TITLE,
-              }),
-              new Paragraph({
-                text: `Generated on: ${new Date().toLocaleDateString()}`,
-              }),
-              ...(selectedSector
-                ? [
-                    new Paragraph({
-                      text: `Sector: ${selectedSector.name}`,
-                      bold: true,
-                    }),
-                  ]
-                : []),
-              ...criteriaOrder.flatMap((catId) => {
-                const cat = findCriteriaById(catId, selectedSector?.id);
-                if (!cat) return [];
-                return [
-                  new Paragraph({
-                    text: cat.title,
-                    heading: HeadingLevel.HEADING_1,
-                  }),
-                  ...(selected[catId] || []).flatMap((subIdx) => {
-                    const sub = cat.sub[subIdx];
-                    return [
-                      new Paragraph({ text: sub.label, bullet: { level: 0 } }),
-                      new Paragraph({ text: sub.description }),
-                    ];
-                  }),
-                ];
-              }),
-            ],
-          },
-        ],
-      });
-      const blob = await Packer.toBlob(doc);
-      saveAs(blob, "tender_criteria.docx");
-      //setShowPreviewModal(false);
-    });
+  const exportToWord = () => downloadRendered("docx");
 
   return (
     <div className="min-h-screen bg-gray-50 px-6 py-4">
@@ -335,7 +326,7 @@ export default function Arrange() {
               <SortableContext items={criteriaOrder} strategy={verticalListSortingStrategy}>
                 <div className="space-y-6 mb-6">
                   {criteriaOrder.map((catId) => {
-                    const cat = findCriteriaById(catId, selectedSector?.id);
+                    const cat = getCriterion(catId);
                     if (!cat) return null;
                     return (
                       <SortableItem key={catId} id={catId}>
@@ -449,7 +440,7 @@ export default function Arrange() {
               {/* Preview Categories */}
               <div className="space-y-5 mb-6">
                 {criteriaOrder.map((catId) => {
-                  const cat = findCriteriaById(catId, selectedSector?.id);
+                  const cat = getCriterion(catId);
                   if (!cat) return null;
 
                   return (
@@ -1,7 +1,6 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
-import { criteriaData } from "../data/criteriaData";
 import CategoryList from "../components/CategoryList";
 import {
   CheckCircle,
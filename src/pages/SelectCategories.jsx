@@ -1,13 +1,16 @@
 // src/pages/SelectCategories.js
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
-import { criteriaData, sectors } from "../data/criteriaData";
+import { loadSectors, loadSector } from "../data/criteriaCatalog";
+import { forgetDraft } from "../data/tenderDraft";
 import CategoryList from "../components/CategoryList";
 import { ArrowRight, Trash2, Building, ChevronRight } from "lucide-react";
 
 export default function SelectCategories() {
   const navigate = useNavigate();
   const [selectedSector, setSelectedSector] = useState(null);
+  const [sectors, setSectors] = useState([]);
+  const [sectorCriteria, setSectorCriteria] = useState([]);
   const [selected, setSelected] = useState(() => {
     return JSON.parse(localStorage.getItem("selectedcat")) || {};
   });
@@ -17,8 +20,26 @@ export default function SelectCategories() {
     if (savedSector) {
       setSelectedSector(JSON.parse(savedSector));
     }
+    loadSectors()
+      .then(setSectors)
+      .catch((err) => console.error("Error loading sectors:", err));
   }, []);
 
+  // Fetch only the chosen sector's criteria
+  useEffect(() => {
+    setSectorCriteria([]);
+    if (!selectedSector) return;
+    let cancelled = false;
+    loadSector(selectedSector.id)
+      .then((criteria) => {
+        if (!cancelled) setSectorCriteria(criteria);
+      })
+      .catch((err) => console.error("Error loading criteria:", err));
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedSector?.id]);
+
   const totalSelected = Object.values(selected).reduce(
     (sum, arr) => sum + arr.length,
     0
@@ -30,6 +51,7 @@ export default function SelectCategories() {
     // Clear previous selections when sector changes
     setSelected({});
     localStorage.removeItem("selectedcat");
+    forgetDraft();
   };
 
   const handleNext = () => {
@@ -40,6 +62,7 @@ export default function SelectCategories() {
   const handleClearAll = () => {
     setSelected({});
     localStorage.removeItem("selectedcat");
+    forgetDraft();
   };
 
   const handleBackToSector = () => {
@@ -47,12 +70,7 @@ export default function SelectCategories() {
     localStorage.removeItem("selectedSector");
     setSelected({});
     localStorage.removeItem("selectedcat");
-  };
-
-  // Get criteria data based on selected sector
-  const getSectorCriteria = () => {
-    if (!selectedSector) return [];
-    return criteriaData[selectedSector.id] || [];
+    forgetDraft();
   };
 
   return (
@@ -138,7 +156,7 @@ export default function SelectCategories() {
             </div>
 
             <CategoryList
-              data={getSectorCriteria()}
+              data={sectorCriteria}
               selected={selected}
               setSelected={setSelected}
             />